@@ -0,0 +1,831 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ######################################################################################################################
+
+# Prefix of the asset folders that can be imported
+_ASSET_PREFIX = "ch"
+
+# A folder modified less than this delay (in ns) before the scan may still be written to with the same mtime
+_RACY_MTIME_DELAY = 2 * 10 ** 9
+
+# Manifest of an abc or abc_fur folder, written by the ABC Export tool or after a scan
+MANIFEST_FILENAME = "abc_manifest.json"
+
+
+# ######################################################################################################################
+
+
+class ABCFurSequence:
+    """
+    Fur cache files of a version folder : a single "<asset>_fur.abc" or a sequence of "<asset>_fur.<frame>.abc"
+    with maybe some missing frames
+    """
+    __slots__ = ("__first_filename", "__ranges")
+
+    def __init__(self, first_filename, ranges):
+        """
+        Constructor
+        :param first_filename : file of the single cache or of the first frame
+        :param ranges : sorted list of [first frame, last frame] of the consecutive frames (empty for a single file)
+        """
+        self.__first_filename = first_filename
+        self.__ranges = ranges
+
+    @staticmethod
+    def from_filenames(asset_name, filenames):
+        """
+        Index the fur cache files of an asset among the files of a version folder
+        :param asset_name
+        :param filenames
+        :return: ABCFurSequence or None if there is no fur cache of the asset
+        """
+        single_filename = None
+        frame_filenames = {}
+        prefix = asset_name + "_fur"
+        # Sliced rather than matched with a pattern as a version folder can hold thousands of frames
+        for filename in filenames:
+            if not filename.startswith(prefix) or not filename.endswith(".abc"):
+                continue
+            frame = filename[len(prefix):-len(".abc")]
+            if frame == "":
+                single_filename = filename
+            elif frame[0] == "." and frame[1:].isdigit() and frame[1:].isascii():
+                frame_filenames[int(frame[1:])] = filename
+        if len(frame_filenames) == 0:
+            return ABCFurSequence(single_filename, []) if single_filename is not None else None
+        frames = sorted(frame_filenames.keys())
+        ranges = [[frames[0], frames[0]]]
+        for frame in frames[1:]:
+            if frame == ranges[-1][1] + 1:
+                ranges[-1][1] = frame
+            else:
+                ranges.append([frame, frame])
+        return ABCFurSequence(frame_filenames[frames[0]], ranges)
+
+    @staticmethod
+    def is_cache_filename(asset_name, filename):
+        """
+        Test whether a file is a fur cache file of an asset, the single one or the one of a frame
+        :param asset_name
+        :param filename
+        :return: is fur cache file
+        """
+        prefix = asset_name + "_fur"
+        if not filename.startswith(prefix) or not filename.endswith(".abc"):
+            return False
+        frame = filename[len(prefix):-len(".abc")]
+        return frame == "" or (frame[0] == "." and frame[1:].isdigit() and frame[1:].isascii())
+
+    @staticmethod
+    def from_record(record):
+        """
+        Create a sequence from its record in the catalog cache
+        :param record
+        :return: ABCFurSequence or None
+        """
+        return ABCFurSequence(record[0], record[1]) if record is not None else None
+
+    @staticmethod
+    def is_valid_record(record):
+        """
+        Test whether a record read from a file is the one of a sequence : a file name and sorted, disjoint ranges of
+        frames
+        :param record
+        :return: is valid
+        """
+        if not isinstance(record, list) or len(record) != 2 or not isinstance(record[0], str) or \
+                not isinstance(record[1], list):
+            return False
+        last_frame = None
+        for frame_range in record[1]:
+            if not isinstance(frame_range, list) or len(frame_range) != 2 or \
+                    not all(type(frame) is int for frame in frame_range) or frame_range[0] > frame_range[1] or \
+                    (last_frame is not None and frame_range[0] <= last_frame + 1):
+                return False
+            last_frame = frame_range[1]
+        return True
+
+    def to_record(self):
+        """
+        Get the record of the sequence stored in the catalog cache
+        :return: record
+        """
+        return [self.__first_filename, self.__ranges]
+
+    def get_first_filename(self):
+        """
+        Getter of the file of the single cache or of the first frame, to use as dso
+        :return: filename
+        """
+        return self.__first_filename
+
+    def is_sequence(self):
+        """
+        Getter of whether the cache is a sequence of frames
+        :return: is sequence
+        """
+        return len(self.__ranges) > 0
+
+    def get_frame_range(self):
+        """
+        Getter of the first and the last frames
+        :return: (first frame, last frame) or None if not a sequence
+        """
+        return (self.__ranges[0][0], self.__ranges[-1][1]) if self.is_sequence() else None
+
+    def get_nb_frames(self):
+        """
+        Getter of the number of frame files
+        :return: number of frames
+        """
+        return sum(end - start + 1 for start, end in self.__ranges)
+
+    def get_missing_ranges(self):
+        """
+        Getter of the frames missing between the first and the last frames
+        :return: list of (first missing frame, last missing frame)
+        """
+        return [(self.__ranges[index][1] + 1, self.__ranges[index + 1][0] - 1)
+                for index in range(len(self.__ranges) - 1)]
+
+    def is_complete(self):
+        """
+        Getter of whether no frame is missing
+        :return: is complete
+        """
+        return len(self.__ranges) <= 1
+
+
+class ABCVersion:
+    """
+    Version folder of an asset, with its number parsed once so that versions sort and compare numerically
+    """
+    __slots__ = ("__number", "__parent_path", "__name", "__flags", "__sequence")
+
+    # The version folder contains a light rig of the anim
+    HAS_LIGHT_RIG = 1
+
+    def __init__(self, parent_path, name, flags=0, sequence=None):
+        """
+        Constructor
+        :param parent_path : path of the asset folder, shared by all its versions
+        :param name : name of the version folder
+        :param flags : presence flags
+        :param sequence : ABCFurSequence of a fur
+        """
+        self.__number = ABCVersion.parse_number(name)
+        self.__parent_path = sys.intern(parent_path)
+        self.__name = name
+        self.__flags = flags
+        self.__sequence = sequence
+
+    @staticmethod
+    def parse_number(name):
+        """
+        Parse the number of a version folder name
+        :param name
+        :return: number or -1 if the name is not a number
+        """
+        return int(name) if name.isdigit() else -1
+
+    @staticmethod
+    def from_path(path, flags=0, sequence=None):
+        """
+        Create a version from the path of its folder
+        :param path
+        :param flags
+        :param sequence
+        :return: ABCVersion
+        """
+        parent_path, name = os.path.split(path)
+        return ABCVersion(parent_path, name, flags, sequence)
+
+    def __lt__(self, other):
+        return self.__number < other.__number
+
+    def __repr__(self):
+        return "ABCVersion(" + repr(self.get_path()) + ")"
+
+    def get_number(self):
+        """
+        Getter of the version number
+        :return: number
+        """
+        return self.__number
+
+    def get_name(self):
+        """
+        Getter of the name of the version folder
+        :return: name
+        """
+        return self.__name
+
+    def get_path(self):
+        """
+        Getter of the path of the version folder
+        :return: path
+        """
+        return os.path.join(self.__parent_path, self.__name)
+
+    def has_flag(self, flag):
+        """
+        Getter of whether a presence flag is set
+        :param flag
+        :return: has flag
+        """
+        return self.__flags & flag != 0
+
+    def get_sequence(self):
+        """
+        Getter of the fur cache files of the version
+        :return: ABCFurSequence or None if it is not a fur
+        """
+        return self.__sequence
+
+
+class ABCCatalogEntry:
+    """
+    Asset found in an abc or abc_fur folder, with all the version folders containing its cache
+    """
+    __slots__ = ("__name", "__versions", "__is_anim")
+
+    def __init__(self, name, versions, is_anim):
+        """
+        Constructor
+        :param name : name of the asset folder
+        :param versions : ABCVersion of the version folders
+        :param is_anim : whether the asset comes from an abc folder or an abc_fur folder
+        """
+        self.__name = name
+        self.__versions = versions
+        self.__is_anim = is_anim
+
+    def get_name(self):
+        """
+        Getter of the name of the asset folder
+        :return: name
+        """
+        return self.__name
+
+    def get_versions(self):
+        """
+        Getter of the version folders
+        :return: ABCVersion list
+        """
+        return self.__versions
+
+    def is_anim(self):
+        """
+        Getter of whether the asset is an anim or a fur
+        :return: is anim
+        """
+        return self.__is_anim
+
+
+class ABCCatalogCache:
+    """
+    On-disk cache of the scanned abc folders.
+    Each asset folder and version folder is stored with its mtime so that a later scan only lists the folders
+    that have changed since.
+    """
+    _FORMAT_VERSION = 3
+
+    def __init__(self, cache_dir=None):
+        """
+        Constructor
+        :param cache_dir : directory of the cache files (defaults to ~/.abc_import/catalog_cache)
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".abc_import", "catalog_cache")
+        self.__cache_dir = cache_dir
+
+    def __get_cache_filepath(self, folder_path, is_anim_folder):
+        """
+        Get the path of the cache file of a folder
+        :param folder_path
+        :param is_anim_folder
+        :return: cache filepath
+        """
+        key = hashlib.sha1((folder_path + ("|anim" if is_anim_folder else "|fur")).encode("utf-8")).hexdigest()
+        return os.path.join(self.__cache_dir, key + ".json")
+
+    def load(self, folder_path, is_anim_folder):
+        """
+        Load the record of a folder
+        :param folder_path
+        :param is_anim_folder
+        :return: record or None if not cached
+        """
+        try:
+            with open(self.__get_cache_filepath(folder_path, is_anim_folder), "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != ABCCatalogCache._FORMAT_VERSION or data.get("folder") != folder_path:
+            return None
+        return data.get("record")
+
+    def save(self, folder_path, is_anim_folder, record):
+        """
+        Save the record of a folder. Failing to write the cache is not an error.
+        :param folder_path
+        :param is_anim_folder
+        :param record
+        :return:
+        """
+        filepath = self.__get_cache_filepath(folder_path, is_anim_folder)
+        tmp_filepath = "%s.%d.%d.tmp" % (filepath, os.getpid(), threading.get_ident())
+        data = {"format": ABCCatalogCache._FORMAT_VERSION, "folder": folder_path, "record": record}
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            with open(tmp_filepath, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_filepath, filepath)
+        except OSError:
+            pass
+
+    def clear(self, folder_path, is_anim_folder):
+        """
+        Remove the record of a folder
+        :param folder_path
+        :param is_anim_folder
+        :return:
+        """
+        try:
+            os.remove(self.__get_cache_filepath(folder_path, is_anim_folder))
+        except OSError:
+            pass
+
+
+class ABCManifest:
+    """
+    Manifest of an abc or an abc_fur folder listing its assets, their versions and, for the furs, the frame ranges of
+    the cache files, so that the folder is discovered with one file read instead of a walk.
+    {
+        "format": 2,
+        "kind": "anim" | "fur",
+        "mtime": <mtime in ns of the folder once the manifest has been written in it>,
+        "assets": {
+            "<asset>": {
+                "mtime": <mtime in ns of the asset folder, optional>,
+                "versions": {
+                    "<version>": {
+                        "mtime": <mtime in ns of the version folder, optional>,
+                        "size": <size in bytes of the cache files, null if there is none, optional>,
+                        "light_rig": <bool>  (anim)
+                        "sequence": [<first file>, [[<first frame>, <last frame>], ...]] | null  (fur)
+                    }
+                }
+            }
+        }
+    }
+    A manifest is only trusted if the folder still has the mtime of the manifest and if the asset and version folders
+    with an mtime have not been modified since. A version with a null size is not valid (being written or failed).
+    """
+    _FORMAT_VERSION = 2
+
+    @staticmethod
+    def get_filepath(folder_path):
+        """
+        Get the path of the manifest of a folder
+        :param folder_path
+        :return: manifest filepath
+        """
+        return os.path.join(folder_path, MANIFEST_FILENAME)
+
+    @staticmethod
+    def load(folder_path, is_anim_folder):
+        """
+        Load the manifest of a folder as a scan record. The mtimes of the asset and version folders are kept in the
+        record to be checked.
+        :param folder_path
+        :param is_anim_folder
+        :return: record or None if there is no manifest or if the folder has been modified after it
+        """
+        filepath = ABCManifest.get_filepath(folder_path)
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+            if data.get("format") != ABCManifest._FORMAT_VERSION or \
+                    data.get("kind") != ("anim" if is_anim_folder else "fur"):
+                return None
+            # An asset folder has been added or removed since the manifest has been written
+            if os.stat(folder_path).st_mtime_ns != data["mtime"]:
+                return None
+            assets = {}
+            for asset_name, asset in data["assets"].items():
+                versions = {}
+                for version_name, version in asset["versions"].items():
+                    valid = version.get("size", 0) is not None
+                    if is_anim_folder:
+                        versions[version_name] = {"mtime": version.get("mtime"), "valid": valid,
+                                                  "light_rig": bool(version.get("light_rig"))}
+                    else:
+                        sequence = version.get("sequence")
+                        if sequence is not None and not ABCFurSequence.is_valid_record(sequence):
+                            return None
+                        versions[version_name] = {"mtime": version.get("mtime"),
+                                                  "valid": valid and sequence is not None, "sequence": sequence}
+                assets[asset_name] = {"mtime": asset.get("mtime"), "versions": versions}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return {"mtime": None, "assets": assets}
+
+    @staticmethod
+    def save(folder_path, is_anim_folder, record):
+        """
+        Write the manifest of a folder from the record of its complete scan. The manifest is not written if a folder
+        has been modified right before or since the scan or could not be listed, as the record of its parent has no
+        mtime then. Failing to write it is not an error.
+        The manifest is first written without the mtime of the folder, which changes with the creation of the
+        manifest, then rewritten in place with it once the assets of the folder are checked to be the ones of the
+        record.
+        :param folder_path
+        :param is_anim_folder
+        :param record : record of the scan with the mtimes of all the folders
+        :return: whether the manifest has been written
+        """
+        if record["mtime"] is None:
+            return False
+        try:
+            if os.stat(folder_path).st_mtime_ns != record["mtime"]:
+                return False
+            assets = {}
+            for asset_name, asset_record in record["assets"].items():
+                if asset_record["mtime"] is None:
+                    return False
+                versions = {}
+                for version_name, version_record in asset_record["versions"].items():
+                    if version_record["mtime"] is None:
+                        return False
+                    version_folder_path = os.path.join(folder_path, asset_name, version_name)
+                    version = {"mtime": version_record["mtime"],
+                               "size": ABCManifest.__get_size(version_folder_path, asset_name, is_anim_folder)
+                               if version_record["valid"] else None}
+                    if is_anim_folder:
+                        version["light_rig"] = version_record["light_rig"]
+                    else:
+                        version["sequence"] = version_record["sequence"]
+                    versions[version_name] = version
+                assets[asset_name] = {"mtime": asset_record["mtime"], "versions": versions}
+        except OSError:
+            return False
+        data = {"format": ABCManifest._FORMAT_VERSION, "kind": "anim" if is_anim_folder else "fur", "mtime": None,
+                "assets": assets}
+        filepath = ABCManifest.get_filepath(folder_path)
+        tmp_filepath = "%s.%d.%d.tmp" % (filepath, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp_filepath, "w") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_filepath, filepath)
+            mtime = os.stat(folder_path).st_mtime_ns
+            with os.scandir(folder_path) as it:
+                asset_names = set(entry.name for entry in it if entry.name.startswith(_ASSET_PREFIX) and entry.is_dir())
+            # An asset folder added or removed meanwhile leaves the manifest without mtime, so never trusted
+            if asset_names != set(assets.keys()) or os.stat(folder_path).st_mtime_ns != mtime:
+                return False
+            data["mtime"] = mtime
+            # Rewriting the manifest in place does not modify the folder
+            with open(filepath, "w") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+        except OSError:
+            try:
+                os.remove(tmp_filepath)
+            except OSError:
+                pass
+            return False
+        return True
+
+    @staticmethod
+    def __get_size(version_folder_path, asset_name, is_anim_folder):
+        """
+        Get the size of the cache files of an asset in a version folder
+        :param version_folder_path
+        :param asset_name
+        :param is_anim_folder
+        :return: size in bytes
+        """
+        if is_anim_folder:
+            return os.stat(os.path.join(version_folder_path, asset_name + ".abc")).st_size
+        with os.scandir(version_folder_path) as it:
+            return sum(entry.stat().st_size for entry in it
+                       if ABCFurSequence.is_cache_filename(asset_name, entry.name))
+
+
+class ABCCatalogScanner:
+    """
+    Walk the abc and abc_fur folders to find the assets and their versions.
+    Does not depend on Maya so it can run anywhere.
+    """
+
+    def __init__(self, cache=None, max_workers=1, use_manifests=True, write_manifests=False):
+        """
+        Constructor
+        :param cache : ABCCatalogCache used to skip the folders that have not changed since the last scan
+        :param max_workers : number of threads listing the folders concurrently (1 to scan sequentially)
+        :param use_manifests : whether the folders with an up to date ABCManifest are read from it instead of scanned
+        :param write_manifests : whether the ABCManifest of a folder is written after its complete scan
+        """
+        self.__cache = cache
+        self.__max_workers = max(1, max_workers)
+        self.__use_manifests = use_manifests
+        self.__write_manifests = write_manifests
+
+    @staticmethod
+    def _index_anim_version(version_folder_path, asset_name):
+        """
+        Check whether a version folder contains the anim cache of the asset and its light rig
+        :param version_folder_path
+        :param asset_name
+        :return: (is valid, has light rig)
+        """
+        with os.scandir(version_folder_path) as it:
+            filenames = set(entry.name for entry in it)
+        return asset_name + ".abc" in filenames, asset_name + "_light.ma" in filenames
+
+    @staticmethod
+    def _index_fur_sequence(version_folder_path, asset_name):
+        """
+        Index the fur cache files of a version folder
+        :param version_folder_path
+        :param asset_name
+        :return: ABCFurSequence or None if the version folder does not contain the fur cache of the asset
+        """
+        with os.scandir(version_folder_path) as it:
+            return ABCFurSequence.from_filenames(asset_name, [entry.name for entry in it])
+
+    def __get_mtime(self, path, scan_time):
+        """
+        Get the mtime of a folder to record in the cache or in the manifest.
+        A folder modified right before the scan is not trusted and will be listed again next time.
+        :param path
+        :param scan_time
+        :return: mtime or None
+        """
+        if self.__cache is None and not self.__write_manifests:
+            return None
+        mtime = os.stat(path).st_mtime_ns
+        if scan_time - mtime < _RACY_MTIME_DELAY:
+            return None
+        return mtime
+
+    @staticmethod
+    def __is_unchanged(previous, mtime):
+        """
+        Test whether a folder has not changed since its previous record
+        :param previous
+        :param mtime
+        :return: is unchanged
+        """
+        return previous is not None and mtime is not None and previous["mtime"] == mtime
+
+    def _list_asset(self, asset_folder_path, scan_time, previous=None):
+        """
+        List the version folders of an asset folder
+        :param asset_folder_path
+        :param scan_time
+        :param previous : record of the previous scan of the asset folder
+        :return: mtime and version folder names or None if the asset folder can't be listed
+        """
+        try:
+            mtime = self.__get_mtime(asset_folder_path, scan_time)
+            if ABCCatalogScanner.__is_unchanged(previous, mtime):
+                version_names = list(previous["versions"].keys())
+            else:
+                with os.scandir(asset_folder_path) as it:
+                    version_names = [entry.name for entry in it if entry.is_dir()]
+        except OSError:
+            return None
+        version_names.sort()
+        return mtime, version_names
+
+    def _check_version(self, version_folder_path, asset_name, is_anim_folder, scan_time, previous=None):
+        """
+        Check whether a version folder contains the cache of the asset
+        :param version_folder_path
+        :param asset_name
+        :param is_anim_folder
+        :param scan_time
+        :param previous : record of the previous scan of the version folder
+        :return: record of the version folder or None if the version folder can't be listed.
+        The record of an anim version folder tells whether it has a light rig, the one of a fur version folder
+        contains the record of its ABCFurSequence
+        """
+        try:
+            mtime = self.__get_mtime(version_folder_path, scan_time)
+            if ABCCatalogScanner.__is_unchanged(previous, mtime):
+                return previous
+            if is_anim_folder:
+                valid, has_light_rig = ABCCatalogScanner._index_anim_version(version_folder_path, asset_name)
+                return {"mtime": mtime, "valid": valid, "light_rig": has_light_rig}
+            # All the files of a fur version folder are listed once to index the sequence
+            sequence = ABCCatalogScanner._index_fur_sequence(version_folder_path, asset_name)
+        except OSError:
+            return None
+        return {"mtime": mtime, "valid": sequence is not None,
+                "sequence": sequence.to_record() if sequence is not None else None}
+
+    def __imap(self, func, items):
+        """
+        Apply the function to every item, on the thread pool if several workers are allowed.
+        The results are yielded in the same order as the items.
+        :param func
+        :param items
+        :return: results generator
+        """
+        if self.__max_workers > 1 and len(items) > 1:
+            executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+            futures = [executor.submit(func, item) for item in items]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                # Stop the pending listings if the iteration is interrupted
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+        else:
+            for item in items:
+                yield func(item)
+
+    def _iter_folder(self, folder_path, is_anim_folder, record, previous=None, cancel_event=None, name_filter=None):
+        """
+        Scan all the asset folders of the folder path.
+        Each asset is yielded as soon as all its version folders have been checked.
+        :param folder_path
+        :param is_anim_folder
+        :param record : record of the folder filled during the scan
+        :param previous : record of the previous scan of the folder
+        :param cancel_event : threading.Event stopping the scan when set
+        :param name_filter : only the assets whose name contains it (case insensitive) are scanned
+        :return: generator of asset name and asset record
+        """
+        def is_cancelled():
+            return cancel_event is not None and cancel_event.is_set()
+
+        scan_time = time.time_ns()
+        mtime = self.__get_mtime(folder_path, scan_time)
+        if ABCCatalogScanner.__is_unchanged(previous, mtime):
+            asset_names = list(previous["assets"].keys())
+        else:
+            with os.scandir(folder_path) as it:
+                asset_names = [entry.name for entry in it if entry.name.startswith(_ASSET_PREFIX) and entry.is_dir()]
+        if name_filter:
+            name_filter = name_filter.lower()
+            asset_names = [asset_name for asset_name in asset_names if name_filter in asset_name.lower()]
+        asset_names.sort()
+        record["mtime"] = mtime
+        record["assets"] = {}
+        asset_tasks = [(os.path.join(folder_path, asset_name),
+                        previous["assets"].get(asset_name) if previous is not None else None)
+                       for asset_name in asset_names]
+
+        # List all the asset folders then check all the version folders
+        listings = list(self.__imap(
+            lambda task: None if is_cancelled() else self._list_asset(task[0], scan_time, task[1]), asset_tasks))
+        if is_cancelled():
+            return
+        version_tasks = []
+        for (asset_folder_path, previous_asset), listing in zip(asset_tasks, listings):
+            if listing is None:
+                # The folder is listed again next time to retrieve the asset that could not be listed
+                record["mtime"] = None
+                continue
+            previous_versions = previous_asset["versions"] if previous_asset is not None else {}
+            for version_name in listing[1]:
+                version_tasks.append((asset_folder_path, version_name, previous_versions.get(version_name)))
+
+        version_records = self.__imap(
+            lambda task: None if is_cancelled() else self._check_version(
+                os.path.join(task[0], task[1]), os.path.basename(task[0]), is_anim_folder, scan_time, task[2]),
+            version_tasks)
+        try:
+            for asset_name, listing in zip(asset_names, listings):
+                if listing is None:
+                    continue
+                asset_record = {"mtime": listing[0], "versions": {}}
+                for version_name in listing[1]:
+                    version_record = next(version_records)
+                    if version_record is not None:
+                        asset_record["versions"][version_name] = version_record
+                    else:
+                        # The asset folder is listed again next time to check the version that could not be listed
+                        asset_record["mtime"] = None
+                if is_cancelled():
+                    return
+                record["assets"][asset_name] = asset_record
+                yield asset_name, asset_record
+        finally:
+            version_records.close()
+
+    def iter_scan(self, folder_path, is_anim_folder, cancel_event=None, name_filter=None, rescan=False):
+        """
+        Retrieve the assets in the file architecture of the folder path (an abc or an abc_fur folder)
+        Assets are yielded in name order as soon as they are found.
+        :param folder_path
+        :param is_anim_folder
+        :param cancel_event : threading.Event stopping the scan when set
+        :param name_filter : only the assets whose name contains it (case insensitive) are retrieved
+        :param rescan : whether the record of the folder in the cache is forgotten and its manifest ignored
+        :return: generator of ABCCatalogEntry
+        """
+        folder_path = folder_path.replace("\\", "/")
+        if (cancel_event is not None and cancel_event.is_set()) or not os.path.isdir(folder_path):
+            return
+        if rescan and self.__cache is not None:
+            self.__cache.clear(folder_path, is_anim_folder)
+        manifest = ABCManifest.load(folder_path, is_anim_folder) if self.__use_manifests and not rescan else None
+        if manifest is not None and self.__is_manifest_up_to_date(folder_path, manifest, cancel_event):
+            # No need to walk the folder
+            for asset_name in sorted(manifest["assets"].keys()):
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if not asset_name.startswith(_ASSET_PREFIX) or \
+                        (name_filter and name_filter.lower() not in asset_name.lower()):
+                    continue
+                entry = ABCCatalogScanner.__create_entry(folder_path, asset_name, manifest["assets"][asset_name],
+                                                         is_anim_folder)
+                if entry is not None:
+                    yield entry
+            return
+        if cancel_event is not None and cancel_event.is_set():
+            return
+
+        previous = self.__cache.load(folder_path, is_anim_folder) if self.__cache is not None else None
+        record = {}
+        for asset_name, asset_record in self._iter_folder(folder_path, is_anim_folder, record, previous,
+                                                          cancel_event, name_filter):
+            entry = ABCCatalogScanner.__create_entry(folder_path, asset_name, asset_record, is_anim_folder)
+            if entry is not None:
+                yield entry
+        # Only a complete scan of all the assets is saved in the cache and in the manifest
+        if name_filter or (cancel_event is not None and cancel_event.is_set()):
+            return
+        if self.__cache is not None:
+            self.__cache.save(folder_path, is_anim_folder, record)
+        if self.__write_manifests:
+            ABCManifest.save(folder_path, is_anim_folder, record)
+
+    def __is_manifest_up_to_date(self, folder_path, manifest, cancel_event=None):
+        """
+        Test whether the asset and version folders of a manifest have not been modified since it has been written
+        :param folder_path
+        :param manifest : record of the manifest
+        :param cancel_event : threading.Event stopping the test when set
+        :return: is up to date
+        """
+        checks = []
+        for asset_name, asset_record in manifest["assets"].items():
+            asset_folder_path = os.path.join(folder_path, asset_name)
+            if asset_record["mtime"] is not None:
+                checks.append((asset_folder_path, asset_record["mtime"]))
+            for version_name, version_record in asset_record["versions"].items():
+                if version_record["mtime"] is not None:
+                    checks.append((os.path.join(asset_folder_path, version_name), version_record["mtime"]))
+
+        def is_unchanged(check):
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            try:
+                return os.stat(check[0]).st_mtime_ns == check[1]
+            except OSError:
+                return False
+
+        return all(self.__imap(is_unchanged, checks))
+
+    @staticmethod
+    def __create_entry(folder_path, asset_name, asset_record, is_anim_folder):
+        """
+        Create the entry of an asset from its record
+        :param folder_path
+        :param asset_name
+        :param asset_record
+        :param is_anim_folder
+        :return: ABCCatalogEntry or None if the asset has no valid version
+        """
+        asset_folder_path = os.path.join(folder_path, asset_name)
+        versions = []
+        for version_name, version_record in asset_record["versions"].items():
+            if not version_record["valid"]:
+                continue
+            flags = ABCVersion.HAS_LIGHT_RIG if version_record.get("light_rig") else 0
+            versions.append(ABCVersion(asset_folder_path, version_name, flags,
+                                       ABCFurSequence.from_record(version_record.get("sequence"))))
+        if len(versions) == 0:
+            return None
+        return ABCCatalogEntry(asset_name, versions, is_anim_folder)
+
+    def scan(self, folder_path, is_anim_folder):
+        """
+        Retrieve the assets in the file architecture of the folder path (an abc or an abc_fur folder)
+        :param folder_path
+        :param is_anim_folder
+        :return: list of ABCCatalogEntry sorted by name
+        """
+        return list(self.iter_scan(folder_path, is_anim_folder))
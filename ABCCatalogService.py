@@ -0,0 +1,279 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .ABCImportAsset import *
+
+# ######################################################################################################################
+
+# Maximum number of versions held by all the catalogs. Beyond, the catalogs of the least recently used folders are
+# evicted.
+DEFAULT_MAX_CATALOG_VERSIONS = 100000
+
+
+# ######################################################################################################################
+
+
+def _get_versions_signature(versions):
+    """
+    Get a signature of the versions of an asset that changes when a version, its light rig or its fur frames change
+    :param versions : ABCVersion list
+    :return: signature
+    """
+    signature = []
+    for version in sorted(versions):
+        sequence = version.get_sequence()
+        signature.append((version.get_path(), version.has_flag(ABCVersion.HAS_LIGHT_RIG),
+                          repr(sequence.to_record()) if sequence is not None else None))
+    return tuple(signature)
+
+
+# ######################################################################################################################
+
+
+class ABCFolderCatalog:
+    """
+    Assets discovered in a folder with their last known look status
+    """
+
+    def __init__(self, folder_path, current_project_dir):
+        """
+        Constructor
+        :param folder_path
+        :param current_project_dir
+        """
+        self.__folder_path = folder_path
+        self.__current_project_dir = current_project_dir
+        self.__assets = []
+        # asset -> is look up to date
+        self.__look_statuses = {}
+        self.__nb_versions = 0
+        self.__is_complete = False
+
+    def get_folder_path(self):
+        """
+        Getter of the folder path
+        :return: folder path
+        """
+        return self.__folder_path
+
+    def get_current_project_dir(self):
+        """
+        Getter of the project directory the assets have been created for
+        :return: project directory
+        """
+        return self.__current_project_dir
+
+    def add_asset(self, asset):
+        """
+        Add an asset discovered in the folder
+        :param asset
+        :return:
+        """
+        self.__assets.append(asset)
+        self.__nb_versions += len(asset.get_versions())
+
+    def get_assets(self):
+        """
+        Getter of the assets in the order of their discovery
+        :return: assets
+        """
+        return self.__assets
+
+    def get_nb_versions(self):
+        """
+        Getter of the number of versions of all the assets
+        :return: number of versions
+        """
+        return self.__nb_versions
+
+    def is_up_to_date(self, entries):
+        """
+        Test whether the assets of the catalog are the ones of a new discovery of the folder
+        :param entries : list of (shot, ABCCatalogEntry) discovered
+        :return: is up to date
+        """
+        assets = {(asset.get_shot(), isinstance(asset, ABCImportAnim), asset.get_name()):
+                  _get_versions_signature(asset.get_versions()) for asset in self.__assets}
+        discovered = {(shot, entry.is_anim(), entry.get_name() if entry.is_anim() else entry.get_name() + "_fur"):
+                      _get_versions_signature(entry.get_versions()) for shot, entry in entries}
+        return assets == discovered
+
+    def set_look_status(self, asset, is_look_up_to_date):
+        """
+        Setter of the last known look status of an asset
+        :param asset
+        :param is_look_up_to_date : None if unknown
+        :return:
+        """
+        if is_look_up_to_date is None:
+            self.__look_statuses.pop(asset, None)
+        else:
+            self.__look_statuses[asset] = is_look_up_to_date
+
+    def get_look_status(self, asset):
+        """
+        Getter of the last known look status of an asset
+        :param asset
+        :return: is look up to date or None if unknown
+        """
+        return self.__look_statuses.get(asset)
+
+    def clear_look_statuses(self):
+        """
+        Forget the look statuses
+        :return:
+        """
+        self.__look_statuses.clear()
+
+    def set_complete(self):
+        """
+        Setter of the discovery of the folder as finished
+        :return:
+        """
+        self.__is_complete = True
+
+    def is_complete(self):
+        """
+        Getter of whether the discovery of the folder has finished
+        :return: is complete
+        """
+        return self.__is_complete
+
+
+class ABCCatalogService:
+    """
+    Process-wide catalogs of the assets discovered in the folders, kept across the dialogs so that opening the tool
+    again on a folder shows its assets right away, while the folder is checked again in background against the
+    catalog cache. The catalogs of the least recently used folders are evicted beyond a number of versions held.
+    """
+    # folder key -> ABCFolderCatalog, the least recently used first
+    __catalogs = OrderedDict()
+    # project directory -> ABCLazyLookFactory
+    __look_factories = {}
+    __max_versions = DEFAULT_MAX_CATALOG_VERSIONS
+    __lock = threading.Lock()
+
+    @staticmethod
+    def __get_key(folder_path):
+        """
+        Get the key of a folder
+        :param folder_path
+        :return: key
+        """
+        return os.path.normcase(os.path.normpath(folder_path))
+
+    @staticmethod
+    def get_look_factory(current_project_dir):
+        """
+        Get the look factory of a project, shared by the assets of all the catalogs
+        :param current_project_dir
+        :return: ABCLazyLookFactory
+        """
+        with ABCCatalogService.__lock:
+            look_factory = ABCCatalogService.__look_factories.get(current_project_dir)
+            if look_factory is None:
+                look_factory = ABCLazyLookFactory(current_project_dir)
+                ABCCatalogService.__look_factories[current_project_dir] = look_factory
+            return look_factory
+
+    @staticmethod
+    def get_catalog(folder_path, current_project_dir):
+        """
+        Get the complete catalog of a folder
+        :param folder_path
+        :param current_project_dir
+        :return: ABCFolderCatalog or None if the folder has not been fully discovered
+        """
+        key = ABCCatalogService.__get_key(folder_path)
+        with ABCCatalogService.__lock:
+            catalog = ABCCatalogService.__catalogs.get(key)
+            if catalog is None or not catalog.is_complete() or \
+                    catalog.get_current_project_dir() != current_project_dir:
+                return None
+            ABCCatalogService.__catalogs.move_to_end(key)
+            return catalog
+
+    @staticmethod
+    def create_catalog(folder_path, current_project_dir):
+        """
+        Create the catalog of a folder to fill, replacing the previous one
+        :param folder_path
+        :param current_project_dir
+        :return: ABCFolderCatalog
+        """
+        key = ABCCatalogService.__get_key(folder_path)
+        catalog = ABCFolderCatalog(folder_path, current_project_dir)
+        with ABCCatalogService.__lock:
+            ABCCatalogService.__catalogs.pop(key, None)
+            ABCCatalogService.__catalogs[key] = catalog
+        return catalog
+
+    @staticmethod
+    def complete_catalog(catalog):
+        """
+        Set the discovery of a catalog as finished and evict the least recently used catalogs beyond the limit
+        :param catalog
+        :return:
+        """
+        catalog.set_complete()
+        with ABCCatalogService.__lock:
+            ABCCatalogService.__evict()
+
+    @staticmethod
+    def __evict():
+        """
+        Evict the least recently used catalogs until the number of versions is under the limit. The most recent
+        catalog is always kept.
+        :return:
+        """
+        nb_versions = sum(catalog.get_nb_versions() for catalog in ABCCatalogService.__catalogs.values())
+        while nb_versions > ABCCatalogService.__max_versions and len(ABCCatalogService.__catalogs) > 1:
+            _, catalog = ABCCatalogService.__catalogs.popitem(last=False)
+            nb_versions -= catalog.get_nb_versions()
+
+    @staticmethod
+    def invalidate(folder_path=None):
+        """
+        Forget the catalog of a folder so that it is discovered again
+        :param folder_path : None to forget all the catalogs
+        :return:
+        """
+        with ABCCatalogService.__lock:
+            if folder_path is None:
+                ABCCatalogService.__catalogs.clear()
+            else:
+                ABCCatalogService.__catalogs.pop(ABCCatalogService.__get_key(folder_path), None)
+
+    @staticmethod
+    def invalidate_look_statuses():
+        """
+        Forget the look statuses of all the catalogs
+        :return:
+        """
+        with ABCCatalogService.__lock:
+            for catalog in ABCCatalogService.__catalogs.values():
+                catalog.clear_look_statuses()
+
+    @staticmethod
+    def set_max_versions(max_versions):
+        """
+        Setter of the maximum number of versions held by the catalogs
+        :param max_versions
+        :return:
+        """
+        with ABCCatalogService.__lock:
+            ABCCatalogService.__max_versions = max(0, max_versions)
+            ABCCatalogService.__evict()
+
+    @staticmethod
+    def get_stats():
+        """
+        Getter of the number of catalogs and of versions held
+        :return: dict
+        """
+        with ABCCatalogService.__lock:
+            return {
+                "catalogs": len(ABCCatalogService.__catalogs),
+                "versions": sum(catalog.get_nb_versions() for catalog in ABCCatalogService.__catalogs.values()),
+            }
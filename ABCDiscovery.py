@@ -0,0 +1,190 @@
+import os
+import re
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide2.QtCore import *
+
+from common.utils import *
+
+from .ABCProfiler import *
+
+# ######################################################################################################################
+
+# Number of shots discovered concurrently
+DEFAULT_SHARD_WORKERS = 4
+
+_ABC_FOLDER_NAMES = ["abc", "abc_fur"]
+
+
+# ######################################################################################################################
+
+
+def get_abc_folders(folder_path):
+    """
+    Get the abc folders to scan for a folder : the folder itself if it is an abc or an abc_fur folder, its abc and
+    abc_fur children if it is a shot folder
+    :param folder_path
+    :return: list of (folder path, is anim folder)
+    """
+    folder_path = folder_path.rstrip("\\/")
+    if re.match(r".*[/\\]abc$", folder_path):
+        return [(folder_path, True)]
+    if re.match(r".*[/\\]abc_fur$", folder_path):
+        return [(folder_path, False)]
+    try:
+        with os.scandir(folder_path) as it:
+            child_names = set(entry.name for entry in it if entry.is_dir())
+    except OSError:
+        return []
+    return [(os.path.join(folder_path, name), name == "abc") for name in _ABC_FOLDER_NAMES if name in child_names]
+
+
+def get_discovery_shards(folder_paths):
+    """
+    Get the shots to discover in some folders. A folder is either a shot folder, an abc or abc_fur folder or a sequence
+    folder whose children are shot folders.
+    :param folder_paths
+    :return: list of (shot name, shot or abc folder path). The children of a sequence folder are only checked when
+    they are discovered.
+    """
+    shards = []
+    for folder_path in folder_paths:
+        folder_path = folder_path.rstrip("\\/")
+        if os.path.basename(folder_path) in _ABC_FOLDER_NAMES:
+            shards.append((os.path.basename(os.path.dirname(folder_path)), folder_path))
+            continue
+        try:
+            with os.scandir(folder_path) as it:
+                child_dirs = sorted((entry.name, entry.path) for entry in it if entry.is_dir())
+        except OSError:
+            continue
+        if any(name in _ABC_FOLDER_NAMES for name, _ in child_dirs):
+            shards.append((os.path.basename(folder_path), folder_path))
+        else:
+            shards.extend(child_dirs)
+    return shards
+
+
+# ######################################################################################################################
+
+
+class ABCDiscoveryThread(QThread):
+    """
+    Scan abc folders out of the UI thread and stream the assets found.
+    Several shots are discovered concurrently, one shard per shot. An error in a shot does not stop the other shots
+    but the discovery is reported as failed.
+    """
+    # shot name (None if a single shot is discovered), ABCCatalogEntry
+    entry_found = Signal(object, object)
+
+    def __init__(self, scanner, folder_paths, name_filter=None, max_shard_workers=DEFAULT_SHARD_WORKERS,
+                 rescan=False):
+        """
+        Constructor
+        :param scanner : ABCCatalogScanner
+        :param folder_paths : shot, abc, abc_fur or sequence folders to discover
+        :param name_filter : only the assets whose name contains it (case insensitive) are discovered
+        :param max_shard_workers : number of shots discovered concurrently
+        :param rescan : whether the records of the folders are forgotten and their manifests ignored
+        """
+        super(ABCDiscoveryThread, self).__init__()
+        self.__scanner = scanner
+        self.__folder_paths = folder_paths
+        self.__name_filter = name_filter
+        self.__max_shard_workers = max(1, max_shard_workers)
+        self.__rescan = rescan
+        self.__cancel_event = threading.Event()
+        self.__has_failed = False
+        self.__has_abc_folders = False
+
+    def cancel(self):
+        """
+        Stop the scan as soon as possible. No entry is emitted after the cancellation.
+        :return:
+        """
+        self.__cancel_event.set()
+
+    def is_cancelled(self):
+        """
+        Getter of whether the scan has been cancelled
+        :return: is cancelled
+        """
+        return self.__cancel_event.is_set()
+
+    def has_abc_folders(self):
+        """
+        Getter of whether abc or abc_fur folders have been found in the folders discovered
+        :return: has abc folders
+        """
+        return self.__has_abc_folders
+
+    def has_failed(self):
+        """
+        Getter of whether an error has stopped the discovery of some folders
+        :return: has failed
+        """
+        return self.__has_failed
+
+    @profiled("discovery.scan")
+    def run(self):
+        """
+        Scan the shots and emit each ABCCatalogEntry found
+        :return:
+        """
+        try:
+            shards = get_discovery_shards(self.__folder_paths)
+            if len(shards) == 1:
+                self.__scan_shard(None, shards[0][1])
+            elif self.__max_shard_workers == 1:
+                for shot, folder_path in shards:
+                    if self.is_cancelled():
+                        return
+                    self.__scan_shard(shot, folder_path)
+            else:
+                with ThreadPoolExecutor(max_workers=self.__max_shard_workers) as executor:
+                    futures = [executor.submit(self.__scan_shard, shot, folder_path) for shot, folder_path in shards]
+                    for index, future in enumerate(futures):
+                        if self.is_cancelled():
+                            # The shards not started are dropped, the running ones stop at their next entry
+                            for pending_future in futures[index:]:
+                                pending_future.cancel()
+                            break
+                        future.result()
+        except Exception as e:
+            self.__has_failed = True
+            print_warning("Error while scanning the abc folders", char_filler='-')
+            print(f'caught {type(e)}: e')
+            print(e)
+            traceback.print_exception(*sys.exc_info())
+
+    @profiled("discovery.shard")
+    def __scan_shard(self, shot, folder_path):
+        """
+        Scan the abc folders of a shot. An error only stops the scan of the shot.
+        :param shot : shot name emitted with the entries
+        :param folder_path : shot, abc or abc_fur folder
+        :return:
+        """
+        if self.is_cancelled():
+            return
+        try:
+            abc_folders = get_abc_folders(folder_path)
+            if len(abc_folders) > 0:
+                self.__has_abc_folders = True
+            for abc_folder_path, is_anim_folder in abc_folders:
+                if self.is_cancelled():
+                    return
+                for entry in self.__scanner.iter_scan(abc_folder_path, is_anim_folder, self.__cancel_event,
+                                                      self.__name_filter, self.__rescan):
+                    if self.is_cancelled():
+                        return
+                    self.entry_found.emit(shot, entry)
+        except Exception as e:
+            self.__has_failed = True
+            print_warning("Error while scanning the abc folders of " + folder_path, char_filler='-')
+            print(f'caught {type(e)}: e')
+            print(e)
+            traceback.print_exception(*sys.exc_info())
@@ -1,9 +1,10 @@
 import os
+import time
 from functools import partial
 
 import sys
 
-import pymel.core as pm
+import maya.cmds as cmds
 import maya.OpenMayaUI as omui
 
 from PySide2 import QtCore
@@ -22,11 +23,56 @@ from common.Prefs import *
 import maya.OpenMaya as OpenMaya
 
 from .ABCImportAsset import *
+from .ABCCatalog import *
+from .ABCDiscovery import *
+from .ABCImportModel import *
+from .ABCSceneIndex import *
+from .ABCSceneWatcher import *
+from .ABCImportBatch import *
+from .ABCReferenceIndex import *
+from .ABCLookCache import *
+from .ABCProfiler import *
+from .ABCLazyImport import *
+from .ABCCatalogService import *
+
+# Loaded on first use so that the window shows up before PyMEL is loaded
+pm = lazy_import("pymel.core")
 
 # ######################################################################################################################
 
 _FILE_NAME_PREFS = "abc_import"
 
+# Number of threads listing the abc folders (1 to scan sequentially)
+_DEFAULT_SCAN_WORKERS = 1
+
+# Labels of the light rig loading options
+_LIGHT_RIG_LOADING_LABELS = [
+    (ABCLightRigLoading.Immediate, "Load light rigs during the import"),
+    (ABCLightRigLoading.AfterImport, "Load light rigs when the import finishes"),
+    (ABCLightRigLoading.OnDemand, "Load light rigs on demand"),
+]
+
+# Labels of the state filters of the table
+_STATE_FILTER_LABELS = [
+    (ABCStateFilter.All, "All states"),
+    (ABCStateFilter.OutOfDate, "Out of date"),
+    (ABCStateFilter.New, "New"),
+    (ABCStateFilter.LookOutOfDate, "Look out of date"),
+]
+
+# Discovery threads still running, kept alive until they finish even if their dialog has been closed
+_discovery_threads = set()
+
+
+def _release_discovery_thread(thread):
+    """
+    Release a discovery thread once it has finished
+    :param thread
+    :return:
+    """
+    thread.wait()
+    _discovery_threads.discard(thread)
+
 
 # ######################################################################################################################
 
@@ -52,7 +98,7 @@ class ABCImport(QDialog):
                 return None
             return check_dir_recursive(count + 1, next_dirpath)
 
-        scene_name = pm.sceneName()
+        scene_name = cmds.file(query=True, sceneName=True)
         if len(scene_name) > 0:
             dirpath = os.path.dirname(scene_name)
             abc_parent_dir = check_dir_recursive(1, dirpath)
@@ -63,7 +109,8 @@ class ABCImport(QDialog):
     @staticmethod
     def __is_correct_folder(folder):
         """
-        Test if a folder is correct to be a container of abcs
+        Test if a folder is correct to be a container of abcs. Lists the folder and its children so it is only used
+        on a folder browsed, the discovery checks the folders typed.
         :param folder
         :return:
         """
@@ -75,6 +122,8 @@ class ABCImport(QDialog):
             return True
         if ABCImport.__is_abc_fur_folder(folder):
             return True
+        if ABCImport.__is_sequence_folder(folder):
+            return True
         return False
 
     @staticmethod
@@ -95,6 +144,23 @@ class ABCImport(QDialog):
         """
         return re.match(r".*[/\\]abc_fur[/\\]?$", folder)
 
+    @staticmethod
+    def __is_sequence_folder(folder):
+        """
+        Test whether the folder is a sequence folder, a parent of shot folders, or not
+        :param folder:
+        :return:
+        """
+        try:
+            child_names = os.listdir(folder)
+        except OSError:
+            return False
+        for d in child_names:
+            child_folder = os.path.join(folder, d)
+            if os.path.isdir(child_folder) and ABCImport.__is_parent_abc_folder(child_folder):
+                return True
+        return False
+
     @staticmethod
     def __is_parent_abc_folder(folder):
         """
@@ -102,13 +168,25 @@ class ABCImport(QDialog):
         :param folder:
         :return:
         """
-        for d in os.listdir(folder):
+        try:
+            child_names = os.listdir(folder)
+        except OSError:
+            return False
+        for d in child_names:
             if os.path.isdir(os.path.join(folder, d)):
                 if d in ["abc", "abc_fur"]:
                     return True
         return False
 
-    def __init__(self, prnt=wrapInstance(int(omui.MQtUtil.mainWindow()), QWidget)):
+    def __init__(self, prnt=wrapInstance(int(omui.MQtUtil.mainWindow()), QWidget), launch_time=None,
+                 import_duration=None):
+        """
+        Constructor
+        :param prnt
+        :param launch_time : time.perf_counter() when the tool has been launched, to measure the startup
+        :param import_duration : time spent importing the modules of the tool
+        """
+        init_start_time = time.perf_counter()
         super(ABCImport, self).__init__(prnt)
 
         # Common Preferences (common preferences on all tools)
@@ -116,16 +194,46 @@ class ABCImport(QDialog):
         # Preferences for this tool
         self.__prefs = Prefs(_FILE_NAME_PREFS)
 
+        # Instrumentation enabled by the environment variable ABC_IMPORT_PROFILE or the preferences
+        if ABCProfiler.is_enabled_by_env() or ("profiling" in self.__prefs and self.__prefs["profiling"]):
+            ABCProfiler.enable()
+
         # Model attributes
         dirname = ABCImport.__get_abc_parent_dir(4)
         self.__folder_path = dirname if dirname is not None else ""
+        self.__is_folder_valid = False
+        self.__name_filter = ""
         self.__update_uvs_shaders = True
-        self.__abcs = []
+        look_status_workers = self.__prefs["look_status_workers"] if "look_status_workers" in self.__prefs \
+            else DEFAULT_LOOK_STATUS_WORKERS
+        self.__abcs_model = ABCImportTableModel(look_status_workers)
+        self.__abcs_filter_model = ABCImportFilterProxyModel()
+        self.__abcs_filter_model.setSourceModel(self.__abcs_model)
+        self.__is_filter_changing = False
         self.__selected_abcs = []
+        self.__names_to_reselect = set()
+        self.__scene_index = ABCSceneIndex()
+        self.__scene_watcher = ABCSceneWatcher(self)
+        self.__scene_watcher.standins_changed.connect(self.__on_standins_changed)
+        self.__scene_watcher.scene_changed.connect(self.__on_scene_changed)
+        self.__is_scene_watched_once = False
+        self.__discovery_thread = None
+        # (shot, entry) found by the discovery checking a catalog, None if the discovery fills the table
+        self.__revalidation_entries = None
+        self.__reference_index = ABCReferenceIndex()
+        self.__light_rig_loading = ABCLightRigLoading.Immediate
 
         self.__retrieve_current_project_dir()
-        self.__look_factory = LookFactory(self.__current_project_dir)
-        self.__retrieve_abcs()
+        # The look factory and the catalogs of the folders are kept across the dialogs
+        self.__look_factory = ABCCatalogService.get_look_factory(self.__current_project_dir)
+        self.__catalog = None
+        if "catalog_max_versions" in self.__prefs:
+            ABCCatalogService.set_max_versions(self.__prefs["catalog_max_versions"])
+        scan_workers = self.__prefs["scan_workers"] if "scan_workers" in self.__prefs else _DEFAULT_SCAN_WORKERS
+        self.__shard_workers = self.__prefs["shard_workers"] if "shard_workers" in self.__prefs \
+            else DEFAULT_SHARD_WORKERS
+        write_manifests = self.__prefs["write_manifests"] if "write_manifests" in self.__prefs else False
+        self.__catalog_scanner = ABCCatalogScanner(ABCCatalogCache(), scan_workers, write_manifests=write_manifests)
 
         # UI attributes
         self.__ui_width = 600
@@ -147,6 +255,15 @@ class ABCImport(QDialog):
         self.__create_ui()
         self.__refresh_ui()
 
+        # The scene and the abc folders are only retrieved once the window has been painted
+        self.__launch_time = launch_time if launch_time is not None else init_start_time
+        self.__import_duration = import_duration
+        self.__init_duration = time.perf_counter() - init_start_time
+        self.__is_painted_once = False
+        self.__first_paint_timer = QTimer(self)
+        self.__first_paint_timer.setSingleShot(True)
+        self.__first_paint_timer.timeout.connect(self.__on_first_paint)
+
     def __save_prefs(self):
         """
         Save preferences
@@ -171,12 +288,71 @@ class ABCImport(QDialog):
             pos = self.__prefs["window_pos"]
             self.__ui_pos = QPoint(pos["x"], pos["y"])
 
+        if "light_rig_loading" in self.__prefs and self.__prefs["light_rig_loading"] in ABCLightRigLoading.__members__:
+            self.__light_rig_loading = ABCLightRigLoading[self.__prefs["light_rig_loading"]]
+
+    def showEvent(self, arg__1: QShowEvent) -> None:
+        """
+        Watch the scene
+        :return:
+        """
+        # The scene may have changed while the window was hidden
+        if self.__is_scene_watched_once:
+            self.__retrieve_assets_in_scene()
+            self.__refresh_ui()
+        self.__is_scene_watched_once = True
+        self.__scene_watcher.start(self.__scene_index.get_standins())
+
+    def paintEvent(self, arg__1: QPaintEvent) -> None:
+        """
+        Retrieve the abcs once the window has been painted for the first time
+        :return:
+        """
+        super(ABCImport, self).paintEvent(arg__1)
+        if not self.__is_painted_once:
+            self.__is_painted_once = True
+            # Let the first paint be flushed before indexing the scene
+            self.__first_paint_timer.start(0)
+
+    def __on_first_paint(self):
+        """
+        Report the startup times and retrieve the abcs
+        :return:
+        """
+        first_paint_duration = time.perf_counter() - self.__launch_time
+        if ABCProfiler.is_enabled():
+            if self.__import_duration is not None:
+                ABCProfiler.add_phase_time("startup.import", self.__import_duration)
+            ABCProfiler.add_phase_time("startup.init", self.__init_duration)
+            ABCProfiler.add_phase_time("startup.first_paint", first_paint_duration)
+            imports = "imports %.3fs, " % self.__import_duration if self.__import_duration is not None else ""
+            print("ABC Import startup : %swindow %.3fs, first paint %.3fs" % (
+                imports, self.__init_duration, first_paint_duration))
+        # The scene is indexed once, then kept up to date by the scene watcher
+        self.__retrieve_assets_in_scene()
+        # Discover the abcs in background so that the window stays responsive
+        self.__retrieve_abcs()
+
     def hideEvent(self, arg__1: QCloseEvent) -> None:
         """
-        Save preferences
+        Save preferences and stop watching the scene
         :return:
         """
         self.__save_prefs()
+        self.__scene_watcher.stop()
+
+    def closeEvent(self, arg__1: QCloseEvent) -> None:
+        """
+        Stop the discovery and the look status evaluation, stop watching the scene and write the profiling report
+        :return:
+        """
+        self.__cancel_discovery()
+        self.__store_look_statuses()
+        self.__abcs_model.stop_look_status_evaluation()
+        self.__scene_watcher.stop()
+        ABCProfiler.write_report()
+        ABCProfiler.disable()
+        super(ABCImport, self).closeEvent(arg__1)
 
     def __retrieve_current_project_dir(self):
         """
@@ -225,6 +401,7 @@ class ABCImport(QDialog):
         main_lyt.addLayout(folder_lyt)
         self.__ui_folder_path = QLineEdit(self.__folder_path)
         self.__ui_folder_path.setFixedHeight(27)
+        self.__ui_folder_path.setToolTip("Shot, abc, abc_fur or sequence folders separated by \";\"")
         self.__ui_folder_path.textChanged.connect(self.__on_folder_changed)
         folder_lyt.addWidget(self.__ui_folder_path)
 
@@ -244,34 +421,105 @@ class ABCImport(QDialog):
         import_btn.setToolTip("Browse an abc and import it")
         folder_lyt.addWidget(import_btn)
 
+        rescan_btn = QPushButton("Rescan")
+        rescan_btn.setFixedHeight(24)
+        rescan_btn.clicked.connect(partial(self.__rescan_folder))
+        rescan_btn.setToolTip("Forget the abcs known for this folder and search them again")
+        folder_lyt.addWidget(rescan_btn)
+
+        # Asset name filter of the discovery
+        self.__ui_name_filter = QLineEdit(self.__name_filter)
+        self.__ui_name_filter.setPlaceholderText("Only search the assets containing...")
+        self.__ui_name_filter.setClearButtonEnabled(True)
+        self.__ui_name_filter.editingFinished.connect(self.__on_name_filter_changed)
+        main_lyt.addWidget(self.__ui_name_filter)
+
+        # Filter of the table
+        filter_lyt = QHBoxLayout()
+        main_lyt.addLayout(filter_lyt)
+        self.__ui_filter_text = QLineEdit()
+        self.__ui_filter_text.setPlaceholderText("Filter the abcs...")
+        self.__ui_filter_text.setClearButtonEnabled(True)
+        self.__ui_filter_text.textChanged.connect(self.__on_filter_changed)
+        filter_lyt.addWidget(self.__ui_filter_text, 1)
+        self.__ui_filter_name_match = QComboBox()
+        self.__ui_filter_name_match.addItem("Contains", ABCNameMatch.Substring)
+        self.__ui_filter_name_match.addItem("Starts with", ABCNameMatch.Prefix)
+        self.__ui_filter_name_match.currentIndexChanged.connect(self.__on_filter_changed)
+        filter_lyt.addWidget(self.__ui_filter_name_match)
+        self.__ui_filter_state = QComboBox()
+        for state_filter, label in _STATE_FILTER_LABELS:
+            self.__ui_filter_state.addItem(label, state_filter)
+        self.__ui_filter_state.currentIndexChanged.connect(self.__on_filter_changed)
+        filter_lyt.addWidget(self.__ui_filter_state)
+
         # Asset Table
-        self.__ui_abcs_table = QTableWidget(0, 5)
+        self.__ui_abcs_table = QTableView()
+        self.__ui_abcs_table.setModel(self.__abcs_filter_model)
         self.__ui_abcs_table.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Preferred)
         self.__ui_abcs_table.verticalHeader().hide()
+        self.__ui_abcs_table.verticalHeader().setDefaultSectionSize(30)
         self.__ui_abcs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.__ui_abcs_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.__ui_abcs_table.setHorizontalHeaderLabels(
-            ["State", "Asset name", "Actual version", "Import version", "Look"])
+        self.__ui_abcs_table.setItemDelegateForColumn(ABCImportTableModel.STATE_COLUMN,
+                                                      ABCIconDelegate(STATE_ICON_SIZE, self.__ui_abcs_table))
+        self.__ui_abcs_table.setItemDelegateForColumn(ABCImportTableModel.IMPORT_VERSION_COLUMN,
+                                                      ABCVersionDelegate(self.__ui_abcs_table))
+        self.__ui_abcs_table.setItemDelegateForColumn(ABCImportTableModel.LOOK_COLUMN,
+                                                      ABCIconDelegate(LOOK_ICON_SIZE, self.__ui_abcs_table))
         horizontal_header = self.__ui_abcs_table.horizontalHeader()
         horizontal_header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
         horizontal_header.setSectionResizeMode(1, QHeaderView.Stretch)
         horizontal_header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
         horizontal_header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
         horizontal_header.setSectionResizeMode(4, QHeaderView.ResizeToContents)
-        self.__ui_abcs_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.__ui_abcs_table.itemSelectionChanged.connect(self.__on_abcs_selection_changed)
+        self.__ui_abcs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.__ui_abcs_table.selectionModel().selectionChanged.connect(self.__on_abcs_selection_changed)
         main_lyt.addWidget(self.__ui_abcs_table)
 
+        # Discovery progress
+        self.__ui_discovery_widget = QWidget()
+        discovery_lyt = QHBoxLayout(self.__ui_discovery_widget)
+        discovery_lyt.setContentsMargins(0, 0, 0, 0)
+        self.__ui_discovery_lbl = QLabel()
+        discovery_lyt.addWidget(self.__ui_discovery_lbl)
+        discovery_progress = QProgressBar()
+        discovery_progress.setRange(0, 0)
+        discovery_progress.setFixedHeight(12)
+        discovery_progress.setTextVisible(False)
+        discovery_lyt.addWidget(discovery_progress, 1)
+        self.__ui_discovery_widget.hide()
+        main_lyt.addWidget(self.__ui_discovery_widget)
+
         # Update UV and Shader checkbox
         self.__ui_update_uvs_shaders = QCheckBox("Set last Look")
         self.__ui_update_uvs_shaders.setChecked(self.__update_uvs_shaders)
         self.__ui_update_uvs_shaders.stateChanged.connect(self.__on_checked_update_uvs_shaders)
         main_lyt.addWidget(self.__ui_update_uvs_shaders, 0, Qt.AlignHCenter)
 
+        # Light rig loading
+        light_rig_lyt = QHBoxLayout()
+        main_lyt.addLayout(light_rig_lyt)
+        self.__ui_light_rig_loading = QComboBox()
+        for light_rig_loading, label in _LIGHT_RIG_LOADING_LABELS:
+            self.__ui_light_rig_loading.addItem(label, light_rig_loading)
+        self.__ui_light_rig_loading.setCurrentIndex(self.__ui_light_rig_loading.findData(self.__light_rig_loading))
+        self.__ui_light_rig_loading.currentIndexChanged.connect(self.__on_light_rig_loading_changed)
+        light_rig_lyt.addWidget(self.__ui_light_rig_loading, 1)
+        self.__ui_load_light_rigs_btn = QPushButton()
+        self.__ui_load_light_rigs_btn.clicked.connect(self.__load_pending_light_rigs)
+        light_rig_lyt.addWidget(self.__ui_load_light_rigs_btn)
+
         # Submit Import button
+        import_lyt = QHBoxLayout()
+        main_lyt.addLayout(import_lyt)
         self.__ui_import_btn = QPushButton("Import or Update selection")
         self.__ui_import_btn.clicked.connect(self.__import_update_selected_abcs)
-        main_lyt.addWidget(self.__ui_import_btn)
+        import_lyt.addWidget(self.__ui_import_btn, 1)
+        self.__ui_dry_run_btn = QPushButton("Preview")
+        self.__ui_dry_run_btn.setToolTip("Show what would be changed in the scene by the import or update")
+        self.__ui_dry_run_btn.clicked.connect(self.__dry_run_selected_abcs)
+        import_lyt.addWidget(self.__ui_dry_run_btn)
 
     def __refresh_ui(self):
         """
@@ -292,118 +540,50 @@ class ABCImport(QDialog):
         if nb_abcs_selected == 0:
             enabled = False
             tooltip = "Select atleast one abc to import or update"
-        elif not self.__is_correct_folder(self.__folder_path):
+        elif not self.__is_folder_valid:
             enabled = False
-            tooltip = "The export folder must be named a parent folder of a folder named \"abc\" or \"abc_fur\""
+            tooltip = "The export folder must be named a parent folder of a folder named \"abc\" or \"abc_fur\"" \
+                      " or a parent folder of such shot folders"
+        nb_hidden_abcs_selected = len([abc for abc in self.__selected_abcs
+                                       if not self.__abcs_filter_model.is_accepted(abc)])
+        if enabled and nb_hidden_abcs_selected > 0:
+            tooltip = str(nb_hidden_abcs_selected) + " of the " + str(nb_abcs_selected) + \
+                      " abcs selected are hidden by the filter"
         self.__ui_import_btn.setEnabled(enabled)
         self.__ui_import_btn.setToolTip(tooltip)
+        self.__ui_dry_run_btn.setEnabled(enabled)
+
+        nb_pending_light_rigs = len(self.__reference_index.get_pending())
+        self.__ui_load_light_rigs_btn.setText("Load light rigs (" + str(nb_pending_light_rigs) + ")")
+        self.__ui_load_light_rigs_btn.setEnabled(nb_pending_light_rigs > 0)
+        self.__ui_load_light_rigs_btn.setToolTip("Load the light rigs referenced but not loaded yet")
 
-    def __refresh_table(self):
+    @profiled("refresh_table")
+    def __refresh_table(self, abcs=None):
         """
-        Refresh the table
+        Refresh the rows of the table
+        :param abcs : abcs to refresh (all if None)
         :return:
         """
-        selected_abcs = [abc.get_name() for abc in self.__selected_abcs]
-
-        asset_dir = os.path.dirname(__file__) + "/assets/"
-
-        self.__ui_abcs_table.setRowCount(0)
-        row_index = 0
-        selected_rows = []
-        for abc in self.__abcs:
-            # Get model data
-            name = abc.get_name()
-            anim_versions = abc.get_versions()
-            anim_import_version = abc.get_import_path()
-            anim_actual_version = abc.get_actual_version()
-
-            self.__ui_abcs_table.insertRow(row_index)
+        self.__abcs_model.refresh_abcs(abcs)
+        if abcs is None:
+            abcs = self.__abcs_model.get_abcs()
+        for abc in abcs:
+            self.__refresh_row_span(abc)
 
-            if name in selected_abcs:
-                selected_rows.append(row_index)
-
-            # Get if the abc is NEW (2),  Present and out of date (1) or Present and Up to date (0)
-            if anim_actual_version is None:
-                state = ABCState.New
-            else:
-                if int(os.path.basename(anim_actual_version)) < int(os.path.basename(anim_versions[0])):
-                    state = ABCState.OutOfDate
-                else:
-                    state = ABCState.UpToDate
-
-            # Icon State
-            icon_widget = QLabel()
-            icon_widget.setFixedSize(QSize(25, 25))
-            icon_widget.setScaledContents(True)
-            if state == ABCState.UpToDate:
-                tooltip = "Up to date"
-            elif state == ABCState.OutOfDate:
-                tooltip = "Out of date"
-            else:
-                tooltip = "New"
-            pixmap = QPixmap(asset_dir + abc.get_icon_filename(state))
-            icon_widget.setPixmap(pixmap)
-            icon_widget.setToolTip(tooltip)
-
-            # State
-            container_icon_widget = QWidget()
-            layout_container_icon_widget = QVBoxLayout(container_icon_widget)
-            layout_container_icon_widget.setContentsMargins(0, 0, 0, 0)
-            layout_container_icon_widget.addWidget(icon_widget)
-            layout_container_icon_widget.setAlignment(Qt.AlignCenter)
-            container_icon_widget.setLayout(layout_container_icon_widget)
-            self.__ui_abcs_table.setCellWidget(row_index, 0, container_icon_widget)
-
-            # Name
-            name_item = QTableWidgetItem(name)
-            name_item.setData(Qt.UserRole, abc)
-            self.__ui_abcs_table.setItem(row_index, 1, name_item)
-            if state == ABCState.New:
-                self.__ui_abcs_table.setSpan(row_index, 1, 1, 2)
-
-            # Actual version
-            if state != ABCState.New:
-                version_item = QTableWidgetItem(abc.get_actual_version())
-                version_item.setData(Qt.UserRole, abc)
-                version_item.setTextAlignment(Qt.AlignCenter)
-                self.__ui_abcs_table.setItem(row_index, 2, version_item)
-
-            # Import version
-            import_version_combobox = QComboBox()
-            import_version_combobox.setStyleSheet(".QComboBox{margin:2px; padding:3px}")
-            self.__ui_abcs_table.setCellWidget(row_index, 3, import_version_combobox)
-            for v in anim_versions:
-                import_version_combobox.addItem(os.path.basename(v), v)
-            import_version_combobox.currentIndexChanged.connect(partial(self.__on_version_combobox_changed, row_index))
-            if anim_import_version is not None:
-                import_version_combobox.setCurrentText(os.path.basename(anim_import_version))
-
-            # Action
-            if state != ABCState.New:
-                if not abc.is_look_up_to_date():
-                    pixmap = QPixmap(asset_dir + abc.get_icon_filename(state))
-                    look_icon_widget = QLabel()
-                    look_icon_widget.setFixedSize(QSize(22, 22))
-                    look_icon_widget.setScaledContents(True)
-                    look_icon_widget.setPixmap(pixmap)
-                    look_icon_widget.setToolTip("Look out of date")
-                    pixmap = QPixmap(asset_dir + "look.png")
-                    look_icon_widget.setPixmap(pixmap)
-                    container_look_icon_widget = QWidget()
-                    layout_container_look_icon_widget = QVBoxLayout(container_look_icon_widget)
-                    layout_container_look_icon_widget.setContentsMargins(0, 0, 0, 0)
-                    layout_container_look_icon_widget.addWidget(look_icon_widget)
-                    layout_container_look_icon_widget.setAlignment(Qt.AlignCenter)
-                    container_look_icon_widget.setLayout(layout_container_look_icon_widget)
-                    self.__ui_abcs_table.setCellWidget(row_index, 4, container_look_icon_widget)
-
-            row_index += 1
-
-        # Select the previous selected rows
-        self.__ui_abcs_table.setSelectionMode(QAbstractItemView.MultiSelection)
-        for row_index in selected_rows:
-            self.__ui_abcs_table.selectRow(row_index)
-        self.__ui_abcs_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+    def __refresh_row_span(self, abc):
+        """
+        Span the name of a new abc over the actual version column
+        :param abc
+        :return:
+        """
+        row = self.__abcs_filter_model.get_row(abc)
+        if row is None:
+            return
+        is_new = abc.get_state() == ABCState.New
+        column_span = 2 if is_new else 1
+        if self.__ui_abcs_table.columnSpan(row, ABCImportTableModel.NAME_COLUMN) != column_span:
+            self.__ui_abcs_table.setSpan(row, ABCImportTableModel.NAME_COLUMN, 1, column_span)
 
     def __browse_folder(self):
         """
@@ -432,11 +612,31 @@ class ABCImport(QDialog):
             self.__retrieve_assets_in_scene()
             self.__refresh_ui()
 
-    def __on_selection_changed(self, *args, **kwarrgs):
+    def __on_standins_changed(self, updated_standins, removed_standins):
         """
-        Refresh ui on new selection
+        Refresh only the abcs whose stand-ins have been added, removed or modified in the scene
+        :param updated_standins
+        :param removed_standins
         :return:
         """
+        names = set()
+        for standin in removed_standins:
+            names |= self.__scene_index.remove_standin(standin)
+        for standin in updated_standins:
+            names |= self.__scene_index.update_standin(standin)
+        abcs = [abc for abc in self.__abcs_model.get_abcs() if abc.get_name() in names]
+        for abc in abcs:
+            self.__match_asset_in_scene(abc)
+        self.__refresh_btn()
+        self.__refresh_table(abcs)
+
+    def __on_scene_changed(self):
+        """
+        Retrieve all the assets in the new scene
+        :return:
+        """
+        ABCLookCache.clear()
+        ABCCatalogService.invalidate_look_statuses()
         self.__retrieve_assets_in_scene()
         self.__refresh_ui()
 
@@ -448,90 +648,281 @@ class ABCImport(QDialog):
         """
         self.__update_uvs_shaders = state == 2
 
+    def __on_light_rig_loading_changed(self, index):
+        """
+        On light rig loading option changed
+        :param index
+        :return:
+        """
+        self.__light_rig_loading = self.__ui_light_rig_loading.itemData(index)
+        self.__prefs["light_rig_loading"] = self.__light_rig_loading.name
+
     def __on_folder_changed(self):
         """
         Retrieve the new folder and refresh the ui on new folder
         :return:
         """
-        retrieved_text = self.__ui_folder_path.text().strip("\\/")
+        retrieved_text = ";".join(
+            folder_path.strip().rstrip("\\/") for folder_path in self.__ui_folder_path.text().split(";"))
         if self.__folder_path != retrieved_text:
             self.__folder_path = retrieved_text
             self.__retrieve_abcs()
             self.__refresh_ui()
 
-    def __on_abcs_selection_changed(self):
+    def __on_name_filter_changed(self):
         """
-        On selection in the table changed
+        Retrieve the abcs matching the new asset name filter
         :return:
         """
-        self.__selected_abcs.clear()
-        for selected_row in self.__ui_abcs_table.selectionModel().selectedRows():
-            self.__selected_abcs.append(self.__ui_abcs_table.item(selected_row.row(), 1).data(Qt.UserRole))
+        name_filter = self.__ui_name_filter.text().strip()
+        if self.__name_filter != name_filter:
+            self.__name_filter = name_filter
+            self.__retrieve_abcs()
+            self.__refresh_ui()
+
+    def __get_folder_paths(self):
+        """
+        Getter of the folders to retrieve the abcs from
+        :return: folder paths
+        """
+        return [folder_path for folder_path in self.__folder_path.split(";") if len(folder_path) > 0]
+
+    def __get_catalog_key(self):
+        """
+        Getter of the key of the catalog of the folders and the asset name filter
+        :return: key
+        """
+        return self.__folder_path + ("|" + self.__name_filter if len(self.__name_filter) > 0 else "")
+
+    def __rescan_folder(self):
+        """
+        Discover the folder again, forgetting its records in the catalog cache and ignoring its manifests
+        :return:
+        """
+        ABCCatalogService.invalidate(self.__get_catalog_key())
+        self.__retrieve_abcs(rescan=True)
+        self.__refresh_ui()
+
+    def __on_filter_changed(self, *args):
+        """
+        On filter of the table changed, filter the rows and select again the selected abcs still displayed.
+        The selected abcs hidden by the filter stay selected.
+        :return:
+        """
+        self.__is_filter_changing = True
+        try:
+            self.__abcs_filter_model.set_filter(self.__ui_filter_text.text(),
+                                                self.__ui_filter_name_match.currentData(),
+                                                self.__ui_filter_state.currentData())
+            # The spans are not moved with the rows
+            self.__ui_abcs_table.clearSpans()
+            for abc in self.__abcs_model.get_abcs():
+                self.__refresh_row_span(abc)
+            selection = QItemSelection()
+            for abc in self.__selected_abcs:
+                row = self.__abcs_filter_model.get_row(abc)
+                if row is not None:
+                    selection.select(self.__abcs_filter_model.index(row, 0), self.__abcs_filter_model.index(row, 0))
+            self.__ui_abcs_table.selectionModel().select(
+                selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+        finally:
+            self.__is_filter_changing = False
         self.__refresh_btn()
 
-    def __on_version_combobox_changed(self, row_index, cb_index):
+    def __on_abcs_selection_changed(self, *args):
         """
-        On import version changed for an abc
-        :param row_index
-        :param cb_index
+        On selection in the table changed
         :return:
         """
-        abc = self.__ui_abcs_table.item(row_index, 1).data(Qt.UserRole)
-        version_path = self.__ui_abcs_table.cellWidget(row_index, 3).model().item(cb_index).data(Qt.UserRole)
-        abc.set_import_path(version_path)
+        if self.__is_filter_changing:
+            return
+        # The selected abcs hidden by the filter are kept
+        self.__selected_abcs[:] = [abc for abc in self.__selected_abcs
+                                   if not self.__abcs_filter_model.is_accepted(abc)] + \
+                                  [self.__abcs_filter_model.get_abc(selected_row.row())
+                                   for selected_row in self.__ui_abcs_table.selectionModel().selectedRows()]
+        self.__refresh_btn()
 
-    def __retrieve_abcs(self):
+    def __retrieve_abcs(self, rescan=False):
         """
-        Retrieve the abcs at the folder path.
+        Retrieve the abcs at the folder paths in background. The table is filled as the abcs are found.
         If parent folder specified, retrieves abc and abc_fur
         If only one, retrieves the one selected
+        If sequence folder specified, retrieves the abc and abc_fur of all its shots
+        Several shots are grouped by shot in the table
+        The abcs of a folder already discovered are shown right away and the folder is checked again in background.
+        :param rescan : whether the records of the folders in the catalog cache are forgotten
         :return:
         """
-        self.__abcs.clear()
-        if os.path.exists(self.__folder_path):
-            if ABCImport.__is_parent_abc_folder(self.__folder_path):
-                self.__retrieve_assets(os.path.join(self.__folder_path, "abc"), True)
-                self.__retrieve_assets(os.path.join(self.__folder_path, "abc_fur"), False)
-            elif ABCImport.__is_abc_folder(self.__folder_path):
-                self.__retrieve_assets(self.__folder_path, True)
-            elif ABCImport.__is_abc_fur_folder(self.__folder_path):
-                pass
-                self.__retrieve_assets(self.__folder_path, False)
-        self.__retrieve_assets_in_scene()
+        self.__cancel_discovery()
+        self.__store_look_statuses()
+        self.__names_to_reselect = set(abc.get_name() for abc in self.__selected_abcs)
+        self.__abcs_model.clear()
+        self.__selected_abcs.clear()
+        # Called as the folder is typed so the folders are only listed by the discovery, which tells whether they
+        # contain abc folders
+        folder_paths = [folder_path for folder_path in self.__get_folder_paths() if os.path.isdir(folder_path)]
+        self.__is_folder_valid = len(folder_paths) > 0
+        # The abcs are matched against the scene index kept up to date by the scene watcher
+        self.__catalog = None
+        if len(folder_paths) == 0:
+            self.__refresh_btn()
+            return
+
+        catalog = ABCCatalogService.get_catalog(self.__get_catalog_key(), self.__current_project_dir)
+        if catalog is not None:
+            # Already discovered by this dialog or a previous one
+            self.__catalog = catalog
+            for asset in catalog.get_assets():
+                self.__add_asset(asset, catalog.get_look_status(asset))
+            self.__names_to_reselect.clear()
+            self.__refresh_btn()
+            # New exports since the catalog have to be found, the unchanged folders are not listed again
+            self.__start_discovery(folder_paths, revalidate=True)
+            return
+
+        self.__catalog = ABCCatalogService.create_catalog(self.__get_catalog_key(), self.__current_project_dir)
+        self.__start_discovery(folder_paths, rescan=rescan)
+
+    def __start_discovery(self, folder_paths, revalidate=False, rescan=False):
+        """
+        Start the discovery of the folders in background
+        :param folder_paths
+        :param revalidate : whether the discovery checks the catalog shown instead of filling the table
+        :param rescan : whether the records of the folders in the catalog cache are forgotten
+        :return:
+        """
+        thread = ABCDiscoveryThread(self.__catalog_scanner, folder_paths, self.__name_filter, self.__shard_workers,
+                                    rescan)
+        thread.entry_found.connect(partial(self.__on_entry_found, thread))
+        thread.finished.connect(partial(self.__on_discovery_finished, thread))
+        _discovery_threads.add(thread)
+        self.__discovery_thread = thread
+        self.__revalidation_entries = [] if revalidate else None
+        self.__ui_discovery_lbl.setText("Checking for new abcs..." if revalidate else "Searching abcs...")
+        self.__ui_discovery_widget.show()
+        thread.start()
+
+    def __cancel_discovery(self):
+        """
+        Cancel the running discovery if any. The thread is released once it has finished.
+        :return:
+        """
+        if self.__discovery_thread is None:
+            return
+        thread = self.__discovery_thread
+        self.__discovery_thread = None
+        self.__revalidation_entries = None
+        thread.cancel()
+        thread.entry_found.disconnect()
+        thread.finished.disconnect()
+        thread.finished.connect(partial(_release_discovery_thread, thread))
+        self.__ui_discovery_widget.hide()
+
+    def __on_entry_found(self, thread, shot, entry):
+        """
+        On an asset found by the discovery
+        :param thread
+        :param shot
+        :param entry
+        :return:
+        """
+        if thread is not self.__discovery_thread:
+            return
+        if self.__revalidation_entries is not None:
+            self.__revalidation_entries.append((shot, entry))
+            return
+        self.__retrieve_assets(entry, shot)
+        self.__ui_discovery_lbl.setText("Searching abcs... " + str(self.__abcs_model.rowCount()) + " found")
 
-    def __retrieve_assets(self, folder_path, is_anim_folder):
-        """
-        Auxiliary method to retrieve assets in the file architecture of the folder path
-        :param folder_path
-        :param is_anim_folder
-        :return:
-        """
-        folder_path = folder_path.replace("\\","/")
-        if not os.path.isdir(folder_path): return
-        for asset_folder in os.listdir(folder_path):
-            asset_folder_path = os.path.join(folder_path, asset_folder)
-            anim_versions = []
-            if not os.path.isdir(asset_folder_path) or asset_folder[0:2] != "ch": continue
-            for version_folder in os.listdir(asset_folder_path):
-                version_folder_path = os.path.join(asset_folder_path, version_folder)
-                if not os.path.isdir(version_folder_path): continue
-                for abc in os.listdir(version_folder_path):
-                    add = False
-                    if is_anim_folder:
-                        if asset_folder + ".abc" == abc:
-                            add = True
-                    else:
-                        if re.match(r""+asset_folder+r"_fur(?:\.[0-9]+)?\.abc", abc):
-                            add = True
-                    if add :
-                        anim_versions.append(version_folder_path)
-                        break
-            if len(anim_versions) < 1: continue
-            if is_anim_folder:
-                asset = ABCImportAnim(asset_folder, self.__current_project_dir, self.__look_factory, anim_versions)
+    def __on_discovery_finished(self, thread):
+        """
+        On discovery finished
+        :param thread
+        :return:
+        """
+        _release_discovery_thread(thread)
+        if thread is not self.__discovery_thread:
+            return
+        self.__discovery_thread = None
+        revalidation_entries = self.__revalidation_entries
+        self.__revalidation_entries = None
+        self.__ui_discovery_widget.hide()
+        if not thread.has_failed():
+            self.__is_folder_valid = thread.has_abc_folders()
+        if revalidation_entries is not None:
+            # The catalog shown is kept if the folders could not be checked
+            if not thread.has_failed() and not self.__catalog.is_up_to_date(revalidation_entries):
+                self.__replace_catalog(revalidation_entries)
+        elif thread.has_failed():
+            # A partial discovery is not kept for the next dialogs
+            ABCCatalogService.invalidate(self.__get_catalog_key())
+            self.__catalog = None
+        else:
+            ABCCatalogService.complete_catalog(self.__catalog)
+        self.__names_to_reselect.clear()
+        self.__refresh_btn()
+
+    def __replace_catalog(self, entries):
+        """
+        Replace the abcs of the table and the catalog of the folders by the ones of a new discovery
+        :param entries : list of (shot, ABCCatalogEntry)
+        :return:
+        """
+        self.__names_to_reselect = set(abc.get_name() for abc in self.__selected_abcs)
+        self.__abcs_model.clear()
+        self.__selected_abcs.clear()
+        self.__catalog = ABCCatalogService.create_catalog(self.__get_catalog_key(), self.__current_project_dir)
+        for shot, entry in entries:
+            self.__retrieve_assets(entry, shot)
+        ABCCatalogService.complete_catalog(self.__catalog)
+
+    @profiled("discovery.add_row")
+    def __retrieve_assets(self, entry, shot=None):
+        """
+        Auxiliary method to create the asset of a catalog entry and find it in the scene
+        :param entry
+        :param shot : shot of the entry, None if a single shot is retrieved
+        :return:
+        """
+        if entry.is_anim():
+            asset = ABCImportAnim(entry.get_name(), self.__current_project_dir, self.__look_factory,
+                                  entry.get_versions())
+        else:
+            asset = ABCImportFur(entry.get_name(), self.__current_project_dir, self.__look_factory,
+                                 entry.get_versions())
+        asset.set_shot(shot)
+        self.__catalog.add_asset(asset)
+        self.__add_asset(asset)
+
+    def __add_asset(self, asset, is_look_up_to_date=None):
+        """
+        Find an asset in the scene and add it to the table
+        :param asset
+        :param is_look_up_to_date : last known look status
+        :return:
+        """
+        self.__match_asset_in_scene(asset)
+        self.__abcs_model.append_abc(asset, is_look_up_to_date)
+        self.__refresh_row_span(asset)
+        # Select the abcs that were selected in the previous folder
+        if asset.get_name() in self.__names_to_reselect:
+            row = self.__abcs_filter_model.get_row(asset)
+            if row is not None:
+                self.__ui_abcs_table.selectionModel().select(
+                    self.__abcs_filter_model.index(row, 0), QItemSelectionModel.Select | QItemSelectionModel.Rows)
             else:
-                asset = ABCImportFur(asset_folder, self.__current_project_dir, self.__look_factory, anim_versions)
-            self.__abcs.append(asset)
+                self.__selected_abcs.append(asset)
+
+    def __store_look_statuses(self):
+        """
+        Keep the look statuses of the table in the catalog of the folder
+        :return:
+        """
+        if self.__catalog is None:
+            return
+        for abc in self.__abcs_model.get_abcs():
+            self.__catalog.set_look_status(abc, self.__abcs_model.get_look_status(abc))
 
     def __retrieve_alone_asset_in_scene(self, abc):
         """
@@ -540,27 +931,12 @@ class ABCImport(QDialog):
         it can retrieve abc having the abc file in the abc_layer
         :param abc
         """
-        standins = pm.ls(type="aiStandIn")
-        abc_name = abc.get_name()
-        for standin in standins:
-            # Check dso
-            dso = standin.dso.get()
-            if dso is not None:
-                match_dso = re.match(r".*[\\/](.*_fur)(?:\.[0-9]+)?\.abc", dso, re.IGNORECASE)
-                if match_dso and match_dso.group(1) == abc_name:
-                    abc.set_actual_standins([standin])
-                    return
-
-            # Check abc_layer
-            standin_node = pm.listRelatives(standin, parent=True)[0]
-            abc_layer = standin_node.abc_layers.get()
-            if abc_layer is not None:
-                abc_layer = abc_layer.replace("\\", "/")
-                match_abc_layer = re.match(r".*[\\/](.*)\.abc", abc_layer, re.IGNORECASE)
-                if match_abc_layer and match_abc_layer.group(1) == abc_name:
-                    abc.set_actual_standins([standin])
-
+        self.__scene_index.build()
+        standin = self.__scene_index.find_standalone_asset(abc.get_name())
+        if standin is not None:
+            abc.set_actual_standins([standin], [self.__get_look_signature(standin)])
 
+    @profiled("scene_index")
     def __retrieve_assets_in_scene(self):
         """
         Retrieve assets in scene
@@ -568,54 +944,88 @@ class ABCImport(QDialog):
         it can retrieve abc having the abc file in the abc_layer
         :return:
         """
-        standins = pm.ls(type="aiStandIn")
-        standins_datas = {}
-        if len(self.__abcs) == 0:
-            return
-        for standin in standins:
-            added = False
-
-            # Check dso
-            dso = standin.dso.get()
-            if dso is not None:
-                match_dso = re.match(r".*/(.*)/([0-9]{4})/.*_[0-9]{2}_fur(?:\.[0-9]+)?\.abc", dso, re.IGNORECASE)
-                if match_dso:
-                    name = match_dso.group(1) + "_fur"
-                    acc_standins = standins_datas[name][0] if name in standins_datas else []
-                    acc_standins.append(standin)
-                    standins_datas[name] = (acc_standins, match_dso.group(2))
-                    added = True
-            if not added:
-                # Check abc_layer
-                standin_node = pm.listRelatives(standin, parent=True)[0]
-                abc_layer = standin_node.abc_layers.get()
-                if abc_layer is not None:
-                    abc_layer = abc_layer.replace("\\", "/")
-                    match_abc_layer = re.match(r".*/(.*)/([0-9]{4})/.*_[0-9]{2}\.abc", abc_layer, re.IGNORECASE)
-                    if match_abc_layer:
-                        name = match_abc_layer.group(1)
-                        acc_standins = standins_datas[name][0] if name in standins_datas else []
-                        acc_standins.append(standin)
-                        standins_datas[name] = (acc_standins, match_abc_layer.group(2))
+        self.__scene_index.build()
+        self.__reference_index.build()
+        self.__abcs_model.set_pending_light_rigs(self.__reference_index.get_pending().keys())
+        # Everything is up to date, only watch the stand-ins indexed from now
+        self.__scene_watcher.clear_pending()
+        self.__scene_watcher.watch_standins(self.__scene_index.get_standins())
 
         # Make the correspondence between abcs in file architecture and abcs in scene
-        for abc in self.__abcs:
-            abc_name = abc.get_name()
-            if abc_name in standins_datas.keys():
-                abc.set_actual_standins(standins_datas[abc_name][0])
-                abc.set_actual_version(standins_datas[abc_name][1])
-            else:
-                abc.set_actual_standins([])
-                abc.set_actual_version(None)
+        for abc in self.__abcs_model.get_abcs():
+            self.__match_asset_in_scene(abc)
+
+    def __match_asset_in_scene(self, abc):
+        """
+        Make the correspondence between an abc in file architecture and the abcs in scene
+        :param abc
+        :return:
+        """
+        asset_in_scene = self.__scene_index.get_asset(abc.get_name())
+        if asset_in_scene is not None:
+            standins, version = asset_in_scene
+            # The stand-ins are only wrapped in nodes on import or update
+            abc.set_actual_standins(standins, [self.__get_look_signature(standin) for standin in standins])
+            abc.set_actual_version(version)
+        else:
+            abc.set_actual_standins([])
+            abc.set_actual_version(None)
+
+    def __get_look_signature(self, standin):
+        """
+        Get the look signature of a stand-in from the values read by the scene index
+        :param standin
+        :return: signature
+        """
+        return ABCImportAsset.get_look_signature(*self.__scene_index.get_look_signature(standin))
 
     def __import_update_selected_abcs(self):
         """
         Import the selected abcs
         :return:
         """
-        standin_nodes = []
-        for abc in self.__selected_abcs:
-            standin_nodes.extend(abc.import_update_abc(self.__update_uvs_shaders))
-        pm.select(standin_nodes)
+        abcs = list(self.__selected_abcs)
+        report = ABCImportBatch(abcs, self.__update_uvs_shaders, self.__reference_index,
+                                self.__light_rig_loading).run()
+        report.print_report()
+        pm.select(report.get_standin_nodes())
         self.__retrieve_assets_in_scene()
-        self.__refresh_ui()
+        self.__refresh_btn()
+        self.__refresh_table(abcs)
+        ABCProfiler.write_report()
+
+        errors = report.get_errors()
+        if len(errors) > 0:
+            msg = QMessageBox()
+            msg.setWindowTitle("Error while importing abcs")
+            msg.setIcon(QMessageBox.Warning)
+            msg.setText(str(len(errors)) + " abc(s) could not be imported or updated")
+            msg.setInformativeText("\n".join(abc.get_name() + " : " + str(error) for abc, error in errors.items()))
+            msg.exec_()
+
+    def __dry_run_selected_abcs(self):
+        """
+        Show what the import of the selected abcs would change in the scene
+        :return:
+        """
+        lines = ABCImportBatch(list(self.__selected_abcs), self.__update_uvs_shaders).dry_run()
+        msg = QMessageBox()
+        msg.setWindowTitle("Import preview")
+        msg.setIcon(QMessageBox.Information)
+        msg.setText(str(len(self.__selected_abcs)) + " abc(s) to import or update")
+        msg.setDetailedText("\n".join(lines))
+        msg.exec_()
+
+    def __load_pending_light_rigs(self):
+        """
+        Load all the light rigs waiting to be loaded
+        :return:
+        """
+        self.__reference_index.build()
+        pm.refresh(suspend=True)
+        try:
+            self.__reference_index.load_pending()
+        finally:
+            pm.refresh(suspend=False)
+        self.__abcs_model.set_pending_light_rigs(self.__reference_index.get_pending().keys())
+        self.__refresh_btn()
@@ -5,12 +5,32 @@ import traceback
 from abc import *
 from enum import Enum
 
-import pymel.core as pm
-
-from look_loader.LookFactory import LookFactory
-from look_loader.LookStandin import LookAsset
 from common.utils import *
 
+from .ABCCatalog import *
+from .ABCReferenceIndex import *
+from .ABCLookCache import *
+from .ABCLazyImport import *
+
+# Loaded on first use
+pm = lazy_import("pymel.core")
+_look_factory_module = lazy_import("look_loader.LookFactory")
+_look_standin_module = lazy_import("look_loader.LookStandin")
+
+
+def _resolve_uvs(char_name, current_project_dir):
+    """
+    Resolve the uvs of a character with the look library
+    :param char_name
+    :param current_project_dir
+    :return: list of (version, uv path)
+    """
+    return _look_standin_module.LookAsset.get_uvs(char_name, current_project_dir)
+
+
+# Attributes of a stand-in its look depends on
+_LOOK_ATTRIBUTES = ["dso", "abc_layers"]
+
 
 class ABCState(Enum):
     """
@@ -21,6 +41,30 @@ class ABCState(Enum):
     New = 2
 
 
+class ABCLazyLookFactory:
+    """
+    Factory of Look (in package look_loader) created on the first look generated
+    """
+
+    def __init__(self, current_project_dir):
+        """
+        Constructor
+        :param current_project_dir
+        """
+        self.__current_project_dir = current_project_dir
+        self.__look_factory = None
+
+    def generate(self, standin):
+        """
+        Generate the look of a stand-in
+        :param standin
+        :return: look
+        """
+        if self.__look_factory is None:
+            self.__look_factory = _look_factory_module.LookFactory(self.__current_project_dir)
+        return self.__look_factory.generate(standin)
+
+
 class ABCImportAsset(ABC):
     def __init__(self, name, current_project_dir, look_factory, versions=None):
         """
@@ -28,18 +72,24 @@ class ABCImportAsset(ABC):
         :param name
         :param current_project_dir
         :param look_factory : Factory of Look (in package look_loader)
-        :param versions
+        :param versions : ABCVersion list
         """
         if versions is None:
             versions = []
         self._name = name
         self._current_project_dir = current_project_dir
         self.__versions = sorted(versions, reverse=True)
+        self.__versions_by_path = {version.get_path(): version for version in self.__versions}
+        self.__last_version_number = self.__versions[0].get_number() if len(self.__versions) > 0 else -1
         self._look_factory = look_factory
-        self._import_path = self.__versions[0] if len(self.__versions) > 0 else None
+        self._import_path = self.__versions[0].get_path() if len(self.__versions) > 0 else None
         self._actual_version = None
-        self._actual_standins = []
+        self._actual_version_number = -1
+        self._actual_standin_names = []
+        self.__actual_standins = []
         self._look_standin_obj = None
+        self._look_signature = None
+        self._shot = None
 
     def get_icon_filename(self, state):
         """
@@ -54,6 +104,18 @@ class ABCImportAsset(ABC):
         else:
             return "new.png"
 
+    def get_state(self):
+        """
+        Getter of the state of the abc in the scene
+        New if not in the scene, OutOfDate if a newer version exists or UpToDate
+        :return: state
+        """
+        if self._actual_version is None:
+            return ABCState.New
+        if self._actual_version_number < self.__last_version_number:
+            return ABCState.OutOfDate
+        return ABCState.UpToDate
+
     def get_name(self):
         """
         Getter of the name
@@ -61,20 +123,56 @@ class ABCImportAsset(ABC):
         """
         return self._name
 
-    def _get_char_name(self):
+    def set_shot(self, shot):
+        """
+        Setter of the shot the abc has been found in
+        :param shot : None if a single shot is displayed
+        :return:
+        """
+        self._shot = shot
+
+    def get_shot(self):
+        """
+        Getter of the shot the abc has been found in
+        :return: shot or None if a single shot is displayed
+        """
+        return self._shot
+
+    def get_char_name(self):
         """
         Getter of the char name
         :return: char name
         """
         return self._name[:-len(self._name.split("_")[-1]) - 1]
 
+    def get_uvs(self):
+        """
+        Getter of the uvs of the character of the abc, resolved once for all the abcs of the character
+        :return: uvs
+        """
+        return ABCUVCache.get_uvs(self.get_char_name(), self._current_project_dir, _resolve_uvs)
+
+    def get_missing_frame_ranges(self):
+        """
+        Getter of the frames missing in the cache of the import version
+        :return: list of (first missing frame, last missing frame)
+        """
+        return []
+
     def get_versions(self):
         """
-        Getter of the versions
-        :return: versions
+        Getter of the versions, the last one first
+        :return: ABCVersion list
         """
         return self.__versions
 
+    def get_import_version(self):
+        """
+        Getter of the version of the current import path
+        :return: ABCVersion or None if the import path is not one of the versions
+        """
+        return self.__versions_by_path.get(self._import_path)
+
     def set_import_path(self, path):
         """
         Setter of the current import version
@@ -97,6 +195,8 @@ class ABCImportAsset(ABC):
         :return:
         """
         self._actual_version = version_path
+        self._actual_version_number = ABCVersion.parse_number(os.path.basename(version_path)) \
+            if version_path is not None else -1
 
     def get_actual_version(self):
         """
@@ -105,55 +205,216 @@ class ABCImportAsset(ABC):
         """
         return self._actual_version
 
-    def set_actual_standins(self, standins):
+    def set_actual_standins(self, shape_names, look_signatures=None, standins=None):
         """
         Setter of the actual Standin
-        :param standin:
+        :param shape_names : long names of the stand-ins
+        :param look_signatures : signatures of the stand-ins (see get_look_signature), read on the stand-ins if None
+        :param standins : stand-in nodes if already known, wrapped from the shape names on first use otherwise
         :return:
         """
-        self._actual_standins = standins
-        if len(self._actual_standins) > 0:
+        self._actual_standin_names = shape_names
+        self.__actual_standins = standins
+        if len(self._actual_standin_names) > 0:
             try:
-                for standin in self._actual_standins:
-                    self._look_standin_obj = self._look_factory.generate(standin)
+                if look_signatures is None:
+                    look_signatures = [ABCImportAsset.__read_look_signature(standin)
+                                       for standin in self._get_actual_standins()]
+                for index, (shape_name, look_signature) in enumerate(zip(self._actual_standin_names,
+                                                                         look_signatures)):
+                    # The look object is generated again only if the stand-in has changed
+                    self._look_signature = look_signature
+                    self._look_standin_obj = ABCLookCache.get_look(
+                        shape_name, self._look_signature,
+                        lambda index=index: self._look_factory.generate(self._get_actual_standins()[index]))
             except Exception as e:
                 print_warning("Error while retrieving Looks files of " + self._name, char_filler='-')
                 print(f'caught {type(e)}: e')
                 print(e)
                 traceback.print_exception(*sys.exc_info())
 
+    def _get_actual_standins(self):
+        """
+        Getter of the actual stand-in nodes, only wrapped from their shape names when the scene has to be read
+        :return: stand-in nodes
+        """
+        if self.__actual_standins is None:
+            self.__actual_standins = [pm.PyNode(shape_name) for shape_name in self._actual_standin_names]
+        return self.__actual_standins
+
+    @staticmethod
+    def get_look_signature(dso, abc_layers):
+        """
+        Get the signature of the values of a stand-in its look depends on, in the form of ABCSceneIndex
+        :param dso
+        :param abc_layers
+        :return: signature
+        """
+        return tuple(value.replace("\\", "/") if value else None for value in [dso, abc_layers])
+
+    @staticmethod
+    def __read_look_signature(standin, values=None):
+        """
+        Read the values of a stand-in its look depends on
+        :param standin
+        :param values : values already known, read on the stand-in otherwise
+        :return: signature
+        """
+        if values is None:
+            values = {}
+        return ABCImportAsset.get_look_signature(*[
+            values[attr] if attr in values else standin.attr(attr).get() if standin.hasAttr(attr) else None
+            for attr in _LOOK_ATTRIBUTES])
+
+    def _get_look_dir(self, char_name):
+        """
+        Get the look directory of a character : its asset folder in the project where the look library publishes its
+        looks and uvs
+        :param char_name
+        :return: look directory or None
+        """
+        look_dir = os.path.join(self._current_project_dir, "assets", char_name)
+        return look_dir if os.path.isdir(look_dir) else None
+
     @abstractmethod
-    def import_update_abc(self, do_update_uvs_shaders):
+    def _get_standin_shape_name(self):
         """
-        Import the abc in the scene
-        :param do_update_uvs_shaders:
+        Getter of the name of the stand-in shape created on import
+        :return: shape name
+        """
+        pass
+
+    @abstractmethod
+    def _fill_plan(self, plan, do_update_uvs_shaders):
+        """
+        Add the attributes, light rig and look update specific to the kind of abc to the plan
+        :param plan
+        :param do_update_uvs_shaders
         :return:
         """
         pass
 
+    def plan_import_update(self, do_update_uvs_shaders, fps=None):
+        """
+        Compute the operations to import or update the abc without touching the scene.
+        On update, only the attributes whose value differs from the current one are kept in the changes of the plan.
+        :param do_update_uvs_shaders
+        :param fps : fps of the scene (queried if None)
+        :return: ABCImportPlan
+        """
+        plan = ABCImportPlan(self, len(self._actual_standin_names) == 0)
+        if plan.is_import():
+            plan.set_standin_to_create(self._get_standin_shape_name(), self.get_name())
+        plan.set_attribute("abcFPS", fps if fps is not None else ABCImportAsset.get_scene_fps())
+        plan.set_attribute("useFrameExtension", True)
+        self._fill_plan(plan, do_update_uvs_shaders)
+        if not plan.is_import():
+            standins = self._get_actual_standins()
+            standin_nodes = [pm.listRelatives(standin, parent=True)[0] for standin in standins]
+            plan.set_standins(standins, standin_nodes)
+            plan.compute_changes()
+        return plan
+
+    def create_standins(self, plan):
+        """
+        Create the stand-in of the plan if it is an import
+        :param plan
+        :return:
+        """
+        standin_to_create = plan.get_standin_to_create()
+        if standin_to_create is None:
+            return
+        shape_name, transform_name = standin_to_create
+        actual_standin = pm.createNode("aiStandIn", n=shape_name)
+        standin_node = pm.listRelatives(actual_standin, parent=True)[0]
+        standin_node = pm.rename(standin_node, transform_name)
+        plan.set_standins([actual_standin], [standin_node])
+        plan.compute_changes()
+
+    def apply_attributes(self, plan):
+        """
+        Set the attributes that change on the stand-ins
+        :param plan
+        :return:
+        """
+        for standin, changes in plan.get_changes().items():
+            for attr, value in changes.items():
+                standin.attr(attr).set(value)
+        # The values set by the plan are not read again
+        standins = plan.get_standins()
+        self.set_actual_standins([standin.longName() for standin in standins], [
+            ABCImportAsset.__read_look_signature(standin, plan.get_attributes()) for standin in standins], standins)
+
+    def update_light_rig(self, plan, reference_index=None, deferred=False):
+        """
+        Update the light rig reference of the abc or create one
+        :param plan
+        :param reference_index : ABCReferenceIndex of the scene (built if None)
+        :param deferred : whether the light rig is left to load later with the reference index
+        :return:
+        """
+        pass
+
+    def import_update_abc(self, do_update_uvs_shaders):
+        """
+        Import or Update the abc in the scene
+        :param do_update_uvs_shaders:
+        :return: stand-in nodes
+        """
+        plan = self.plan_import_update(do_update_uvs_shaders)
+        self.create_standins(plan)
+        self.apply_attributes(plan)
+        self.update_light_rig(plan)
+        if plan.is_updating_looks():
+            self.update()
+        return plan.get_standin_nodes()
+
     def update(self):
         """
         Update the shader and uvs of the abc
         :return:
         """
-        if self._look_standin_obj is not None:
-            self._look_standin_obj.update_existent_looks()
+        if self._look_standin_obj is None:
+            return
+        self._look_standin_obj.update_existent_looks()
+        ABCLookCache.invalidate(self._actual_standin_names)
+
+    @staticmethod
+    def group_by_char(abcs):
+        """
+        Group abcs by character
+        :param abcs
+        :return: dict char name -> abcs
+        """
+        abcs_by_char = {}
+        for abc in abcs:
+            abcs_by_char.setdefault(abc.get_char_name(), []).append(abc)
+        return abcs_by_char
 
     def is_look_up_to_date(self):
         """
-        Getter of whether the abc has his uv and looks up to date
+        Getter of whether the abc has his uv and looks up to date.
+        Only queries the files of the look library with the look object generated on the main thread, and the look
+        status cache keyed by shape name, so it can be called from any thread.
         :return: is look up to date
         """
-        if self._look_standin_obj is None:
+        if self._look_standin_obj is None or len(self._actual_standin_names) == 0:
             return False
-        return self._look_standin_obj.is_looks_up_to_date() and self._look_standin_obj.is_uv_up_to_date()
+        look_standin_obj = self._look_standin_obj
+        shape_name = self._actual_standin_names[-1]
+        # Computed again only if the stand-in or the look directory of the character has changed
+        signature = (self._look_signature, ABCLookCache.get_look_dir_stamp(self.get_char_name(), self._get_look_dir))
+        status = ABCLookCache.get_cached_status(shape_name, signature)
+        if status is None:
+            status = look_standin_obj.is_looks_up_to_date() and look_standin_obj.is_uv_up_to_date()
+            ABCLookCache.set_status(shape_name, signature, status)
+        return status
 
     @staticmethod
-    def _configure_standin(standin_node):
+    def get_scene_fps():
         """
-        Configure some parameters of the StandIn
-        :param standin_node:
-        :return:
+        Get the fps of the scene for the abcFPS of the StandIn
+        :return: fps
         """
         current_unit = pm.currentUnit(time=True, query=True)
         unit_to_fps = {
@@ -165,75 +426,81 @@ class ABCImportAsset(ABC):
             "palf": 50,
             "ntscf": 60,
         }
-        standin_node.abcFPS.set(unit_to_fps[current_unit] if current_unit in unit_to_fps else 24)
-        standin_node.useFrameExtension.set(True)
+        return unit_to_fps[current_unit] if current_unit in unit_to_fps else 24
 
 
 class ABCImportAnim(ABCImportAsset):
-    def import_update_abc(self, do_update_uvs_shaders):
+    def _get_standin_shape_name(self):
+        """
+        Getter of the name of the stand-in shape created on import
+        :return: shape name
         """
-        Import or Update an animation
+        return self.get_name() + "Shape"
+
+    def _fill_plan(self, plan, do_update_uvs_shaders):
+        """
+        Add the uvs, the animation, the light rig and the look update of an animation to the plan
+        :param plan
         :param do_update_uvs_shaders
         :return:
         """
-        is_import = len(self._actual_standins) == 0
+        name = self.get_name()
 
-        char_name = self._get_char_name()
         last_uv = None
         try:
-            last_uv = LookAsset.get_uvs(char_name, self._current_project_dir)[0][1]
+            last_uv = self.get_uvs()[0][1]
         except Exception as e:
             print(f'caught {type(e)}: e')
             print(e)
             traceback.print_exception(*sys.exc_info())
 
-        name = self.get_name()
-
-        # If import we create the standin
-        if is_import:
-            actual_standin = pm.createNode("aiStandIn", n=name+"Shape")
-            standin_node = pm.listRelatives(actual_standin, parent=True)[0]
-            standin_node = pm.rename(standin_node, name)
-            actual_standins = [actual_standin]
-            standin_nodes = [standin_node]
-        else:
-            actual_standins = self._actual_standins
-            standin_nodes = []
-            for standin in actual_standins:
-                standin_nodes.append(pm.listRelatives(standin, parent=True)[0])
-
-        if (is_import or do_update_uvs_shaders) and last_uv is not None:
-            for standin in actual_standins:
-                standin.dso.set(last_uv)
-        self.set_actual_standins(actual_standins)
-        abc_filename = name + ".abc"
-        abc_filepath = os.path.join(self._import_path, abc_filename)
-        for standin_node in standin_nodes:
-            standin_node.mode.set(6)
-            standin_node.abc_layers.set(abc_filepath)
-            ABCImportAsset._configure_standin(standin_node)
-
-        light_filename = name + "_light.ma"
-        light_filepath = os.path.join(self._import_path, light_filename)
-
-        # Update anim lights or create one
-        if os.path.exists(light_filepath):
-            found = False
-            for ref in pm.listReferences():
-                match = re.match(r".*[\\/]" + name + r"_light\.m[ab]", ref.unresolvedPath())
-                if match:
-                    ref.replaceWith(light_filepath)
-                    found = True
-                    break
-            if not found:
-                pm.createReference(light_filepath, defaultNamespace=True)
-
-        if is_import or do_update_uvs_shaders:
-            self.update()
-        return standin_nodes
+        if (plan.is_import() or do_update_uvs_shaders) and last_uv is not None:
+            plan.set_attribute("dso", last_uv)
+        plan.set_attribute("mode", 6)
+        plan.set_attribute("abc_layers", os.path.join(self._import_path, name + ".abc"))
+
+        light_filepath = os.path.join(self._import_path, name + "_light.ma")
+        # The light rig of a version found by the discovery is already known
+        import_version = self.get_import_version()
+        has_light_rig = import_version.has_flag(ABCVersion.HAS_LIGHT_RIG) if import_version is not None \
+            else os.path.exists(light_filepath)
+        if has_light_rig:
+            plan.set_light_filepath(light_filepath)
+        plan.set_updating_looks(plan.is_import() or do_update_uvs_shaders)
+
+    def update_light_rig(self, plan, reference_index=None, deferred=False):
+        """
+        Update the anim lights reference or create one
+        :param plan
+        :param reference_index : ABCReferenceIndex of the scene (built if None)
+        :param deferred : whether the light rig is left to load later with the reference index
+        :return:
+        """
+        light_filepath = plan.get_light_filepath()
+        if light_filepath is None:
+            return
+        if reference_index is None:
+            reference_index = ABCReferenceIndex()
+            reference_index.build()
+        reference_index.update_or_create(self.get_name(), light_filepath, deferred, defaultNamespace=True)
 
 
 class ABCImportFur(ABCImportAsset):
+    def get_sequence(self):
+        """
+        Getter of the fur cache files of the import version
+        :return: ABCFurSequence or None if the version has not been indexed
+        """
+        version = self.get_import_version()
+        return version.get_sequence() if version is not None else None
+
+    def get_missing_frame_ranges(self):
+        """
+        Getter of the frames missing in the fur cache of the import version
+        :return: list of (first missing frame, last missing frame)
+        """
+        sequence = self.get_sequence()
+        return sequence.get_missing_ranges() if sequence is not None else []
 
     def get_icon_filename(self, state):
         """
@@ -255,44 +522,214 @@ class ABCImportFur(ABCImportAsset):
         """
         return self._name + "_fur"
 
-    def import_update_abc(self, do_update_uvs_shaders):
+    def _get_standin_shape_name(self):
+        """
+        Getter of the name of the stand-in shape created on import
+        :return: shape name
         """
-        Import or Update a fur
+        return "shape_" + self.get_name()
+
+    def _fill_plan(self, plan, do_update_uvs_shaders):
+        """
+        Add the fur cache and the look update of a fur to the plan
+        :param plan
         :param do_update_uvs_shaders
         :return:
         """
-        is_import = len(self._actual_standins) == 0
-
         name = self.get_name()
         dso = None
-        standin_node = None
-
-        for f in os.listdir(self._import_path):
-            if re.match(r"" + name + r"(?:\.[0-9]+)?\.abc", f):
-                dso = f
-                break
-
-        if dso is not None:
-            # If import we create the standin
-            if is_import:
-                actual_standin = pm.createNode("aiStandIn", n="shape_" + name)
-                standin_node = pm.listRelatives(actual_standin, parent=True)[0]
-                standin_node = pm.rename(standin_node, name)
-                actual_standins = [actual_standin]
-                standin_nodes = [standin_node]
-            else:
-                actual_standins = self._actual_standins
-                standin_nodes = []
-                for standin in actual_standins:
-                    standin_nodes.append(pm.listRelatives(standin, parent=True)[0])
-
-
-            self.set_actual_standins(actual_standins)
-            for standin_node in standin_nodes:
-                standin_node.dso.set(os.path.join(self._import_path, dso))
-                standin_node.mode.set(4)
-                ABCImportAsset._configure_standin(standin_node)
-
-            if is_import or do_update_uvs_shaders:
-                self.update()
-        return standin_nodes
+        sequence = self.get_sequence()
+        if sequence is not None:
+            dso = sequence.get_first_filename()
+        else:
+            # Version not indexed by the discovery (fur imported from a file)
+            for f in os.listdir(self._import_path):
+                if re.match(r"" + name + r"(?:\.[0-9]+)?\.abc", f):
+                    dso = f
+                    break
+        if dso is None:
+            raise ValueError("No abc of " + name + " found in " + self._import_path)
+
+        plan.set_attribute("dso", os.path.join(self._import_path, dso))
+        plan.set_attribute("mode", 4)
+        plan.set_updating_looks(plan.is_import() or do_update_uvs_shaders)
+
+
+class ABCImportPlan:
+    """
+    Operations to import or update an abc.
+    It is computed without touching the scene so that the operations of several abcs can be applied together.
+    """
+
+    def __init__(self, abc, is_import):
+        """
+        Constructor
+        :param abc
+        :param is_import : whether the stand-in has to be created
+        """
+        self.__abc = abc
+        self.__is_import = is_import
+        self.__standin_to_create = None
+        self.__attributes = {}
+        self.__light_filepath = None
+        self.__is_updating_looks = False
+        self.__standins = []
+        self.__standin_nodes = []
+        # stand-in -> {attribute: value}
+        self.__changes = {}
+
+    @staticmethod
+    def is_same_value(current_value, value):
+        """
+        Test whether an attribute already has a value. Paths are compared regardless of the separators.
+        :param current_value
+        :param value
+        :return: is same value
+        """
+        if isinstance(current_value, str) and isinstance(value, str):
+            return current_value.replace("\\", "/") == value.replace("\\", "/")
+        return current_value == value
+
+    def get_abc(self):
+        """
+        Getter of the abc
+        :return: abc
+        """
+        return self.__abc
+
+    def is_import(self):
+        """
+        Getter of whether the stand-in has to be created
+        :return: is import
+        """
+        return self.__is_import
+
+    def set_standin_to_create(self, shape_name, transform_name):
+        """
+        Setter of the names of the stand-in to create
+        :param shape_name
+        :param transform_name
+        :return:
+        """
+        self.__standin_to_create = (shape_name, transform_name)
+
+    def get_standin_to_create(self):
+        """
+        Getter of the names of the stand-in to create
+        :return: (shape name, transform name) or None
+        """
+        return self.__standin_to_create
+
+    def set_attribute(self, attr, value):
+        """
+        Set an attribute to set on the stand-ins
+        :param attr
+        :param value
+        :return:
+        """
+        self.__attributes[attr] = value
+
+    def get_attributes(self):
+        """
+        Getter of the attributes to set on the stand-ins
+        :return: dict attribute -> value
+        """
+        return self.__attributes
+
+    def set_light_filepath(self, light_filepath):
+        """
+        Setter of the light rig to reference
+        :param light_filepath
+        :return:
+        """
+        self.__light_filepath = light_filepath
+
+    def get_light_filepath(self):
+        """
+        Getter of the light rig to reference
+        :return: light filepath or None
+        """
+        return self.__light_filepath
+
+    def set_updating_looks(self, is_updating_looks):
+        """
+        Setter of whether the looks have to be updated
+        :param is_updating_looks
+        :return:
+        """
+        self.__is_updating_looks = is_updating_looks
+
+    def is_updating_looks(self):
+        """
+        Getter of whether the looks have to be updated
+        :return: is updating looks
+        """
+        return self.__is_updating_looks
+
+    def set_standins(self, standins, standin_nodes):
+        """
+        Setter of the stand-ins created or retrieved
+        :param standins : stand-in shapes
+        :param standin_nodes : stand-in transforms
+        :return:
+        """
+        self.__standins = standins
+        self.__standin_nodes = standin_nodes
+
+    def get_standins(self):
+        """
+        Getter of the stand-in shapes
+        :return: stand-in shapes
+        """
+        return self.__standins
+
+    def get_standin_nodes(self):
+        """
+        Getter of the stand-in transforms
+        :return: stand-in transforms
+        """
+        return self.__standin_nodes
+
+    def compute_changes(self):
+        """
+        Compare the attributes of the plan with the current values of the stand-ins
+        :return:
+        """
+        self.__changes = {}
+        for standin in self.__standins:
+            changes = {}
+            for attr, value in self.__attributes.items():
+                if self.__is_import or not ABCImportPlan.is_same_value(standin.attr(attr).get(), value):
+                    changes[attr] = value
+            self.__changes[standin] = changes
+
+    def get_changes(self):
+        """
+        Getter of the attributes to set on each stand-in
+        :return: dict stand-in -> {attribute: value}
+        """
+        return self.__changes
+
+    def get_report(self):
+        """
+        Get a readable description of the operations of the plan
+        :return: report lines
+        """
+        name = self.__abc.get_name()
+        if self.__is_import:
+            lines = [name + " : import"]
+            for attr, value in self.__attributes.items():
+                lines.append("    " + attr + " = " + str(value))
+        else:
+            lines = [name + " : update"]
+            for standin, changes in self.__changes.items():
+                for attr, value in changes.items():
+                    lines.append("    " + str(standin) + "." + attr + " : " + str(standin.attr(attr).get())
+                                 + " -> " + str(value))
+            if not any(len(changes) > 0 for changes in self.__changes.values()):
+                lines.append("    stand-ins already up to date")
+        if self.__light_filepath is not None:
+            lines.append("    light rig : " + self.__light_filepath)
+        if self.__is_updating_looks:
+            lines.append("    update looks")
+        return lines
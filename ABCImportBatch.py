@@ -0,0 +1,241 @@
+import sys
+import time
+import traceback
+from enum import Enum
+
+from common.utils import *
+
+from .ABCImportAsset import *
+from .ABCReferenceIndex import *
+from .ABCProfiler import *
+from .ABCLazyImport import *
+
+# Loaded on first use
+pm = lazy_import("pymel.core")
+
+
+class ABCLightRigLoading(Enum):
+    """
+    When the light rigs referenced by an import are loaded
+    """
+    # Loaded one by one during the import
+    Immediate = 0
+    # Created unloaded and loaded all at once when the import finishes
+    AfterImport = 1
+    # Created unloaded and loaded when asked
+    OnDemand = 2
+
+
+class ABCImportBatchReport:
+    """
+    Result of a batch import : stand-ins imported or updated, time spent and error of each abc
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__durations = {}
+        self.__errors = {}
+        self.__standin_nodes = []
+
+    def add_duration(self, abc, duration):
+        """
+        Add time spent on an abc
+        :param abc
+        :param duration : in seconds
+        :return:
+        """
+        self.__durations[abc] = self.__durations.get(abc, 0.0) + duration
+
+    def add_error(self, abc, error):
+        """
+        Set the error that stopped the import of an abc
+        :param abc
+        :param error
+        :return:
+        """
+        self.__errors[abc] = error
+
+    def add_standin_nodes(self, standin_nodes):
+        """
+        Add the stand-in transforms imported or updated
+        :param standin_nodes
+        :return:
+        """
+        self.__standin_nodes.extend(standin_nodes)
+
+    def get_durations(self):
+        """
+        Getter of the time spent on each abc
+        :return: dict abc -> duration in seconds
+        """
+        return self.__durations
+
+    def get_errors(self):
+        """
+        Getter of the errors
+        :return: dict abc -> error
+        """
+        return self.__errors
+
+    def get_standin_nodes(self):
+        """
+        Getter of the stand-in transforms imported or updated
+        :return: stand-in transforms
+        """
+        return self.__standin_nodes
+
+    def has_failed(self, abc):
+        """
+        Getter of whether the import of an abc has failed
+        :param abc
+        :return: has failed
+        """
+        return abc in self.__errors
+
+    def print_report(self):
+        """
+        Print the time spent on each abc and the errors
+        :return:
+        """
+        for abc, duration in sorted(self.__durations.items(), key=lambda item: -item[1]):
+            status = "FAILED" if abc in self.__errors else "OK"
+            print("{:<40} {:>6} {:>8.3f}s".format(abc.get_name(), status, duration))
+        for abc, error in self.__errors.items():
+            print_warning("Error while importing " + abc.get_name() + " : " + str(error), char_filler='-')
+
+
+class ABCImportBatch:
+    """
+    Import or update several abcs at once.
+    The operations of every abc are planned first then applied step by step for all the abcs, in one undo chunk
+    and with the viewport refresh suspended. An abc that fails does not stop the others.
+    """
+
+    def __init__(self, abcs, do_update_uvs_shaders, reference_index=None,
+                 light_rig_loading=ABCLightRigLoading.Immediate):
+        """
+        Constructor
+        :param abcs
+        :param do_update_uvs_shaders
+        :param reference_index : ABCReferenceIndex kept up to date by the batch (created if None)
+        :param light_rig_loading : ABCLightRigLoading
+        """
+        self.__abcs = abcs
+        self.__do_update_uvs_shaders = do_update_uvs_shaders
+        self.__reference_index = reference_index
+        self.__light_rig_loading = light_rig_loading
+
+    def __run_step(self, report, plans, step_name, step):
+        """
+        Run a step for all the plans whose abc has not failed yet
+        :param report
+        :param plans
+        :param step_name : name of the step in the profiling
+        :param step : function taking the plan
+        :return:
+        """
+        with ABCProfiler.phase("import." + step_name):
+            for plan in plans:
+                abc = plan.get_abc()
+                if report.has_failed(abc):
+                    continue
+                start = time.perf_counter()
+                try:
+                    step(plan)
+                except Exception as e:
+                    report.add_error(abc, e)
+                    traceback.print_exception(*sys.exc_info())
+                duration = time.perf_counter() - start
+                report.add_duration(abc, duration)
+                ABCProfiler.add_asset_time(abc.get_name(), step_name, duration)
+
+    def __update_looks(self, report, plans):
+        """
+        Update the looks character by character so that the look files of a character are read one after the other
+        :param report
+        :param plans
+        :return:
+        """
+        plans_by_abc = {plan.get_abc(): plan for plan in plans}
+        for abcs in ABCImportAsset.group_by_char(plans_by_abc.keys()).values():
+            self.__run_step(report, [plans_by_abc[abc] for abc in abcs], "looks", lambda plan: plan.get_abc().update())
+
+    @profiled("import.plan")
+    def __plan(self, report):
+        """
+        Plan the import or update of every abc
+        :param report
+        :return: plans of the abcs that have not failed
+        """
+        fps = ABCImportAsset.get_scene_fps()
+        # The uvs of each character are resolved once for all its anims
+        anims_by_char = {abc.get_char_name(): abc for abc in self.__abcs if isinstance(abc, ABCImportAnim)}
+        for anim in anims_by_char.values():
+            try:
+                anim.get_uvs()
+            except Exception:
+                # The error is reported by the plan of the anim
+                pass
+        plans = []
+        for abc in self.__abcs:
+            start = time.perf_counter()
+            try:
+                plans.append(abc.plan_import_update(self.__do_update_uvs_shaders, fps))
+            except Exception as e:
+                report.add_error(abc, e)
+                traceback.print_exception(*sys.exc_info())
+            duration = time.perf_counter() - start
+            report.add_duration(abc, duration)
+            ABCProfiler.add_asset_time(abc.get_name(), "plan", duration)
+        return plans
+
+    def dry_run(self):
+        """
+        Compute what the import would change in the scene without modifying it
+        :return: report lines
+        """
+        report = ABCImportBatchReport()
+        lines = []
+        for plan in self.__plan(report):
+            lines.extend(plan.get_report())
+        for abc, error in report.get_errors().items():
+            lines.append(abc.get_name() + " : error " + str(error))
+        return lines
+
+    @profiled("import")
+    def run(self):
+        """
+        Import or update the abcs
+        :return: ABCImportBatchReport
+        """
+        report = ABCImportBatchReport()
+        pm.undoInfo(openChunk=True, chunkName="ABC Import")
+        pm.refresh(suspend=True)
+        try:
+            plans = self.__plan(report)
+
+            self.__run_step(report, plans, "create", lambda plan: plan.get_abc().create_standins(plan))
+            self.__run_step(report, plans, "attributes", lambda plan: plan.get_abc().apply_attributes(plan))
+            # References are listed once for the whole batch
+            light_plans = [plan for plan in plans if plan.get_light_filepath() is not None]
+            if len(light_plans) > 0:
+                if self.__reference_index is None:
+                    self.__reference_index = ABCReferenceIndex()
+                self.__reference_index.build()
+                deferred = self.__light_rig_loading != ABCLightRigLoading.Immediate
+                self.__run_step(report, light_plans, "light_rig",
+                                lambda plan: plan.get_abc().update_light_rig(plan, self.__reference_index, deferred))
+                if self.__light_rig_loading == ABCLightRigLoading.AfterImport:
+                    self.__run_step(report, light_plans, "light_rig_load",
+                                    lambda plan: self.__reference_index.load_pending([plan.get_abc().get_name()]))
+            self.__update_looks(report, [plan for plan in plans if plan.is_updating_looks()])
+
+            for plan in plans:
+                if not report.has_failed(plan.get_abc()):
+                    report.add_standin_nodes(plan.get_standin_nodes())
+        finally:
+            pm.refresh(suspend=False)
+            pm.undoInfo(closeChunk=True)
+        return report
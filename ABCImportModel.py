@@ -0,0 +1,672 @@
+import os
+from enum import Enum
+from functools import partial
+
+from PySide2.QtCore import *
+from PySide2.QtGui import *
+from PySide2.QtWidgets import *
+
+from .ABCImportAsset import *
+from .ABCLookStatus import *
+
+# ######################################################################################################################
+
+_ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
+
+# Size (in px) of the icons in the cells
+STATE_ICON_SIZE = 25
+LOOK_ICON_SIZE = 22
+
+_STATE_TOOLTIPS = {
+    ABCState.UpToDate: "Up to date",
+    ABCState.OutOfDate: "Out of date",
+    ABCState.New: "New",
+}
+
+
+class ABCNameMatch(Enum):
+    """
+    How the text of the filter matches the names of the abcs
+    """
+    Substring = 0
+    Prefix = 1
+
+
+class ABCStateFilter(Enum):
+    """
+    States of the abcs kept by the filter
+    """
+    All = 0
+    OutOfDate = 1
+    New = 2
+    LookOutOfDate = 3
+
+
+# ######################################################################################################################
+
+
+class ABCIconCache:
+    """
+    Process-wide cache of the icons of the table, loaded once and pre-scaled to the size of the cells
+    """
+    __pixmaps = {}
+
+    @staticmethod
+    def get_pixmap(filename, size):
+        """
+        Get an icon of the assets folder scaled to a size
+        :param filename
+        :param size
+        :return: pixmap
+        """
+        key = (filename, size)
+        pixmap = ABCIconCache.__pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(os.path.join(_ASSET_DIR, filename))
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(size, size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            ABCIconCache.__pixmaps[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def get_state_pixmap(abc, state, size=STATE_ICON_SIZE):
+        """
+        Get the icon of a state for the kind of the abc (anim or fur)
+        :param abc
+        :param state
+        :param size
+        :return: pixmap
+        """
+        key = (type(abc), state, size)
+        pixmap = ABCIconCache.__pixmaps.get(key)
+        if pixmap is None:
+            pixmap = ABCIconCache.get_pixmap(abc.get_icon_filename(state), size)
+            ABCIconCache.__pixmaps[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def clear():
+        """
+        Clear the cache
+        :return:
+        """
+        ABCIconCache.__pixmaps.clear()
+
+
+class ABCImportTableModel(QAbstractTableModel):
+    """
+    Model of the abcs displayed in the table of ABCImport.
+    The look status of the abcs is evaluated in background and the look column is filled as the results arrive.
+    """
+    STATE_COLUMN = 0
+    NAME_COLUMN = 1
+    ACTUAL_VERSION_COLUMN = 2
+    IMPORT_VERSION_COLUMN = 3
+    LOOK_COLUMN = 4
+
+    _HEADERS = ["State", "Asset name", "Actual version", "Import version", "Look"]
+
+    # Role of the version paths of the abc
+    VersionsRole = Qt.UserRole + 1
+
+    def __init__(self, look_status_workers=DEFAULT_LOOK_STATUS_WORKERS, parent=None):
+        """
+        Constructor
+        :param look_status_workers : number of threads evaluating the look status
+        :param parent
+        """
+        super(ABCImportTableModel, self).__init__(parent)
+        self.__abcs = []
+        self.__rows = {}
+        self.__look_up_to_date = {}
+        self.__pending_light_rigs = set()
+        self.__look_status_evaluator = ABCLookStatusEvaluator(look_status_workers, self)
+        self.__look_status_evaluator.status_evaluated.connect(self.__on_look_status_evaluated)
+
+    def __evaluate_look_status(self, abcs):
+        """
+        Evaluate in background the look status of the abcs in the scene.
+        The previous status is displayed until the new one is evaluated.
+        :param abcs
+        :return:
+        """
+        self.__look_status_evaluator.evaluate([abc for abc in abcs if abc.get_state() != ABCState.New])
+
+    def __on_look_status_evaluated(self, abc, is_look_up_to_date):
+        """
+        On the look status of an abc evaluated, refresh its look cell
+        :param abc
+        :param is_look_up_to_date
+        :return:
+        """
+        row = self.get_row(abc)
+        if row is None:
+            return
+        self.__look_up_to_date[abc] = is_look_up_to_date
+        index = self.index(row, ABCImportTableModel.LOOK_COLUMN)
+        self.dataChanged.emit(index, index)
+
+    def stop_look_status_evaluation(self):
+        """
+        Cancel the evaluations of look status and release their threads
+        :return:
+        """
+        self.__look_status_evaluator.shutdown()
+
+    def get_abcs(self):
+        """
+        Getter of the abcs
+        :return: abcs
+        """
+        return self.__abcs
+
+    def get_abc(self, row):
+        """
+        Getter of the abc at a row
+        :param row
+        :return: abc
+        """
+        return self.__abcs[row]
+
+    def get_row(self, abc):
+        """
+        Getter of the row of an abc
+        :param abc
+        :return: row or None if the abc is not in the model
+        """
+        return self.__rows.get(abc)
+
+    def get_look_status(self, abc):
+        """
+        Getter of the last evaluated look status of an abc
+        :param abc
+        :return: is look up to date or None if not evaluated yet
+        """
+        return self.__look_up_to_date.get(abc)
+
+    def set_pending_light_rigs(self, names):
+        """
+        Setter of the names of the abcs whose light rig is waiting to be loaded
+        :param names
+        :return:
+        """
+        names = set(names)
+        changed_names = names ^ self.__pending_light_rigs
+        self.__pending_light_rigs = names
+        for abc in self.__abcs:
+            if abc.get_name() in changed_names:
+                index = self.index(self.__rows[abc], ABCImportTableModel.NAME_COLUMN)
+                self.dataChanged.emit(index, index)
+
+    def clear(self):
+        """
+        Remove all the abcs
+        :return:
+        """
+        self.beginResetModel()
+        self.__look_status_evaluator.cancel()
+        self.__abcs = []
+        self.__rows = {}
+        self.__look_up_to_date.clear()
+        self.endResetModel()
+
+    def append_abc(self, abc, is_look_up_to_date=None):
+        """
+        Add an abc at the end of the model, or at the end of the abcs of its shot so that the abcs are grouped by shot
+        :param abc
+        :param is_look_up_to_date : last known look status, displayed until the look status is evaluated again
+        :return: row of the abc
+        """
+        row = len(self.__abcs)
+        shot = abc.get_shot()
+        if shot is not None:
+            while row > 0 and self.__abcs[row - 1].get_shot() > shot:
+                row -= 1
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__abcs.insert(row, abc)
+        for index in range(row, len(self.__abcs)):
+            self.__rows[self.__abcs[index]] = index
+        if is_look_up_to_date is not None:
+            self.__look_up_to_date[abc] = is_look_up_to_date
+        self.endInsertRows()
+        self.__evaluate_look_status([abc])
+        return row
+
+    def refresh_abcs(self, abcs=None):
+        """
+        Notify the views that some abcs have changed
+        :param abcs : abcs to refresh (all if None)
+        :return:
+        """
+        if len(self.__abcs) == 0:
+            return
+        if abcs is None:
+            self.__evaluate_look_status(self.__abcs)
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.__abcs) - 1, len(self._HEADERS) - 1))
+            return
+        for abc in abcs:
+            row = self.get_row(abc)
+            if row is None:
+                continue
+            self.__evaluate_look_status([abc])
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._HEADERS) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Number of abcs
+        :param parent
+        :return: row count
+        """
+        if parent.isValid():
+            return 0
+        return len(self.__abcs)
+
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Number of columns
+        :param parent
+        :return: column count
+        """
+        if parent.isValid():
+            return 0
+        return len(self._HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Header of the columns
+        :param section
+        :param orientation
+        :param role
+        :return: header data
+        """
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._HEADERS[section]
+        return None
+
+    def flags(self, index):
+        """
+        Flags of a cell. Only the import version is editable
+        :param index
+        :return: flags
+        """
+        flags = super(ABCImportTableModel, self).flags(index)
+        if index.isValid() and index.column() == ABCImportTableModel.IMPORT_VERSION_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Data of a cell
+        :param index
+        :param role
+        :return: data
+        """
+        if not index.isValid():
+            return None
+        abc = self.__abcs[index.row()]
+        column = index.column()
+        if role == Qt.UserRole:
+            return abc
+        state = abc.get_state()
+        if column == ABCImportTableModel.STATE_COLUMN:
+            if role == Qt.DecorationRole:
+                return ABCIconCache.get_state_pixmap(abc, state)
+            if role == Qt.ToolTipRole:
+                return _STATE_TOOLTIPS[state]
+        elif column == ABCImportTableModel.NAME_COLUMN:
+            is_light_rig_pending = abc.get_name() in self.__pending_light_rigs
+            missing_frame_ranges = abc.get_missing_frame_ranges()
+            if role == Qt.DisplayRole:
+                name = abc.get_name()
+                if abc.get_shot() is not None:
+                    name = abc.get_shot() + "  |  " + name
+                if len(missing_frame_ranges) > 0:
+                    name += "  [incomplete]"
+                if is_light_rig_pending:
+                    name += "  [light rig pending]"
+                return name
+            if role == Qt.ToolTipRole:
+                tooltips = []
+                if len(missing_frame_ranges) > 0:
+                    tooltips.append("Missing frames : " + ", ".join(
+                        str(start) if start == end else str(start) + "-" + str(end)
+                        for start, end in missing_frame_ranges))
+                if is_light_rig_pending:
+                    tooltips.append("The light rig is referenced but not loaded yet")
+                return "\n".join(tooltips) if len(tooltips) > 0 else None
+        elif column == ABCImportTableModel.ACTUAL_VERSION_COLUMN:
+            if role == Qt.DisplayRole and state != ABCState.New:
+                return abc.get_actual_version()
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        elif column == ABCImportTableModel.IMPORT_VERSION_COLUMN:
+            import_path = abc.get_import_path()
+            if role == Qt.DisplayRole:
+                return os.path.basename(import_path) if import_path is not None else None
+            if role == Qt.EditRole:
+                return import_path
+            if role == ABCImportTableModel.VersionsRole:
+                return abc.get_versions()
+        elif column == ABCImportTableModel.LOOK_COLUMN:
+            if state == ABCState.New:
+                return None
+            if role == Qt.ToolTipRole and self.__look_status_evaluator.is_pending(abc):
+                return "Checking the look..."
+            if role in [Qt.DecorationRole, Qt.ToolTipRole] and self.__look_up_to_date.get(abc) is False:
+                return ABCIconCache.get_pixmap("look.png", LOOK_ICON_SIZE) if role == Qt.DecorationRole \
+                    else "Look out of date"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Set the import version of an abc
+        :param index
+        :param value
+        :param role
+        :return: whether the data has been set
+        """
+        if not index.isValid() or index.column() != ABCImportTableModel.IMPORT_VERSION_COLUMN or role != Qt.EditRole:
+            return False
+        self.__abcs[index.row()].set_import_path(value)
+        # The name flags the incomplete fur caches of the import version
+        self.dataChanged.emit(self.index(index.row(), ABCImportTableModel.NAME_COLUMN), index)
+        return True
+
+
+class ABCImportFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filter of the abcs of an ABCImportTableModel by name and state, without rebuilding the rows of the model.
+    The lowercased shot and name of each abc are indexed on its first test. When the new text only narrows the
+    previous one, only the abcs accepted by the previous filter are tested again.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Constructor
+        :param parent
+        """
+        super(ABCImportFilterProxyModel, self).__init__(parent)
+        self.setDynamicSortFilter(True)
+        # abc -> (lowercased name, lowercased shot)
+        self.__names = {}
+        # abcs accepted by the last tests
+        self.__accepted = set()
+        # abcs that can be accepted by a narrowed filter, None if all can
+        self.__candidates = None
+        self.__text = ""
+        self.__name_match = ABCNameMatch.Substring
+        self.__state_filter = ABCStateFilter.All
+
+    def setSourceModel(self, source_model):
+        """
+        Setter of the source model
+        :param source_model : ABCImportTableModel
+        :return:
+        """
+        super(ABCImportFilterProxyModel, self).setSourceModel(source_model)
+        source_model.modelReset.connect(self.__on_source_reset)
+
+    def __on_source_reset(self):
+        """
+        Forget the index of the abcs of the source model
+        :return:
+        """
+        self.__names.clear()
+        self.__accepted.clear()
+
+    def set_filter(self, text, name_match=ABCNameMatch.Substring, state_filter=ABCStateFilter.All):
+        """
+        Setter of the filter
+        :param text
+        :param name_match : ABCNameMatch
+        :param state_filter : ABCStateFilter
+        :return:
+        """
+        text = text.strip().lower()
+        if text == self.__text and name_match == self.__name_match and state_filter == self.__state_filter:
+            return
+        is_narrowed = name_match == self.__name_match and state_filter == self.__state_filter and \
+            (text.startswith(self.__text) if name_match == ABCNameMatch.Prefix else self.__text in text)
+        self.__text = text
+        self.__name_match = name_match
+        self.__state_filter = state_filter
+        if is_narrowed:
+            self.__candidates = self.__accepted
+            self.__accepted = set()
+        try:
+            self.invalidateFilter()
+        finally:
+            self.__candidates = None
+
+    def is_filtered(self):
+        """
+        Getter of whether some abcs may be hidden by the filter
+        :return: is filtered
+        """
+        return len(self.__text) > 0 or self.__state_filter != ABCStateFilter.All
+
+    def is_accepted(self, abc):
+        """
+        Getter of whether an abc is displayed
+        :param abc
+        :return: is accepted
+        """
+        return abc in self.__accepted
+
+    def get_abc(self, row):
+        """
+        Getter of the abc displayed at a row
+        :param row
+        :return: abc
+        """
+        return self.sourceModel().get_abc(self.mapToSource(self.index(row, 0)).row())
+
+    def get_row(self, abc):
+        """
+        Getter of the row an abc is displayed at
+        :param abc
+        :return: row or None if the abc is not displayed
+        """
+        source_row = self.sourceModel().get_row(abc)
+        if source_row is None:
+            return None
+        index = self.mapFromSource(self.sourceModel().index(source_row, 0))
+        return index.row() if index.isValid() else None
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """
+        Test whether an abc matches the filter
+        :param source_row
+        :param source_parent
+        :return: is accepted
+        """
+        abc = self.sourceModel().get_abc(source_row)
+        if self.__candidates is not None and abc not in self.__candidates:
+            return False
+        accepted = self.__accepts(abc)
+        if accepted:
+            self.__accepted.add(abc)
+        else:
+            self.__accepted.discard(abc)
+        return accepted
+
+    def __accepts(self, abc):
+        """
+        Test whether an abc matches the filter
+        :param abc
+        :return: is accepted
+        """
+        if len(self.__text) > 0:
+            names = self.__names.get(abc)
+            if names is None:
+                names = (abc.get_name().lower(), (abc.get_shot() or "").lower())
+                self.__names[abc] = names
+            if self.__name_match == ABCNameMatch.Prefix:
+                if not names[0].startswith(self.__text) and not names[1].startswith(self.__text):
+                    return False
+            elif self.__text not in names[0] and self.__text not in names[1]:
+                return False
+        if self.__state_filter == ABCStateFilter.All:
+            return True
+        if self.__state_filter == ABCStateFilter.LookOutOfDate:
+            return abc.get_state() != ABCState.New and self.sourceModel().get_look_status(abc) is False
+        state = abc.get_state()
+        return state == ABCState.OutOfDate if self.__state_filter == ABCStateFilter.OutOfDate \
+            else state == ABCState.New
+
+
+class ABCIconDelegate(QStyledItemDelegate):
+    """
+    Paint the decoration of a cell centered. The pixmaps are expected to be already scaled to the icon size.
+    """
+
+    def __init__(self, icon_size, parent=None):
+        """
+        Constructor
+        :param icon_size
+        :param parent
+        """
+        super(ABCIconDelegate, self).__init__(parent)
+        self.__icon_size = icon_size
+
+    def paint(self, painter, option, index):
+        """
+        Paint the background of the cell and the icon at its center
+        :param painter
+        :param option
+        :param index
+        :return:
+        """
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.icon = QIcon()
+        style = opt.widget.style() if opt.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is None or pixmap.isNull():
+            return
+        rect = pixmap.rect()
+        rect.moveCenter(option.rect.center())
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def sizeHint(self, option, index):
+        """
+        Size of the icon with a margin
+        :param option
+        :param index
+        :return: size hint
+        """
+        return QSize(self.__icon_size + 6, self.__icon_size + 4)
+
+
+class ABCVersionDelegate(QStyledItemDelegate):
+    """
+    Paint the import version as a combobox and edit it with a real combobox only when clicked
+    """
+
+    def paint(self, painter, option, index):
+        """
+        Paint a combobox with the import version
+        :param painter
+        :param option
+        :param index
+        :return:
+        """
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        combo_opt = QStyleOptionComboBox()
+        combo_opt.rect = option.rect.adjusted(2, 2, -2, -2)
+        combo_opt.state = option.state | QStyle.State_Enabled
+        combo_opt.currentText = index.data(Qt.DisplayRole) or ""
+        style.drawComplexControl(QStyle.CC_ComboBox, combo_opt, painter, opt.widget)
+        style.drawControl(QStyle.CE_ComboBoxLabel, combo_opt, painter, opt.widget)
+
+    def sizeHint(self, option, index):
+        """
+        Size of a combobox
+        :param option
+        :param index
+        :return: size hint
+        """
+        combo_opt = QStyleOptionComboBox()
+        text_width = option.fontMetrics.horizontalAdvance(index.data(Qt.DisplayRole) or "0000")
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        return style.sizeFromContents(QStyle.CT_ComboBox, combo_opt, QSize(text_width, option.fontMetrics.height()),
+                                      option.widget) + QSize(10, 8)
+
+    def editorEvent(self, event, model, option, index):
+        """
+        Open the combobox on click without changing the selection
+        :param event
+        :param model
+        :param option
+        :param index
+        :return: whether the event has been handled
+        """
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            view = self.parent()
+            if isinstance(view, QAbstractItemView):
+                view.edit(index)
+                return True
+        return super(ABCVersionDelegate, self).editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        """
+        Create a combobox with all the versions of the abc
+        :param parent
+        :param option
+        :param index
+        :return: editor
+        """
+        editor = QComboBox(parent)
+        editor.setStyleSheet(".QComboBox{margin:2px; padding:3px}")
+        for version in index.data(ABCImportTableModel.VersionsRole):
+            editor.addItem(version.get_name(), version.get_path())
+        editor.activated.connect(partial(self.__on_version_activated, editor))
+        QTimer.singleShot(0, editor.showPopup)
+        return editor
+
+    def __on_version_activated(self, editor, cb_index):
+        """
+        Commit the version chosen and close the combobox
+        :param editor
+        :param cb_index
+        :return:
+        """
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QAbstractItemDelegate.NoHint)
+
+    def setEditorData(self, editor, index):
+        """
+        Select the import version in the combobox
+        :param editor
+        :param index
+        :return:
+        """
+        cb_index = editor.findData(index.data(Qt.EditRole))
+        if cb_index >= 0:
+            editor.setCurrentIndex(cb_index)
+
+    def setModelData(self, editor, model, index):
+        """
+        Set the version selected in the combobox as import version
+        :param editor
+        :param model
+        :param index
+        :return:
+        """
+        model.setData(index, editor.currentData(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        """
+        Fit the combobox in the cell
+        :param editor
+        :param option
+        :param index
+        :return:
+        """
+        editor.setGeometry(option.rect)
@@ -0,0 +1,27 @@
+import importlib.util
+import sys
+
+
+# ######################################################################################################################
+
+
+def lazy_import(module_name):
+    """
+    Import a module on first access to one of its attributes. The module is returned as is if already imported.
+    Used for the heavy modules (pymel.core, look_loader) so that the window shows up before they are loaded.
+    :param module_name
+    :return: module
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ImportError("No module named " + module_name, name=module_name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
+
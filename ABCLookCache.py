@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+
+from .ABCProfiler import *
+
+# ######################################################################################################################
+
+# Time (in s) after which the uvs and the look directory of a character are resolved again
+_UV_CACHE_TTL = 300
+
+# Depth of the folders of the look directory of a character stamped to detect a new look or uv version
+_LOOK_DIR_STAMP_DEPTH = 2
+
+
+def _get_dir_stamp(directory):
+    """
+    Get a stamp of a directory of the look library that changes when a look or a uv is published in it
+    :param directory
+    :return: stamp
+    """
+    stamp = []
+    # The directory of the files and its parent where the new versions are published
+    for path in [directory, os.path.dirname(directory)]:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _get_tree_stamp(directory, depth=_LOOK_DIR_STAMP_DEPTH):
+    """
+    Get a stamp of a directory and of its sub folders up to a depth, that changes when a file or a folder is added or
+    removed in one of them
+    :param directory
+    :param depth
+    :return: stamp
+    """
+    try:
+        stamp = [(directory, os.stat(directory).st_mtime_ns)]
+        if depth > 0:
+            with os.scandir(directory) as it:
+                sub_directories = sorted(entry.path for entry in it if entry.is_dir())
+            for sub_directory in sub_directories:
+                stamp.extend(_get_tree_stamp(sub_directory, depth - 1))
+    except OSError:
+        return ((directory, None),)
+    return tuple(stamp)
+
+
+# ######################################################################################################################
+
+
+class ABCLookCache:
+    """
+    Process-wide cache of the look objects generated for the stand-ins and of their look status.
+    A look object is generated again only when the dso or the abc_layers of its stand-in change, a look status is
+    computed again only when the stand-in or the look directory of its character change or after a look update.
+    The stand-ins are keyed by shape name so that the cached look status can be queried from several threads without
+    touching the scene.
+    """
+    # shape name -> (signature, look object)
+    __looks = {}
+    # shape name -> (signature, is look up to date)
+    __statuses = {}
+    # char name -> (look directory or None, resolve time)
+    __look_dirs = {}
+    __hits = 0
+    __misses = 0
+    __look_hits = 0
+    __look_misses = 0
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_look(shape_name, signature, generate):
+        """
+        Get the look object of a stand-in, generated if the stand-in has changed since the last call.
+        Only called from the main thread.
+        :param shape_name
+        :param signature : values of the stand-in the look object depends on
+        :param generate : function generating the look object of the stand-in
+        :return: look object
+        """
+        cached = ABCLookCache.__looks.get(shape_name)
+        if cached is not None and cached[0] == signature:
+            ABCLookCache.__look_hits += 1
+            return cached[1]
+        ABCLookCache.__look_misses += 1
+        look = generate()
+        ABCLookCache.__looks[shape_name] = (signature, look)
+        return look
+
+    @staticmethod
+    def get_cached_status(shape_name, signature):
+        """
+        Get whether the look of a stand-in is up to date if it has been computed since the stand-in or its looks have
+        changed. Can be called from any thread.
+        :param shape_name
+        :param signature : values of the stand-in and stamp of its look directory
+        :return: is look up to date or None if not computed
+        """
+        with ABCLookCache.__lock:
+            cached = ABCLookCache.__statuses.get(shape_name)
+            if cached is not None and cached[0] == signature:
+                ABCLookCache.__hits += 1
+                return cached[1]
+            ABCLookCache.__misses += 1
+            return None
+
+    @staticmethod
+    def set_status(shape_name, signature, status):
+        """
+        Setter of whether the look of a stand-in is up to date
+        :param shape_name
+        :param signature : values of the stand-in and stamp of its look directory
+        :param status : is look up to date
+        :return:
+        """
+        with ABCLookCache.__lock:
+            ABCLookCache.__statuses[shape_name] = (signature, status)
+
+    @staticmethod
+    def get_look_dir_stamp(char_name, resolve_look_dir):
+        """
+        Get a stamp of the look directory of a character that changes when a look or a uv is published.
+        The look directory is resolved again after a delay, even if it was not found.
+        :param char_name
+        :param resolve_look_dir : function returning the look directory of a character or None
+        :return: stamp
+        """
+        with ABCLookCache.__lock:
+            cached = ABCLookCache.__look_dirs.get(char_name)
+        if cached is not None and time.time() - cached[1] < _UV_CACHE_TTL:
+            look_dir = cached[0]
+        else:
+            look_dir = resolve_look_dir(char_name)
+            with ABCLookCache.__lock:
+                ABCLookCache.__look_dirs[char_name] = (look_dir, time.time())
+        return _get_tree_stamp(look_dir) if look_dir is not None else None
+
+    @staticmethod
+    def invalidate(shape_names):
+        """
+        Forget the look status of stand-ins
+        :param shape_names
+        :return:
+        """
+        with ABCLookCache.__lock:
+            for shape_name in shape_names:
+                ABCLookCache.__statuses.pop(shape_name, None)
+
+    @staticmethod
+    def clear():
+        """
+        Clear the cache
+        :return:
+        """
+        with ABCLookCache.__lock:
+            ABCLookCache.__looks.clear()
+            ABCLookCache.__statuses.clear()
+            ABCLookCache.__look_dirs.clear()
+
+    @staticmethod
+    def get_stats():
+        """
+        Getter of the hits and misses of the look status cache and of the look objects
+        :return: dict with the hits, the misses and the number of look objects and statuses cached
+        """
+        with ABCLookCache.__lock:
+            return {
+                "hits": ABCLookCache.__hits,
+                "misses": ABCLookCache.__misses,
+                "look_hits": ABCLookCache.__look_hits,
+                "look_misses": ABCLookCache.__look_misses,
+                "looks": len(ABCLookCache.__looks),
+                "statuses": len(ABCLookCache.__statuses),
+            }
+
+    @staticmethod
+    def reset_stats():
+        """
+        Reset the hits and misses
+        :return:
+        """
+        with ABCLookCache.__lock:
+            ABCLookCache.__hits = 0
+            ABCLookCache.__misses = 0
+            ABCLookCache.__look_hits = 0
+            ABCLookCache.__look_misses = 0
+
+
+ABCProfiler.add_stats_provider("look_cache", ABCLookCache.get_stats)
+
+
+class ABCUVCache:
+    """
+    Process-wide cache of the uvs of the characters, so that the look library is scanned once for all the instances
+    of a character. The uvs of a character are resolved again after a delay or when their directory changes.
+    """
+    # (char name, project dir) -> (uvs, resolve time, stamp of the directory of the last uvs)
+    __uvs = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_uvs(char_name, project_dir, resolve_uvs):
+        """
+        Get the uvs of a character
+        :param char_name
+        :param project_dir
+        :param resolve_uvs : function resolving the uvs of a character in a project (LookAsset.get_uvs)
+        :return: uvs
+        """
+        key = (char_name, project_dir)
+        with ABCUVCache.__lock:
+            cached = ABCUVCache.__uvs.get(key)
+        if cached is not None:
+            uvs, resolve_time, stamp = cached
+            if time.time() - resolve_time < _UV_CACHE_TTL and \
+                    (len(uvs) == 0 or _get_dir_stamp(os.path.dirname(uvs[0][1])) == stamp):
+                return uvs
+        uvs = resolve_uvs(char_name, project_dir)
+        stamp = _get_dir_stamp(os.path.dirname(uvs[0][1])) if len(uvs) > 0 else None
+        with ABCUVCache.__lock:
+            ABCUVCache.__uvs[key] = (uvs, time.time(), stamp)
+        return uvs
+
+    @staticmethod
+    def clear():
+        """
+        Clear the cache
+        :return:
+        """
+        with ABCUVCache.__lock:
+            ABCUVCache.__uvs.clear()
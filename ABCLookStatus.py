@@ -0,0 +1,125 @@
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide2.QtCore import *
+
+from .ABCProfiler import *
+
+# ######################################################################################################################
+
+# Number of threads evaluating the look status
+DEFAULT_LOOK_STATUS_WORKERS = 4
+
+
+# ######################################################################################################################
+
+
+class ABCLookStatusEvaluator(QObject):
+    """
+    Evaluate whether the looks of abcs are up to date in a bounded thread pool.
+    Only the read-only look and uv queries on the look library run in the threads, the look objects are generated
+    with the stand-ins on the main thread. The results are delivered on the thread of the evaluator with
+    status_evaluated.
+    """
+    # abc, is look up to date
+    status_evaluated = Signal(object, bool)
+    # abc, request id, is look up to date (emitted from the threads of the pool)
+    __status_computed = Signal(object, int, bool)
+
+    def __init__(self, max_workers=DEFAULT_LOOK_STATUS_WORKERS, parent=None):
+        """
+        Constructor
+        :param max_workers
+        :param parent
+        """
+        super(ABCLookStatusEvaluator, self).__init__(parent)
+        self.__max_workers = max(1, max_workers)
+        self.__executor = None
+        # abc -> (request id, future)
+        self.__requests = {}
+        self.__next_request_id = 0
+        self.__status_computed.connect(self.__on_status_computed, Qt.QueuedConnection)
+
+    def evaluate(self, abcs):
+        """
+        Evaluate the look status of abcs. A new evaluation of an abc replaces the one still running.
+        :param abcs
+        :return:
+        """
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        for abc in abcs:
+            self.__cancel_request(abc)
+            self.__next_request_id += 1
+            future = self.__executor.submit(self.__compute, abc, self.__next_request_id)
+            self.__requests[abc] = (self.__next_request_id, future)
+
+    def is_pending(self, abc):
+        """
+        Getter of whether the look status of an abc is being evaluated
+        :param abc
+        :return: is pending
+        """
+        return abc in self.__requests
+
+    def cancel(self):
+        """
+        Cancel all the evaluations. The results of the ones already running are ignored.
+        :return:
+        """
+        for abc in list(self.__requests.keys()):
+            self.__cancel_request(abc)
+
+    def shutdown(self):
+        """
+        Cancel all the evaluations and release the threads
+        :return:
+        """
+        self.cancel()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+    def __cancel_request(self, abc):
+        """
+        Cancel the evaluation of an abc
+        :param abc
+        :return:
+        """
+        request = self.__requests.pop(abc, None)
+        if request is not None:
+            request[1].cancel()
+
+    @profiled("look_status")
+    def __compute(self, abc, request_id):
+        """
+        Compute the look status of an abc in a thread of the pool
+        :param abc
+        :param request_id
+        :return:
+        """
+        try:
+            status = abc.is_look_up_to_date()
+        except Exception:
+            traceback.print_exception(*sys.exc_info())
+            status = False
+        try:
+            self.__status_computed.emit(abc, request_id, status)
+        except RuntimeError:
+            # The evaluator has been deleted meanwhile
+            pass
+
+    def __on_status_computed(self, abc, request_id, status):
+        """
+        On a look status computed, deliver it if it is the result of the last evaluation of the abc
+        :param abc
+        :param request_id
+        :param status
+        :return:
+        """
+        request = self.__requests.get(abc)
+        if request is None or request[0] != request_id:
+            return
+        del self.__requests[abc]
+        self.status_evaluated.emit(abc, status)
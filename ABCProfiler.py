@@ -0,0 +1,365 @@
+import functools
+import getpass
+import importlib.util
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+
+# ######################################################################################################################
+
+# Environment variable enabling the profiling ("1") and the one of the directory of the reports
+PROFILE_ENV_VAR = "ABC_IMPORT_PROFILE"
+PROFILE_DIR_ENV_VAR = "ABC_IMPORT_PROFILE_DIR"
+
+_REPORT_FORMAT_VERSION = 1
+
+# Functions counted while profiling : (module name, attribute name, counter name)
+# os.path.exists and os.path.isdir call os.stat so they are counted in fs.stat too
+_COUNTED_FUNCTIONS = [
+    ("os", "scandir", "fs.scandir"),
+    ("os", "listdir", "fs.listdir"),
+    ("os", "stat", "fs.stat"),
+    ("os.path", "exists", "fs.exists"),
+    ("os.path", "isdir", "fs.isdir"),
+    ("pymel.core", "listRelatives", "pymel.listRelatives"),
+    ("pymel.core", "createNode", "pymel.createNode"),
+    ("pymel.core", "rename", "pymel.rename"),
+    ("pymel.core", "listReferences", "pymel.listReferences"),
+    ("pymel.core", "createReference", "pymel.createReference"),
+    ("pymel.core", "select", "pymel.select"),
+    ("pymel.core.general.Attribute", "get", "pymel.Attribute.get"),
+    ("pymel.core.general.Attribute", "set", "pymel.Attribute.set"),
+    ("maya.cmds", "ls", "cmds.ls"),
+    ("maya.cmds", "getAttr", "cmds.getAttr"),
+]
+
+
+# ######################################################################################################################
+
+
+class _NoPhase:
+    """
+    Phase doing nothing, used while the profiling is disabled
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class _Phase:
+    """
+    Phase timed while the profiling is enabled
+    """
+
+    def __init__(self, name):
+        """
+        Constructor
+        :param name
+        """
+        self.__name = name
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        ABCProfiler.add_phase_time(self.__name, time.perf_counter() - self.__start)
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class ABCProfiler:
+    """
+    Process-wide instrumentation of the tool : time spent in each phase, number of filesystem and PyMEL calls and
+    time spent on each asset by the imports. The report is written as JSON.
+    While disabled, a phase only costs a boolean test.
+    """
+    __enabled = False
+    __lock = threading.Lock()
+    __started = None
+    __report_filepath = None
+    # phase name -> [count, total time, max time]
+    __phases = {}
+    # counter name -> count
+    __counters = {}
+    # asset name -> {step: time}
+    __assets = {}
+    # stats name -> function returning the stats of a cache
+    __stats_providers = {}
+    # (owner, attribute name, original function, whether the owner defined the function itself)
+    __patches = []
+    # Counted functions of the modules not loaded yet, wrapped at the start of a phase once loaded
+    __pending_functions = []
+
+    @staticmethod
+    def is_enabled():
+        """
+        Getter of whether the profiling is enabled
+        :return: is enabled
+        """
+        return ABCProfiler.__enabled
+
+    @staticmethod
+    def is_enabled_by_env():
+        """
+        Getter of whether the profiling is asked by the environment variable
+        :return: is enabled by env
+        """
+        return os.getenv(PROFILE_ENV_VAR, "0") not in ["", "0"]
+
+    @staticmethod
+    def enable(report_dir=None):
+        """
+        Start the profiling
+        :param report_dir : directory of the report (~/.abc_import/profiles or ABC_IMPORT_PROFILE_DIR by default)
+        :return:
+        """
+        if ABCProfiler.__enabled:
+            return
+        if report_dir is None:
+            report_dir = os.getenv(PROFILE_DIR_ENV_VAR) or \
+                os.path.join(os.path.expanduser("~"), ".abc_import", "profiles")
+        ABCProfiler.reset()
+        ABCProfiler.__started = datetime.now()
+        ABCProfiler.__report_filepath = os.path.join(report_dir, "abc_import_%s_%d_%s.json" % (
+            socket.gethostname(), os.getpid(), ABCProfiler.__started.strftime("%Y%m%d_%H%M%S")))
+        ABCProfiler.__pending_functions = list(_COUNTED_FUNCTIONS)
+        ABCProfiler.__patch_functions()
+        ABCProfiler.__enabled = True
+
+    @staticmethod
+    def disable():
+        """
+        Stop the profiling
+        :return:
+        """
+        if not ABCProfiler.__enabled:
+            return
+        ABCProfiler.__enabled = False
+        ABCProfiler.__unpatch_functions()
+
+    @staticmethod
+    def reset():
+        """
+        Forget all the measures
+        :return:
+        """
+        with ABCProfiler.__lock:
+            ABCProfiler.__phases = {}
+            ABCProfiler.__counters = {}
+            ABCProfiler.__assets = {}
+
+    @staticmethod
+    def phase(name):
+        """
+        Get a context manager timing a phase
+        :param name
+        :return: context manager
+        """
+        if not ABCProfiler.__enabled:
+            return _NO_PHASE
+        if len(ABCProfiler.__pending_functions) > 0:
+            ABCProfiler.__patch_functions()
+        return _Phase(name)
+
+    @staticmethod
+    def add_phase_time(name, duration):
+        """
+        Add time spent in a phase
+        :param name
+        :param duration : in seconds
+        :return:
+        """
+        with ABCProfiler.__lock:
+            phase = ABCProfiler.__phases.get(name)
+            if phase is None:
+                ABCProfiler.__phases[name] = [1, duration, duration]
+            else:
+                phase[0] += 1
+                phase[1] += duration
+                phase[2] = max(phase[2], duration)
+
+    @staticmethod
+    def count(name, nb=1):
+        """
+        Increment a counter
+        :param name
+        :param nb
+        :return:
+        """
+        if not ABCProfiler.__enabled:
+            return
+        with ABCProfiler.__lock:
+            ABCProfiler.__counters[name] = ABCProfiler.__counters.get(name, 0) + nb
+
+    @staticmethod
+    def add_asset_time(asset_name, step, duration):
+        """
+        Add time spent on a step of the import of an asset
+        :param asset_name
+        :param step
+        :param duration : in seconds
+        :return:
+        """
+        if not ABCProfiler.__enabled:
+            return
+        with ABCProfiler.__lock:
+            steps = ABCProfiler.__assets.setdefault(asset_name, {})
+            steps[step] = steps.get(step, 0.0) + duration
+
+    @staticmethod
+    def add_stats_provider(name, get_stats):
+        """
+        Add stats reported with the measures, such as the hits and misses of a cache
+        :param name
+        :param get_stats : function returning a dict of the stats
+        :return:
+        """
+        with ABCProfiler.__lock:
+            ABCProfiler.__stats_providers[name] = get_stats
+
+    @staticmethod
+    def get_report():
+        """
+        Get the report of the measures
+        :return: report
+        """
+        with ABCProfiler.__lock:
+            stats_providers = dict(ABCProfiler.__stats_providers)
+        # Queried out of the lock as the providers have their own
+        stats = {name: get_stats() for name, get_stats in stats_providers.items()}
+        with ABCProfiler.__lock:
+            return {
+                "format": _REPORT_FORMAT_VERSION,
+                "tool": "abc_import",
+                "host": socket.gethostname(),
+                "user": getpass.getuser(),
+                "pid": os.getpid(),
+                "started": ABCProfiler.__started.isoformat() if ABCProfiler.__started is not None else None,
+                "written": datetime.now().isoformat(),
+                "phases": {name: {"count": count, "total": total, "max": max_duration}
+                           for name, (count, total, max_duration) in ABCProfiler.__phases.items()},
+                "counters": dict(ABCProfiler.__counters),
+                "assets": {name: dict(steps) for name, steps in ABCProfiler.__assets.items()},
+                "stats": stats,
+            }
+
+    @staticmethod
+    def write_report():
+        """
+        Write the report of the session, overwriting the previous one. Failing to write it is not an error.
+        :return: report filepath or None if not written
+        """
+        if not ABCProfiler.__enabled:
+            return None
+        filepath = ABCProfiler.__report_filepath
+        report = ABCProfiler.get_report()
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+        except OSError:
+            return None
+        return filepath
+
+    @staticmethod
+    def __patch_functions():
+        """
+        Wrap the counted functions of the modules loaded, the other ones are left pending
+        :return:
+        """
+        with ABCProfiler.__lock:
+            pending_functions = []
+            for owner_name, attr_name, counter_name in ABCProfiler.__pending_functions:
+                owner = ABCProfiler.__resolve(owner_name)
+                if owner is None:
+                    pending_functions.append((owner_name, attr_name, counter_name))
+                    continue
+                if not hasattr(owner, attr_name):
+                    continue
+                func = getattr(owner, attr_name)
+                is_own = attr_name in vars(owner)
+                setattr(owner, attr_name, ABCProfiler.__counted(func, counter_name))
+                ABCProfiler.__patches.append((owner, attr_name, func, is_own))
+            ABCProfiler.__pending_functions = pending_functions
+
+    @staticmethod
+    def __unpatch_functions():
+        """
+        Restore the counted functions
+        :return:
+        """
+        for owner, attr_name, func, is_own in reversed(ABCProfiler.__patches):
+            if is_own:
+                setattr(owner, attr_name, func)
+            else:
+                # Inherited function
+                delattr(owner, attr_name)
+        ABCProfiler.__patches = []
+        ABCProfiler.__pending_functions = []
+
+    @staticmethod
+    def __resolve(owner_name):
+        """
+        Get an already imported module or a class of a module by name
+        :param owner_name
+        :return: module, class or None if not imported or not loaded yet
+        """
+        parts = owner_name.split(".")
+        # The modules are not imported by the profiler, only the ones already used are counted
+        for index in range(len(parts), 0, -1):
+            module = sys.modules.get(".".join(parts[:index]))
+            if module is None:
+                continue
+            # A module of lazy_import is loaded by the first access to one of its attributes, type() does not access
+            # any so that it is left to load when the tool first needs it
+            if issubclass(type(module), importlib.util._LazyModule):
+                return None
+            owner = module
+            for part in parts[index:]:
+                owner = getattr(owner, part, None)
+                if owner is None:
+                    return None
+            return owner
+        return None
+
+    @staticmethod
+    def __counted(func, counter_name):
+        """
+        Wrap a function to count its calls
+        :param func
+        :param counter_name
+        :return: wrapped function
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ABCProfiler.count(counter_name)
+            return func(*args, **kwargs)
+        return wrapper
+
+
+def profiled(phase_name):
+    """
+    Decorator timing each call of a function as a phase
+    :param phase_name
+    :return: decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ABCProfiler.is_enabled():
+                return func(*args, **kwargs)
+            with ABCProfiler.phase(phase_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
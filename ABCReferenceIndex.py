@@ -0,0 +1,204 @@
+import re
+
+# ######################################################################################################################
+
+# Light rig of an anim : ".../<asset>_light.ma" or ".../<asset>_light.mb"
+_LIGHT_RIG_PATTERN = re.compile(r".*[\\/](.*)_light\.m[ab]")
+
+
+# ######################################################################################################################
+
+
+class ABCReferenceIndex:
+    """
+    Index of the light rig references of the scene by asset name.
+    It is built once and kept up to date when references are replaced or created through it, so that it can be
+    shared by all the imports of a batch or by other tools.
+    Light rigs can be deferred : they are created or repointed unloaded and loaded later all at once with
+    load_pending. As the deferred references are unloaded in the scene, they are pending again once the index is
+    built again.
+    """
+
+    def __init__(self, list_references=None, create_reference=None):
+        """
+        Constructor
+        :param list_references : function listing the references (pm.listReferences by default)
+        :param create_reference : function creating a reference from a filepath (pm.createReference by default)
+        """
+        # The PyMEL functions are resolved on first use so that creating the index does not load PyMEL
+        self.__list_references = list_references
+        self.__create_reference = create_reference
+        # asset name -> reference
+        self.__references = {}
+        # asset name -> light rig file to load
+        self.__pending = {}
+
+    def __get_reference_functions(self):
+        """
+        Getter of the functions listing and creating the references, the PyMEL ones if none were given
+        :return: list references function, create reference function
+        """
+        if self.__list_references is None or self.__create_reference is None:
+            # Imported here so that the index can be used with other reference functions outside of Maya
+            import pymel.core as pm
+            if self.__list_references is None:
+                self.__list_references = pm.listReferences
+            if self.__create_reference is None:
+                self.__create_reference = pm.createReference
+        return self.__list_references, self.__create_reference
+
+    @staticmethod
+    def get_light_rig_name(filepath):
+        """
+        Get the asset name of a light rig file
+        :param filepath
+        :return: asset name or None if the file is not a light rig
+        """
+        match = _LIGHT_RIG_PATTERN.match(filepath)
+        return match.group(1) if match else None
+
+    def build(self):
+        """
+        Index all the light rig references of the scene
+        :return:
+        """
+        self.__references = {}
+        pending = {}
+        list_references, _ = self.__get_reference_functions()
+        for ref in list_references():
+            name = ABCReferenceIndex.get_light_rig_name(ref.unresolvedPath())
+            # Keep the first reference like a search in the reference list would
+            if name is None or name in self.__references:
+                continue
+            self.__references[name] = ref
+            # A replacement deferred before the build is kept, otherwise an unloaded light rig is pending
+            if name in self.__pending:
+                pending[name] = self.__pending[name]
+            elif not ref.isLoaded():
+                pending[name] = ref.unresolvedPath()
+        self.__pending = pending
+
+    def get_references(self):
+        """
+        Getter of the light rig references
+        :return: dict asset name -> reference
+        """
+        return self.__references
+
+    def get_reference(self, name):
+        """
+        Getter of the light rig reference of an asset
+        :param name
+        :return: reference or None
+        """
+        return self.__references.get(name)
+
+    def replace(self, name, filepath, load=True):
+        """
+        Replace the file of the light rig reference of an asset
+        :param name
+        :param filepath
+        :param load : whether the reference is loaded, otherwise it is left unloaded and pending
+        :return: reference
+        """
+        ref = self.__references[name]
+        if load:
+            ref.replaceWith(filepath)
+        else:
+            ref.replaceWith(filepath, loadReferenceDepth="none")
+        self.__pending.pop(name, None)
+        new_name = ABCReferenceIndex.get_light_rig_name(filepath)
+        if new_name != name:
+            del self.__references[name]
+            if new_name is not None:
+                self.__references[new_name] = ref
+        if not load and new_name is not None:
+            self.__pending[new_name] = filepath
+        return ref
+
+    def create(self, filepath, **kwargs):
+        """
+        Create a reference and index it if it is a light rig
+        :param filepath
+        :param kwargs : arguments of the reference creation
+        :return: reference
+        """
+        _, create_reference = self.__get_reference_functions()
+        ref = create_reference(filepath, **kwargs)
+        name = ABCReferenceIndex.get_light_rig_name(filepath)
+        if name is not None and name not in self.__references:
+            self.__references[name] = ref
+        return ref
+
+    def update_or_create(self, name, filepath, deferred=False, **kwargs):
+        """
+        Make the light rig reference of an asset point to a file, creating it if there is none.
+        A reference already pointing to the file is left untouched because replacing it would reload it.
+        If deferred, a new reference is created unloaded and an existing one is repointed to the file unloaded, both
+        are loaded by load_pending.
+        :param name
+        :param filepath
+        :param deferred : whether the loading of the light rig is deferred
+        :param kwargs : arguments of the reference creation
+        :return: reference
+        """
+        ref = self.__references.get(name)
+        if ref is None:
+            if not deferred:
+                return self.create(filepath, **kwargs)
+            ref = self.create(filepath, loadReferenceDepth="none", **kwargs)
+            self.__pending[name] = filepath
+            return ref
+        if ABCReferenceIndex.__is_same_path(ref.unresolvedPath(), filepath):
+            # Pointing to the file again cancels a deferred replacement
+            if ref.isLoaded():
+                self.__pending.pop(name, None)
+            else:
+                self.__pending[name] = filepath
+                if not deferred:
+                    self.load_pending([name])
+        else:
+            self.replace(name, filepath, load=not deferred)
+        return ref
+
+    @staticmethod
+    def __is_same_path(path, other_path):
+        """
+        Test whether two paths are the same regardless of the separators
+        :param path
+        :param other_path
+        :return: is same path
+        """
+        return path.replace("\\", "/") == other_path.replace("\\", "/")
+
+    def get_pending(self):
+        """
+        Getter of the light rigs waiting to be loaded
+        :return: dict asset name -> light rig file
+        """
+        return self.__pending
+
+    def is_pending(self, name):
+        """
+        Getter of whether the light rig of an asset is waiting to be loaded
+        :param name
+        :return: is pending
+        """
+        return name in self.__pending
+
+    def load_pending(self, names=None):
+        """
+        Load the light rigs waiting to be loaded
+        :param names : assets whose light rig is loaded (all if None)
+        :return: names of the assets whose light rig has been loaded
+        """
+        names = list(self.__pending.keys()) if names is None else [name for name in names if name in self.__pending]
+        for name in names:
+            ref = self.__references[name]
+            filepath = self.__pending[name]
+            if ABCReferenceIndex.__is_same_path(ref.unresolvedPath(), filepath):
+                ref.load()
+                del self.__pending[name]
+            else:
+                self.replace(name, filepath)
+        return names
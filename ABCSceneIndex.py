@@ -0,0 +1,205 @@
+import re
+
+# ######################################################################################################################
+
+# Fur stand-in : dso ".../<asset>/<version>/<asset>_fur(.<frame>).abc"
+_DSO_PATTERN = re.compile(r".*/(.*)/([0-9]{4,})/.*_[0-9]{2}_fur(?:\.[0-9]+)?\.abc", re.IGNORECASE)
+# Anim stand-in : abc_layers ".../<asset>/<version>/<asset>.abc"
+_ABC_LAYER_PATTERN = re.compile(r".*/(.*)/([0-9]{4,})/.*_[0-9]{2}\.abc", re.IGNORECASE)
+
+# Patterns matching only the file names for the abcs imported out of the abc folders
+_DSO_FILE_PATTERN = re.compile(r".*[\\/](.*_fur)(?:\.[0-9]+)?\.abc", re.IGNORECASE)
+_ABC_LAYER_FILE_PATTERN = re.compile(r".*[\\/](.*)\.abc", re.IGNORECASE)
+
+
+# ######################################################################################################################
+
+
+class ABCMayaSceneAPI:
+    """
+    Access to the stand-ins of the Maya scene with maya.cmds
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        # Imported here so that the index can be used with another scene API outside of Maya
+        import maya.cmds as cmds
+        self.__cmds = cmds
+
+    def list_standins(self):
+        """
+        List all the stand-in shapes with their transform
+        :return: list of (shape, transform)
+        """
+        shapes = self.__cmds.ls(type="aiStandIn", long=True) or []
+        return [(shape, shape.rsplit("|", 1)[0]) for shape in shapes]
+
+    def get_attr(self, node, attr):
+        """
+        Get the value of an attribute
+        :param node
+        :param attr
+        :return: value or None if the attribute does not exist
+        """
+        try:
+            return self.__cmds.getAttr(node + "." + attr)
+        except ValueError:
+            return None
+
+
+class ABCSceneIndex:
+    """
+    Index of the abcs imported in the scene as stand-ins.
+    All the stand-ins are fetched in one pass and their dso and abc_layers are matched against the abc folders
+    architecture.
+    """
+
+    def __init__(self, scene_api=None):
+        """
+        Constructor
+        :param scene_api : object listing the stand-ins and reading their attributes (ABCMayaSceneAPI by default)
+        """
+        self.__scene_api = scene_api
+        # shape -> (transform, dso, abc_layers, asset name, version)
+        self.__standins = {}
+        # asset name -> (shapes, version)
+        self.__assets = {}
+
+    def __get_scene_api(self):
+        """
+        Getter of the scene API, created on first use
+        :return: scene API
+        """
+        if self.__scene_api is None:
+            self.__scene_api = ABCMayaSceneAPI()
+        return self.__scene_api
+
+    def build(self):
+        """
+        Index all the stand-ins of the scene
+        :return:
+        """
+        self.__standins = {}
+        self.__assets = {}
+        for shape, transform in self.__get_scene_api().list_standins():
+            self.__index_standin(shape, transform)
+
+    def __index_standin(self, shape, transform):
+        """
+        Read the dso and the abc_layers of a stand-in and add it to its asset
+        :param shape
+        :param transform
+        :return: name of the asset of the stand-in or None
+        """
+        scene_api = self.__get_scene_api()
+        dso = scene_api.get_attr(shape, "dso")
+        abc_layers = scene_api.get_attr(shape, "abc_layers")
+        dso = dso.replace("\\", "/") if dso else None
+        abc_layers = abc_layers.replace("\\", "/") if abc_layers else None
+
+        match = _DSO_PATTERN.match(dso) if dso is not None else None
+        if match:
+            name = match.group(1) + "_fur"
+        else:
+            match = _ABC_LAYER_PATTERN.match(abc_layers) if abc_layers is not None else None
+            name = match.group(1) if match else None
+        version = match.group(2) if match else None
+        self.__standins[shape] = (transform, dso, abc_layers, name, version)
+        if name is None:
+            return None
+        shapes = self.__assets[name][0] if name in self.__assets else []
+        shapes.append(shape)
+        self.__assets[name] = (shapes, version)
+        return name
+
+    def update_standin(self, shape):
+        """
+        Index again one stand-in that has been added or modified
+        :param shape
+        :return: names of the assets affected
+        """
+        affected_names = self.remove_standin(shape)
+        name = self.__index_standin(shape, shape.rsplit("|", 1)[0])
+        if name is not None:
+            affected_names.add(name)
+        return affected_names
+
+    def remove_standin(self, shape):
+        """
+        Remove a stand-in from the index
+        :param shape
+        :return: names of the assets affected
+        """
+        standin = self.__standins.pop(shape, None)
+        if standin is None or standin[3] is None:
+            return set()
+        name = standin[3]
+        shapes = self.__assets[name][0]
+        shapes.remove(shape)
+        if len(shapes) == 0:
+            del self.__assets[name]
+        else:
+            # The version of an asset is the one of its last stand-in
+            self.__assets[name] = (shapes, self.__standins[shapes[-1]][4])
+        return {name}
+
+    def get_standins(self):
+        """
+        Getter of all the stand-in shapes indexed
+        :return: stand-in shapes
+        """
+        return list(self.__standins.keys())
+
+    def get_assets(self):
+        """
+        Getter of the assets found in the scene
+        :return: dict asset name -> (stand-in shapes, version)
+        """
+        return self.__assets
+
+    def get_asset(self, name):
+        """
+        Getter of the stand-ins and the version of an asset in the scene
+        :param name
+        :return: (stand-in shapes, version) or None if the asset is not in the scene
+        """
+        return self.__assets.get(name)
+
+    def get_look_signature(self, shape):
+        """
+        Getter of the values of a stand-in its look depends on, read when the stand-in has been indexed
+        :param shape
+        :return: (dso, abc_layers) or None if the stand-in is not indexed
+        """
+        standin = self.__standins.get(shape)
+        return standin[1:3] if standin is not None else None
+
+    def get_transform(self, shape):
+        """
+        Getter of the transform of a stand-in shape
+        :param shape
+        :return: transform or None if the stand-in is not indexed
+        """
+        standin = self.__standins.get(shape)
+        return standin[0] if standin is not None else None
+
+    def find_standalone_asset(self, name):
+        """
+        Find an abc that has been imported out of the abc folders architecture.
+        A fur is found with the file name of its dso, an anim with the file name of its abc_layers.
+        :param name
+        :return: stand-in shape or None
+        """
+        found_shape = None
+        for shape, (_, dso, abc_layers, _, _) in self.__standins.items():
+            if dso is not None:
+                match = _DSO_FILE_PATTERN.match(dso)
+                if match and match.group(1) == name:
+                    return shape
+            if abc_layers is not None:
+                match = _ABC_LAYER_FILE_PATTERN.match(abc_layers)
+                if match and match.group(1) == name:
+                    found_shape = shape
+        return found_shape
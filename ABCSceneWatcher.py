@@ -0,0 +1,217 @@
+import maya.OpenMaya as OpenMaya
+
+from PySide2.QtCore import *
+
+# ######################################################################################################################
+
+# Delay (in ms) during which the scene events are accumulated before being processed
+_DEBOUNCE_DELAY = 200
+
+# Attributes of the stand-ins used to find their abc
+_WATCHED_ATTRIBUTES = ["dso", "abc_layers"]
+
+
+# ######################################################################################################################
+
+
+class ABCSceneWatcher(QObject):
+    """
+    Watch the stand-ins of the scene with Maya callbacks.
+    The events are debounced and only the stand-ins added, removed or whose dso or abc_layers changed are reported.
+    """
+    # Stand-in shapes to index again, stand-in shapes removed
+    standins_changed = Signal(object, object)
+    # A new scene has been opened, everything must be indexed again
+    scene_changed = Signal()
+
+    def __init__(self, parent=None):
+        """
+        Constructor
+        :param parent
+        """
+        super(ABCSceneWatcher, self).__init__(parent)
+        self.__callback_ids = []
+        # hash code -> (MObjectHandle, shape path, callback id)
+        self.__standin_callbacks = {}
+        # hash code -> MObjectHandle
+        self.__pending_updates = {}
+        self.__pending_removals = set()
+        self.__pending_scene_change = False
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(_DEBOUNCE_DELAY)
+        self.__timer.timeout.connect(self.__flush)
+
+    def is_watching(self):
+        """
+        Getter of whether the callbacks are registered
+        :return: is watching
+        """
+        return len(self.__callback_ids) > 0
+
+    def start(self, standins):
+        """
+        Register the callbacks
+        :param standins : stand-in shapes currently in the scene
+        :return:
+        """
+        if self.is_watching():
+            return
+        self.__callback_ids = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self.__on_node_added, "aiStandIn"),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.__on_node_removed, "aiStandIn"),
+            OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterOpen, self.__on_scene_changed),
+            OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterNew, self.__on_scene_changed),
+        ]
+        self.watch_standins(standins)
+
+    def stop(self):
+        """
+        Remove all the callbacks
+        :return:
+        """
+        for callback_id in self.__callback_ids:
+            OpenMaya.MMessage.removeCallback(callback_id)
+        self.__callback_ids = []
+        self.__remove_standin_callbacks()
+        self.clear_pending()
+
+    def watch_standins(self, standins):
+        """
+        Watch the attributes of the stand-ins in place of the ones previously watched
+        :param standins : stand-in shapes
+        :return:
+        """
+        self.__remove_standin_callbacks()
+        if not self.is_watching():
+            return
+        for shape in standins:
+            selection = OpenMaya.MSelectionList()
+            try:
+                selection.add(shape)
+            except RuntimeError:
+                continue
+            obj = OpenMaya.MObject()
+            selection.getDependNode(0, obj)
+            self.__add_standin_callback(OpenMaya.MObjectHandle(obj), shape)
+
+    def clear_pending(self):
+        """
+        Forget the events not processed yet
+        :return:
+        """
+        self.__timer.stop()
+        self.__pending_updates.clear()
+        self.__pending_removals.clear()
+        self.__pending_scene_change = False
+
+    def __add_standin_callback(self, handle, shape):
+        """
+        Watch the attributes of a stand-in
+        :param handle
+        :param shape
+        :return:
+        """
+        obj = handle.object()
+        callback_id = OpenMaya.MNodeMessage.addAttributeChangedCallback(obj, self.__on_attribute_changed)
+        self.__standin_callbacks[handle.hashCode()] = (handle, shape, callback_id)
+
+    def __remove_standin_callbacks(self):
+        """
+        Stop watching the attributes of the stand-ins
+        :return:
+        """
+        for _, _, callback_id in self.__standin_callbacks.values():
+            OpenMaya.MMessage.removeCallback(callback_id)
+        self.__standin_callbacks.clear()
+
+    def __schedule(self):
+        """
+        Process the events once no event has come during the debounce delay
+        :return:
+        """
+        self.__timer.start()
+
+    def __on_node_added(self, obj, client_data):
+        """
+        On stand-in created. It is indexed later because its name and attributes are not set yet.
+        :param obj
+        :param client_data
+        :return:
+        """
+        handle = OpenMaya.MObjectHandle(obj)
+        self.__pending_updates[handle.hashCode()] = handle
+        self.__schedule()
+
+    def __on_node_removed(self, obj, client_data):
+        """
+        On stand-in deleted
+        :param obj
+        :param client_data
+        :return:
+        """
+        hash_code = OpenMaya.MObjectHandle(obj).hashCode()
+        self.__pending_updates.pop(hash_code, None)
+        if hash_code in self.__standin_callbacks:
+            _, shape, callback_id = self.__standin_callbacks.pop(hash_code)
+            OpenMaya.MMessage.removeCallback(callback_id)
+        else:
+            shape = OpenMaya.MFnDagNode(obj).fullPathName()
+        self.__pending_removals.add(shape)
+        self.__schedule()
+
+    def __on_attribute_changed(self, msg, plug, other_plug, client_data):
+        """
+        On an attribute of a stand-in changed
+        :param msg
+        :param plug
+        :param other_plug
+        :param client_data
+        :return:
+        """
+        if not msg & OpenMaya.MNodeMessage.kAttributeSet:
+            return
+        if OpenMaya.MFnAttribute(plug.attribute()).name() not in _WATCHED_ATTRIBUTES:
+            return
+        handle = OpenMaya.MObjectHandle(plug.node())
+        self.__pending_updates[handle.hashCode()] = handle
+        self.__schedule()
+
+    def __on_scene_changed(self, client_data):
+        """
+        On new scene or scene opened
+        :param client_data
+        :return:
+        """
+        self.__pending_scene_change = True
+        self.__schedule()
+
+    def __flush(self):
+        """
+        Report the stand-ins changed since the last flush
+        :return:
+        """
+        if self.__pending_scene_change:
+            self.clear_pending()
+            self.scene_changed.emit()
+            return
+        updated = set()
+        removed = set(self.__pending_removals)
+        for hash_code, handle in self.__pending_updates.items():
+            if not handle.isValid():
+                continue
+            shape = OpenMaya.MFnDagNode(handle.object()).fullPathName()
+            if hash_code in self.__standin_callbacks:
+                _, previous_shape, callback_id = self.__standin_callbacks[hash_code]
+                # Renamed or reparented
+                if previous_shape != shape:
+                    removed.add(previous_shape)
+                self.__standin_callbacks[hash_code] = (handle, shape, callback_id)
+            else:
+                self.__add_standin_callback(handle, shape)
+            updated.add(shape)
+        self.__pending_updates.clear()
+        self.__pending_removals.clear()
+        removed -= updated
+        if len(updated) > 0 or len(removed) > 0:
+            self.standins_changed.emit(updated, removed)
@@ -0,0 +1,16 @@
+import os
+
+
+def get_source_stamp():
+    """
+    Get the modification times of the modules of the package
+    :return: dict filename -> mtime
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    return {filename: os.path.getmtime(os.path.join(package_dir, filename))
+            for filename in os.listdir(package_dir) if filename.endswith(".py")}
+
+
+# Modification times of the modules when the package has been imported, to know whether the loaded modules can be
+# reused on the next launch
+LOADED_SOURCE_STAMP = get_source_stamp()
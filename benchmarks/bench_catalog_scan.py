@@ -0,0 +1,152 @@
+"""
+Benchmark of the abc catalog scan on a synthetic shot tree.
+
+Compares the former nested os.listdir walk of ABCImport.__retrieve_assets with ABCCatalogScanner,
+without and with a warm ABCCatalogCache, and reports the wall-clock time and the number of
+filesystem calls of each.
+
+Usage : python benchmarks/bench_catalog_scan.py [nb_chars] [nb_versions] [nb_fur_frames]
+"""
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ABCCatalog import ABCCatalogScanner, ABCCatalogCache
+from synthetic import generate_tree, age_tree
+
+
+def legacy_scan(folder_path, is_anim_folder):
+    """
+    Former implementation of ABCImport.__retrieve_assets
+    :param folder_path
+    :param is_anim_folder
+    :return: list of (name, versions)
+    """
+    result = []
+    folder_path = folder_path.replace("\\", "/")
+    if not os.path.isdir(folder_path): return result
+    for asset_folder in os.listdir(folder_path):
+        asset_folder_path = os.path.join(folder_path, asset_folder)
+        anim_versions = []
+        if not os.path.isdir(asset_folder_path) or asset_folder[0:2] != "ch": continue
+        for version_folder in os.listdir(asset_folder_path):
+            version_folder_path = os.path.join(asset_folder_path, version_folder)
+            if not os.path.isdir(version_folder_path): continue
+            for abc in os.listdir(version_folder_path):
+                add = False
+                if is_anim_folder:
+                    if asset_folder + ".abc" == abc:
+                        add = True
+                else:
+                    if re.match(r"" + asset_folder + r"_fur(?:\.[0-9]+)?\.abc", abc):
+                        add = True
+                if add:
+                    anim_versions.append(version_folder_path)
+                    break
+        if len(anim_versions) < 1: continue
+        result.append((asset_folder, anim_versions))
+    return result
+
+
+class SyscallCounter:
+    """
+    Count the calls to the os functions hitting the filesystem
+    """
+    _FUNCTIONS = ["listdir", "scandir", "stat"]
+
+    def __init__(self):
+        self.counts = dict.fromkeys(SyscallCounter._FUNCTIONS, 0)
+        self.__originals = {}
+
+    def __wrap(self, func_name):
+        original = self.__originals[func_name]
+
+        def wrapper(*args, **kwargs):
+            self.counts[func_name] += 1
+            return original(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        for func_name in SyscallCounter._FUNCTIONS:
+            self.__originals[func_name] = getattr(os, func_name)
+            setattr(os, func_name, self.__wrap(func_name))
+        return self
+
+    def __exit__(self, *args):
+        for func_name, original in self.__originals.items():
+            setattr(os, func_name, original)
+
+
+def measure(func, root, repeat=5):
+    """
+    Measure a scan function on the abc and abc_fur folders
+    :param func
+    :param root
+    :param repeat
+    :return: best time, syscall counts, result
+    """
+    with SyscallCounter() as counter:
+        result = [func(os.path.join(root, "abc"), True), func(os.path.join(root, "abc_fur"), False)]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(os.path.join(root, "abc"), True)
+        func(os.path.join(root, "abc_fur"), False)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, counter.counts, result
+
+
+def main():
+    nb_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    nb_versions = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    nb_fur_frames = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    root = tempfile.mkdtemp(prefix="abc_import_bench_")
+    try:
+        generate_tree(os.path.join(root, "shot"), nb_chars, nb_versions, nb_fur_frames)
+        # Age the tree so that the cache trusts the mtimes of the folders
+        age_tree(os.path.join(root, "shot"))
+        shot_root = os.path.join(root, "shot")
+        scanner = ABCCatalogScanner()
+        cached_scanner = ABCCatalogScanner(ABCCatalogCache(os.path.join(root, "cache")))
+
+        def scanner_scan(folder_path, is_anim_folder):
+            return [(e.get_name(), [v.get_path() for v in e.get_versions()]) for e in scanner.scan(folder_path, is_anim_folder)]
+
+        def cached_scanner_scan(folder_path, is_anim_folder):
+            return [(e.get_name(), [v.get_path() for v in e.get_versions()])
+                    for e in cached_scanner.scan(folder_path, is_anim_folder)]
+
+        legacy_time, legacy_counts, legacy_result = measure(legacy_scan, shot_root)
+        scanner_time, scanner_counts, scanner_result = measure(scanner_scan, shot_root)
+        # Warm up the cache before measuring
+        cached_scanner_scan(os.path.join(shot_root, "abc"), True)
+        cached_scanner_scan(os.path.join(shot_root, "abc_fur"), False)
+        cached_time, cached_counts, cached_result = measure(cached_scanner_scan, shot_root)
+
+        def normalize(result):
+            return [sorted((name, sorted(versions)) for name, versions in assets) for assets in result]
+
+        assert normalize(legacy_result) == normalize(scanner_result), "Scanners disagree"
+        assert normalize(legacy_result) == normalize(cached_result), "Cached scanner disagrees"
+
+        print("Tree : %d chars x %d versions x %d fur frames" % (nb_chars, nb_versions, nb_fur_frames))
+        print("%-10s %10s %10s %10s %10s" % ("", "time (ms)", "listdir", "scandir", "stat"))
+        for label, elapsed, counts in [("legacy", legacy_time, legacy_counts),
+                                       ("scanner", scanner_time, scanner_counts),
+                                       ("cached", cached_time, cached_counts)]:
+            print("%-10s %10.2f %10d %10d %10d" % (label, elapsed * 1000, counts["listdir"],
+                                                   counts["scandir"], counts["stat"]))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark of the icons of the abc table with 500 rows.
+
+"before" decodes the state and look icons from the assets folder for every row, like the former
+ABCImport.__refresh_table did. "after" queries the icons of every row through ABCImportTableModel and
+the process-wide ABCIconCache.
+
+Requires PySide2. Maya, look_loader and common are replaced by the stub modules of stubs.py.
+
+Usage : python benchmarks/bench_icon_cache.py [nb_rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import load_package
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    nb_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide2.QtGui import QPixmap
+    from PySide2.QtWidgets import QApplication
+    from PySide2.QtCore import Qt
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    load_package()
+    from abc_import.ABCImportAsset import ABCImportAnim, ABCImportFur, ABCState
+    from abc_import.ABCImportModel import ABCImportTableModel, ABCIconCache
+    from abc_import.ABCCatalog import ABCVersion
+
+    class BenchAnim(ABCImportAnim):
+        def is_look_up_to_date(self):
+            return False
+
+    class BenchFur(ABCImportFur):
+        def is_look_up_to_date(self):
+            return False
+
+    abcs = []
+    for index in range(nb_rows):
+        asset_class = BenchAnim if index % 2 == 0 else BenchFur
+        abc = asset_class("chChar%03d_01" % index, "", None,
+                          [ABCVersion.from_path("/abc/chChar/0002"), ABCVersion.from_path("/abc/chChar/0001")])
+        abc.set_actual_version(["/abc/chChar/0001", "/abc/chChar/0002", None][index % 3])
+        abcs.append(abc)
+
+    asset_dir = os.path.join(_ROOT_DIR, "assets") + "/"
+
+    start = time.perf_counter()
+    for abc in abcs:
+        state = abc.get_state()
+        QPixmap(asset_dir + abc.get_icon_filename(state))
+        if state != ABCState.New and not abc.is_look_up_to_date():
+            QPixmap(asset_dir + abc.get_icon_filename(state))
+            QPixmap(asset_dir + "look.png")
+    before = time.perf_counter() - start
+
+    model = ABCImportTableModel()
+    for abc in abcs:
+        model.append_abc(abc)
+    ABCIconCache.clear()
+    timings = []
+    for _ in range(2):
+        model.refresh_abcs()
+        start = time.perf_counter()
+        for row in range(model.rowCount()):
+            model.data(model.index(row, ABCImportTableModel.STATE_COLUMN), Qt.DecorationRole)
+            model.data(model.index(row, ABCImportTableModel.LOOK_COLUMN), Qt.DecorationRole)
+        timings.append(time.perf_counter() - start)
+
+    print("%d rows" % nb_rows)
+    print("%-22s %10.2f ms" % ("before (decode)", before * 1000))
+    print("%-22s %10.2f ms" % ("after (cold cache)", timings[0] * 1000))
+    print("%-22s %10.2f ms" % ("after (warm cache)", timings[1] * 1000))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of the discovery from the manifests of the abc folders on a synthetic shot tree with many fur frames.
+
+Compares the scan of the tree with the read of the manifests written back after a scan, reports the wall-clock time
+and the number of filesystem calls of each, then checks that a version added after the manifest makes the scanner
+fall back to the scan.
+
+Usage : python benchmarks/bench_manifest.py [nb_chars] [nb_versions] [nb_fur_frames]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ABCCatalog import ABCCatalogScanner, ABCManifest
+from bench_catalog_scan import SyscallCounter, measure
+from synthetic import generate_tree, age_tree, get_asset_name
+
+
+def main():
+    nb_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    nb_versions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    nb_fur_frames = int(sys.argv[3]) if len(sys.argv) > 3 else 250
+    root = tempfile.mkdtemp(prefix="abc_import_bench_")
+    try:
+        shot_root = os.path.join(root, "shot")
+        generate_tree(shot_root, nb_chars, nb_versions, nb_fur_frames)
+        # Age the tree so that the mtimes of the folders are trusted in the manifests
+        age_tree(shot_root)
+        scanner = ABCCatalogScanner(use_manifests=False)
+        manifest_scanner = ABCCatalogScanner()
+
+        def to_result(entries):
+            return [(e.get_name(), [(v.get_path(), v.get_sequence().to_record() if v.get_sequence() else None)
+                                    for v in e.get_versions()]) for e in entries]
+
+        def scanner_scan(folder_path, is_anim_folder):
+            return to_result(scanner.scan(folder_path, is_anim_folder))
+
+        def manifest_scan(folder_path, is_anim_folder):
+            return to_result(manifest_scanner.scan(folder_path, is_anim_folder))
+
+        scan_time, scan_counts, scan_result = measure(scanner_scan, shot_root)
+        writer = ABCCatalogScanner(write_manifests=True)
+        for folder_name, is_anim_folder in [("abc", True), ("abc_fur", False)]:
+            writer.scan(os.path.join(shot_root, folder_name), is_anim_folder)
+            assert os.path.isfile(ABCManifest.get_filepath(os.path.join(shot_root, folder_name))), \
+                "Manifest not written"
+        manifest_time, manifest_counts, manifest_result = measure(manifest_scan, shot_root)
+        assert scan_result == manifest_result, "The manifests disagree with the scan"
+
+        print("Tree : %d chars x %d versions x %d fur frames" % (nb_chars, nb_versions, nb_fur_frames))
+        print("%-10s %10s %10s %10s %10s" % ("", "time (ms)", "listdir", "scandir", "stat"))
+        for label, elapsed, counts in [("scan", scan_time, scan_counts),
+                                       ("manifest", manifest_time, manifest_counts)]:
+            print("%-10s %10.2f %10d %10d %10d" % (label, elapsed * 1000, counts["listdir"],
+                                                   counts["scandir"], counts["stat"]))
+
+        # A new version modifies its asset folder so the manifest is not trusted anymore
+        asset_name = get_asset_name(0)
+        new_version_path = os.path.join(shot_root, "abc_fur", asset_name, "9999")
+        os.makedirs(new_version_path)
+        open(os.path.join(new_version_path, asset_name + "_fur.abc"), "w").close()
+        with SyscallCounter() as counter:
+            entries = manifest_scanner.scan(os.path.join(shot_root, "abc_fur"), False)
+        versions = [v.get_name() for e in entries if e.get_name() == asset_name for v in e.get_versions()]
+        assert "9999" in versions, "The scanner did not fall back to the scan"
+        print("Fallback after a new version : %d scandir" % counter.counts["scandir"])
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of the parallel abc catalog scan on a filesystem with a simulated per-call latency.
+
+Every os.scandir and os.stat call sleeps for the given latency, like a round-trip to a network storage,
+and the scan is timed from 1 to 16 workers.
+
+Usage : python benchmarks/bench_parallel_scan.py [latency_ms] [nb_chars] [nb_versions]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ABCCatalog import ABCCatalogScanner
+from synthetic import generate_tree
+
+
+class SimulatedLatency:
+    """
+    Add a latency to the os functions hitting the filesystem
+    """
+    _FUNCTIONS = ["scandir", "stat"]
+
+    def __init__(self, latency):
+        self.__latency = latency
+        self.__originals = {}
+
+    def __wrap(self, func_name):
+        original = self.__originals[func_name]
+        latency = self.__latency
+
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return original(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        for func_name in SimulatedLatency._FUNCTIONS:
+            self.__originals[func_name] = getattr(os, func_name)
+            setattr(os, func_name, self.__wrap(func_name))
+        return self
+
+    def __exit__(self, *args):
+        for func_name, original in self.__originals.items():
+            setattr(os, func_name, original)
+
+
+def main():
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.002
+    nb_chars = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    nb_versions = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    root = tempfile.mkdtemp(prefix="abc_import_bench_")
+    try:
+        generate_tree(root, nb_chars, nb_versions, 5)
+        print("Tree : %d chars x %d versions, latency %.1fms per call" % (nb_chars, nb_versions, latency * 1000))
+        print("%-10s %10s %10s" % ("workers", "time (ms)", "speedup"))
+        reference = None
+        reference_time = None
+        for max_workers in [1, 2, 4, 8, 16]:
+            scanner = ABCCatalogScanner(max_workers=max_workers)
+            with SimulatedLatency(latency):
+                start = time.perf_counter()
+                result = [[(e.get_name(), [v.get_path() for v in e.get_versions()])
+                           for e in scanner.scan(os.path.join(root, folder), is_anim)]
+                          for folder, is_anim in [("abc", True), ("abc_fur", False)]]
+                elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = result
+                reference_time = elapsed
+            assert result == reference, "Result differs with %d workers" % max_workers
+            print("%-10d %10.1f %9.1fx" % (max_workers, elapsed * 1000, reference_time / elapsed))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
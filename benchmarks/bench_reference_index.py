@@ -0,0 +1,98 @@
+"""
+Benchmark of the light rig lookup of a batch update with a stubbed reference list.
+
+"legacy" lists the references and matches every reference path with a fresh regex for each anim, like the
+former ABCImportAnim.import_update_abc did. "index" builds one ABCReferenceIndex for the whole batch.
+
+Usage : python benchmarks/bench_reference_index.py [nb_references] [nb_anims]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ABCReferenceIndex import ABCReferenceIndex
+
+
+class StubReference:
+    """
+    Stub of a pymel FileReference
+    """
+
+    def __init__(self, path):
+        self.__path = path
+
+    def unresolvedPath(self):
+        return self.__path
+
+    def isLoaded(self):
+        return True
+
+    def replaceWith(self, path):
+        self.__path = path
+
+
+def generate_references(nb_references, nb_anims):
+    """
+    Generate a reference list with one light rig per anim and other references
+    :param nb_references
+    :param nb_anims
+    :return: references
+    """
+    references = [StubReference("/shot/abc/chChar%03d_01/0001/chChar%03d_01_light.ma" % (index, index))
+                  for index in range(nb_anims)]
+    references += [StubReference("/lib/set/setPiece%04d.ma" % index) for index in range(nb_references - nb_anims)]
+    return references
+
+
+def legacy_update(references, names):
+    """
+    Former lookup : list the references and match all of them for each anim
+    :param references
+    :param names
+    :return:
+    """
+    for name in names:
+        light_filepath = "/shot/abc/" + name + "/0002/" + name + "_light.ma"
+        for ref in list(references):
+            match = re.match(r".*[\\/]" + name + r"_light\.m[ab]", ref.unresolvedPath())
+            if match:
+                ref.replaceWith(light_filepath)
+                break
+
+
+def index_update(references, names):
+    """
+    Lookup with one reference index for the batch
+    :param references
+    :param names
+    :return:
+    """
+    reference_index = ABCReferenceIndex(lambda: list(references), lambda path, **kwargs: StubReference(path))
+    reference_index.build()
+    for name in names:
+        reference_index.update_or_create(name, "/shot/abc/" + name + "/0002/" + name + "_light.ma")
+
+
+def main():
+    nb_references = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    nb_anims = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    names = ["chChar%03d_01" % index for index in range(nb_anims)]
+    print("%d references, %d anims updated" % (nb_references, nb_anims))
+    for label, func in [("legacy", legacy_update), ("index", index_update)]:
+        best = None
+        for _ in range(5):
+            # Reversed so that the light rigs are at the end of the list like in a lit scene
+            references = list(reversed(generate_references(nb_references, nb_anims)))
+            re.purge()
+            start = time.perf_counter()
+            func(references, names)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print("%-10s %10.3f ms" % (label, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
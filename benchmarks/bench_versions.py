@@ -0,0 +1,79 @@
+"""
+Benchmark of the version records with 100k versions.
+
+"legacy" keeps the version paths as strings sorted as strings and parses the last one with int(os.path.basename(...))
+at each state computation, like ABCImportAsset did. "records" keeps ABCVersion objects parsed once at discovery and
+compares the version numbers.
+
+Usage : python benchmarks/bench_versions.py [nb_versions] [nb_versions_per_asset]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ABCCatalog import ABCVersion
+
+
+def generate_paths(nb_versions, nb_versions_per_asset):
+    """
+    Generate the version folder paths of the assets, as listed by the discovery
+    :param nb_versions
+    :param nb_versions_per_asset
+    :return: list of (asset folder path, version names)
+    """
+    assets = []
+    for asset_index in range(nb_versions // nb_versions_per_asset):
+        asset_folder_path = "/prod/shots/sq0010/sh0010/abc/chChar%05d_01" % asset_index
+        assets.append((asset_folder_path, ["%04d" % version for version in range(1, nb_versions_per_asset + 1)]))
+    return assets
+
+
+def legacy(assets, nb_refreshes):
+    versions = [sorted([os.path.join(path, name) for name in names], reverse=True) for path, names in assets]
+    start = time.perf_counter()
+    for _ in range(nb_refreshes):
+        for asset_versions in versions:
+            int(os.path.basename(asset_versions[-1])) < int(os.path.basename(asset_versions[0]))
+    return versions, time.perf_counter() - start
+
+
+def records(assets, nb_refreshes):
+    versions = [sorted([ABCVersion(path, name) for name in names], reverse=True) for path, names in assets]
+    last_numbers = [asset_versions[0].get_number() for asset_versions in versions]
+    actual_numbers = [asset_versions[-1].get_number() for asset_versions in versions]
+    start = time.perf_counter()
+    for _ in range(nb_refreshes):
+        for actual_number, last_number in zip(actual_numbers, last_numbers):
+            actual_number < last_number
+    return versions, time.perf_counter() - start
+
+
+def main():
+    nb_versions = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nb_versions_per_asset = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    nb_refreshes = 10
+    assets = generate_paths(nb_versions, nb_versions_per_asset)
+    print("%d versions, %d per asset, state computed %d times" % (nb_versions, nb_versions_per_asset, nb_refreshes))
+    print("%-10s %12s %12s %14s" % ("", "build (ms)", "memory (MB)", "states (ms)"))
+    for label, func in [("legacy", legacy), ("records", records)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        versions, states_duration = func(assets, nb_refreshes)
+        build_duration = time.perf_counter() - start - states_duration
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("%-10s %12.1f %12.1f %14.1f" % (label, build_duration * 1000, memory / 2 ** 20, states_duration * 1000))
+        del versions
+
+    # Numeric order once the version numbers pass 9999
+    names = ["9998", "9999", "10000"]
+    print("string order  : " + str(sorted(names, reverse=True)))
+    print("numeric order : " + str([version.get_name() for version in
+                                    sorted([ABCVersion("/abc/chA_01", name) for name in names], reverse=True)]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Benchmark suite of the tool, run headlessly with the stubs of Maya, look_loader and common.
+
+For each scale, a synthetic shot tree and a stub scene are generated, then are timed :
+- the discovery (catalog scan without cache, with a cold cache and with a warm cache)
+- the scene indexing (ABCSceneIndex through the maya.cmds stub) and the reference index
+- the population of the table model (skipped if PySide2 is not available)
+- the batch import of all the assets into an empty scene, then their batch update
+
+The results are written as JSON so that they can be compared between releases.
+
+Usage : python benchmarks/run_benchmarks.py [--scales small,medium,large] [--output results.json] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stubs
+from synthetic import generate_tree, age_tree, get_asset_name
+
+_RESULTS_FORMAT_VERSION = 1
+
+# name -> (nb chars, nb versions, nb fur frames, nb extra stand-ins, nb extra references)
+SCALES = {
+    "small": (10, 5, 20, 20, 20),
+    "medium": (40, 20, 100, 200, 100),
+    "large": (150, 30, 250, 1000, 400),
+}
+
+
+def best_time(func, repeat, setup=None):
+    """
+    Best wall-clock time of a function
+    :param func
+    :param repeat
+    :param setup : function called before each run, not timed
+    :return: best time in ms
+    """
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def fill_scene(nb_chars, nb_extra_standins, nb_extra_references, project_dir):
+    """
+    Fill the stub scene with the anims of the characters at their first version, unrelated stand-ins and
+    unrelated references
+    :param nb_chars
+    :param nb_extra_standins
+    :param nb_extra_references
+    :param project_dir
+    :return:
+    """
+    stubs.scene.clear()
+    for char_index in range(nb_chars):
+        name = get_asset_name(char_index)
+        stubs.scene.create_standin(name + "Shape", name, "/uvs/" + name + "_uv.abc",
+                                   project_dir + "/abc/" + name + "/0001/" + name + ".abc")
+        stubs.scene.add_reference(project_dir + "/abc/" + name + "/0001/" + name + "_light.ma")
+    for index in range(nb_extra_standins):
+        stubs.scene.create_standin("propShape%d" % index, "prop%d" % index, "/lib/props/prop%d.ass" % index)
+    for index in range(nb_extra_references):
+        stubs.scene.add_reference("/lib/sets/set%04d.ma" % index)
+
+
+def bench_discovery(pkg, root, repeat):
+    """
+    Time the discovery of the shot tree
+    :param pkg : abc_import package
+    :param root
+    :param repeat
+    :return: timings, counts, entries
+    """
+    ABCCatalog = pkg.ABCCatalog
+    folders = [(os.path.join(root, "abc"), True), (os.path.join(root, "abc_fur"), False)]
+    cache_dir = os.path.join(root, "catalog_cache")
+
+    def scan(scanner):
+        return [entry for folder, is_anim in folders for entry in scanner.scan(folder, is_anim)]
+
+    timings = {
+        "discovery_no_cache": best_time(lambda: scan(ABCCatalog.ABCCatalogScanner()), repeat),
+        "discovery_cold_cache": best_time(lambda: scan(ABCCatalog.ABCCatalogScanner(
+            ABCCatalog.ABCCatalogCache(cache_dir))), repeat, lambda: shutil.rmtree(cache_dir, ignore_errors=True)),
+    }
+    warm_scanner = ABCCatalog.ABCCatalogScanner(ABCCatalog.ABCCatalogCache(cache_dir))
+    entries = scan(warm_scanner)
+    timings["discovery_warm_cache"] = best_time(lambda: scan(warm_scanner), repeat)
+    counts = {"entries": len(entries), "versions": sum(len(entry.get_versions()) for entry in entries)}
+    return timings, counts, entries
+
+
+def bench_scene(pkg, nb_chars, repeat):
+    """
+    Time the indexing of the stub scene
+    :param pkg : abc_import package
+    :param nb_chars
+    :param repeat
+    :return: timings, counts
+    """
+    scene_index = pkg.ABCSceneIndex.ABCSceneIndex()
+    reference_index = pkg.ABCReferenceIndex.ABCReferenceIndex()
+    timings = {
+        "scene_index_build": best_time(scene_index.build, repeat),
+        "reference_index_build": best_time(reference_index.build, repeat),
+    }
+    standins = scene_index.get_standins()
+    timings["scene_index_update_10pct"] = best_time(
+        lambda: [scene_index.update_standin(standin) for standin in standins[:max(1, len(standins) // 10)]], repeat)
+    counts = {"standins": len(standins), "assets_in_scene": len(scene_index.get_assets()),
+              "light_rigs": len(reference_index.get_references())}
+    assert len(scene_index.get_assets()) == nb_chars, "The anims of the scene are not all indexed"
+    return timings, counts
+
+
+def create_assets(pkg, entries, project_dir):
+    """
+    Create the assets of the discovered entries
+    :param pkg : abc_import package
+    :param entries
+    :param project_dir
+    :return: assets
+    """
+    ABCImportAsset = pkg.ABCImportAsset
+    look_factory = stubs.StubLookFactory(project_dir)
+    return [(ABCImportAsset.ABCImportAnim if entry.is_anim() else ABCImportAsset.ABCImportFur)(
+        entry.get_name(), project_dir, look_factory, entry.get_versions()) for entry in entries]
+
+
+def bench_model(pkg, assets, repeat):
+    """
+    Time the population of the table model and the query of all its cells
+    :param pkg : abc_import package
+    :param assets
+    :param repeat
+    :return: timings or None if PySide2 is not available
+    """
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide2.QtCore import Qt
+        from PySide2.QtWidgets import QApplication
+    except ImportError:
+        return None
+    app = QApplication.instance() or QApplication(sys.argv)
+    ABCImportModel = pkg.ABCImportModel
+    model = ABCImportModel.ABCImportTableModel()
+
+    def populate():
+        model.clear()
+        for asset in assets:
+            model.append_abc(asset)
+
+    def query():
+        for row in range(model.rowCount()):
+            for column in range(model.columnCount()):
+                index = model.index(row, column)
+                for role in [Qt.DisplayRole, Qt.DecorationRole, Qt.ToolTipRole]:
+                    model.data(index, role)
+
+    timings = {"model_populate": best_time(populate, repeat), "model_query_all": best_time(query, repeat)}
+    model.stop_look_status_evaluation()
+    app.processEvents()
+    return timings
+
+
+def bench_batch(pkg, assets, repeat):
+    """
+    Time the batch import of all the assets into an empty scene then their batch update
+    :param pkg : abc_import package
+    :param assets
+    :param repeat
+    :return: timings, counts
+    """
+    ABCImportBatch = pkg.ABCImportBatch
+    ABCLookCache = pkg.ABCLookCache
+    reports = []
+
+    def setup():
+        stubs.scene.clear()
+        ABCLookCache.ABCLookCache.clear()
+        ABCLookCache.ABCUVCache.clear()
+        for asset in assets:
+            asset.set_actual_standins([])
+            asset.set_actual_version(None)
+
+    def run():
+        reports.append(ABCImportBatch.ABCImportBatch(assets, True).run())
+
+    timings = {"batch_import": best_time(run, repeat, setup)}
+    errors = reports[-1].get_errors()
+    assert len(errors) == 0, "Import errors : " + str(errors)
+    timings["batch_update"] = best_time(run, repeat)
+    counts = {"imported_standins": len(reports[0].get_standin_nodes())}
+    return timings, counts
+
+
+def get_git_revision():
+    """
+    Get the git revision of the repository
+    :return: revision or None
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(pkg, name, params, repeat):
+    """
+    Run all the benchmarks at a scale
+    :param pkg : abc_import package
+    :param name
+    :param params : (nb chars, nb versions, nb fur frames, nb extra stand-ins, nb extra references)
+    :param repeat
+    :return: result of the scale
+    """
+    nb_chars, nb_versions, nb_fur_frames, nb_extra_standins, nb_extra_references = params
+    root = tempfile.mkdtemp(prefix="abc_import_bench_")
+    try:
+        generate_tree(root, nb_chars, nb_versions, nb_fur_frames)
+        age_tree(root)
+        project_dir = root.replace("\\", "/")
+        timings, counts, entries = bench_discovery(pkg, root, repeat)
+
+        fill_scene(nb_chars, nb_extra_standins, nb_extra_references, project_dir)
+        scene_timings, scene_counts = bench_scene(pkg, nb_chars, repeat)
+        timings.update(scene_timings)
+        counts.update(scene_counts)
+
+        assets = create_assets(pkg, entries, project_dir)
+        model_timings = bench_model(pkg, assets, repeat)
+        if model_timings is not None:
+            timings.update(model_timings)
+        batch_timings, batch_counts = bench_batch(pkg, assets, repeat)
+        timings.update(batch_timings)
+        counts.update(batch_counts)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return {
+        "params": {"chars": nb_chars, "versions": nb_versions, "fur_frames": nb_fur_frames,
+                   "extra_standins": nb_extra_standins, "extra_references": nb_extra_references},
+        "timings_ms": timings,
+        "counts": counts,
+        "skipped": [] if model_timings is not None else ["model (PySide2 not available)"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite of abc_import")
+    parser.add_argument("--scales", default="small,medium", help="scales among " + ", ".join(SCALES.keys()))
+    parser.add_argument("--output", default=None, help="JSON result file (benchmarks/results/<date>.json by default)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark, the best one is kept")
+    args = parser.parse_args()
+
+    pkg = stubs.load_package()
+    for module_name in ["ABCCatalog", "ABCSceneIndex", "ABCReferenceIndex", "ABCImportAsset", "ABCImportBatch",
+                        "ABCLookCache"]:
+        __import__("abc_import." + module_name)
+
+    results = {
+        "format": _RESULTS_FORMAT_VERSION,
+        "date": datetime.now().isoformat(),
+        "git_revision": get_git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {},
+    }
+    for name in args.scales.split(","):
+        print("Scale %s %s" % (name, SCALES[name]))
+        results["scales"][name] = run_scale(pkg, name, SCALES[name], args.repeat)
+        for key, value in results["scales"][name]["timings_ms"].items():
+            print("    %-28s %10.2f ms" % (key, value))
+        for skipped in results["scales"][name]["skipped"]:
+            print("    skipped : " + skipped)
+
+    output = args.output
+    if output is None:
+        output = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                              datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print("Results written in " + output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+"""
+In-process stubs of pymel.core, maya.cmds, look_loader and common so that the tool can be benchmarked outside of Maya.
+
+The stubs of pymel.core and maya.cmds work on a StubScene holding stand-ins and references. The look_loader stubs can
+simulate the latency of the look library with LATENCIES.
+"""
+import importlib.util
+import os
+import sys
+import time
+import types
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Simulated latency (in s) of the look library calls
+LATENCIES = {
+    "get_uvs": 0.0,
+    "look_status": 0.0,
+    "update_looks": 0.0,
+}
+
+# Attributes of a stand-in
+_STANDIN_ATTRIBUTES = ["dso", "abc_layers", "mode", "abcFPS", "useFrameExtension"]
+
+
+# ######################################################################################################################
+
+
+class StubAttribute:
+    """
+    Attribute of a StubNode
+    """
+
+    def __init__(self, node, name):
+        self.__node = node
+        self.__name = name
+
+    def get(self):
+        return self.__node.get_values().get(self.__name)
+
+    def set(self, value):
+        self.__node.get_values()[self.__name] = value
+
+
+class StubNode:
+    """
+    Node of a StubScene, with the pymel.core.PyNode methods used by the tool
+    """
+
+    def __init__(self, name, node_type, parent=None):
+        self.__name = name
+        self.__node_type = node_type
+        self.__parent = parent
+        self.__values = {}
+
+    def get_values(self):
+        return self.__values
+
+    def get_parent(self):
+        return self.__parent
+
+    def set_name(self, name):
+        self.__name = name
+
+    def long_name(self):
+        return (self.__parent.long_name() if self.__parent is not None else "") + "|" + self.__name
+
+    def longName(self):
+        return self.long_name()
+
+    def name(self):
+        return self.__name
+
+    def nodeType(self):
+        return self.__node_type
+
+    def attr(self, name):
+        return StubAttribute(self, name)
+
+    def hasAttr(self, name):
+        return self.__node_type != "aiStandIn" or name in _STANDIN_ATTRIBUTES
+
+    def __str__(self):
+        return self.__name
+
+
+class StubReference:
+    """
+    Reference of a StubScene, with the pymel.core.FileReference methods used by the tool
+    """
+
+    def __init__(self, path, loaded=True):
+        self.__path = path
+        self.__loaded = loaded
+
+    def unresolvedPath(self):
+        return self.__path
+
+    def isLoaded(self):
+        return self.__loaded
+
+    def replaceWith(self, path, loadReferenceDepth="all", **kwargs):
+        self.__path = path
+        self.__loaded = loadReferenceDepth != "none"
+
+    def load(self, **kwargs):
+        self.__loaded = True
+
+
+class StubScene:
+    """
+    Scene holding stand-ins and references
+    """
+
+    def __init__(self):
+        self.__nodes = []
+        # long and short name -> node
+        self.__nodes_by_name = {}
+        self.__references = []
+
+    def get_nodes(self):
+        return self.__nodes
+
+    def get_references(self):
+        return self.__references
+
+    def create_standin(self, shape_name, transform_name=None, dso=None, abc_layers=None):
+        """
+        Create a stand-in under a new transform
+        :param shape_name
+        :param transform_name
+        :param dso
+        :param abc_layers
+        :return: shape node
+        """
+        transform = StubNode(transform_name if transform_name is not None else "transform%d" % len(self.__nodes),
+                             "transform")
+        shape = StubNode(shape_name, "aiStandIn", transform)
+        shape.get_values().update({"dso": dso, "abc_layers": abc_layers, "mode": 0, "abcFPS": 24,
+                                   "useFrameExtension": False})
+        self.__nodes.extend([transform, shape])
+        self.__index_node(transform)
+        self.__index_node(shape)
+        return shape
+
+    def rename_node(self, node, name):
+        """
+        Rename a node
+        :param node
+        :param name
+        :return:
+        """
+        renamed_nodes = [node] + [child for child in self.__nodes if child.get_parent() is node]
+        for renamed_node in renamed_nodes:
+            self.__nodes_by_name.pop(renamed_node.name(), None)
+            self.__nodes_by_name.pop(renamed_node.long_name(), None)
+        node.set_name(name)
+        for renamed_node in renamed_nodes:
+            self.__index_node(renamed_node)
+
+    def __index_node(self, node):
+        """
+        Index a node by its long and short names
+        :param node
+        :return:
+        """
+        self.__nodes_by_name[node.name()] = node
+        self.__nodes_by_name[node.long_name()] = node
+
+    def add_reference(self, path, loaded=True):
+        """
+        Add a reference
+        :param path
+        :param loaded
+        :return: reference
+        """
+        reference = StubReference(path, loaded)
+        self.__references.append(reference)
+        return reference
+
+    def find_node(self, name):
+        """
+        Find a node by long or short name
+        :param name
+        :return: node
+        """
+        node = self.__nodes_by_name.get(name)
+        if node is None:
+            raise ValueError("No object matches name: " + name)
+        return node
+
+    def clear(self):
+        self.__nodes = []
+        self.__nodes_by_name = {}
+        self.__references = []
+
+
+# The scene the stubs work on
+scene = StubScene()
+
+
+# ######################################################################################################################
+
+
+def _make_pymel_core():
+    """
+    Create the stub of pymel.core
+    :return: module
+    """
+    module = types.ModuleType("pymel.core")
+
+    def PyNode(node):
+        return node if isinstance(node, StubNode) else scene.find_node(str(node))
+
+    def listRelatives(node, parent=False, **kwargs):
+        node = PyNode(node)
+        return [node.get_parent()] if parent and node.get_parent() is not None else []
+
+    def createNode(node_type, n=None, **kwargs):
+        return scene.create_standin(n)
+
+    def rename(node, name):
+        scene.rename_node(node, name)
+        return node
+
+    def createReference(path, loadReferenceDepth="all", **kwargs):
+        return scene.add_reference(path, loadReferenceDepth != "none")
+
+    module.PyNode = PyNode
+    module.listRelatives = listRelatives
+    module.createNode = createNode
+    module.rename = rename
+    module.listReferences = lambda **kwargs: list(scene.get_references())
+    module.createReference = createReference
+    module.select = lambda *args, **kwargs: None
+    module.undoInfo = lambda **kwargs: None
+    module.refresh = lambda **kwargs: None
+    module.currentUnit = lambda **kwargs: "film"
+    module.sceneName = lambda: ""
+    return module
+
+
+def _make_maya_cmds():
+    """
+    Create the stub of maya.cmds
+    :return: module
+    """
+    module = types.ModuleType("maya.cmds")
+
+    def ls(type=None, long=False, **kwargs):
+        return [node.long_name() if long else node.name() for node in scene.get_nodes()
+                if type is None or node.nodeType() == type]
+
+    def getAttr(plug):
+        node_name, attr = plug.rsplit(".", 1)
+        node = scene.find_node(node_name)
+        if not node.hasAttr(attr):
+            raise ValueError("No object matches name: " + plug)
+        return node.get_values().get(attr)
+
+    module.ls = ls
+    module.getAttr = getAttr
+    return module
+
+
+class StubLook:
+    """
+    Look of a stand-in generated by the stub LookFactory
+    """
+
+    def __init__(self, standin):
+        self.__standin = standin
+
+    def is_looks_up_to_date(self):
+        time.sleep(LATENCIES["look_status"])
+        return True
+
+    def is_uv_up_to_date(self):
+        return True
+
+    def update_existent_looks(self):
+        time.sleep(LATENCIES["update_looks"])
+
+
+class StubLookFactory:
+    """
+    Stub of look_loader.LookFactory.LookFactory
+    """
+
+    def __init__(self, current_project_dir):
+        self.__current_project_dir = current_project_dir
+
+    def generate(self, standin):
+        return StubLook(standin)
+
+
+class StubLookAsset:
+    """
+    Stub of look_loader.LookStandin.LookAsset
+    """
+
+    @staticmethod
+    def get_uvs(char_name, current_project_dir):
+        time.sleep(LATENCIES["get_uvs"])
+        uv_dir = os.path.join(current_project_dir, "assets", char_name, "uvs")
+        return [("0002", os.path.join(uv_dir, "0002", char_name + "_uv.abc")),
+                ("0001", os.path.join(uv_dir, "0001", char_name + "_uv.abc"))]
+
+
+class StubPrefs(dict):
+    """
+    Stub of common.Prefs.Prefs
+    """
+
+    def __init__(self, name=None):
+        super(StubPrefs, self).__init__()
+
+
+def install():
+    """
+    Install the stub modules in sys.modules. The modules already installed are kept.
+    :return:
+    """
+    stubs = {
+        "pymel": types.ModuleType("pymel"),
+        "pymel.core": _make_pymel_core(),
+        "maya": types.ModuleType("maya"),
+        "maya.cmds": _make_maya_cmds(),
+        "look_loader": types.ModuleType("look_loader"),
+        "look_loader.LookFactory": types.ModuleType("look_loader.LookFactory"),
+        "look_loader.LookStandin": types.ModuleType("look_loader.LookStandin"),
+        "common": types.ModuleType("common"),
+        "common.utils": types.ModuleType("common.utils"),
+        "common.Prefs": types.ModuleType("common.Prefs"),
+    }
+    stubs["pymel"].core = stubs["pymel.core"]
+    stubs["maya"].cmds = stubs["maya.cmds"]
+    stubs["look_loader.LookFactory"].LookFactory = StubLookFactory
+    stubs["look_loader.LookStandin"].LookAsset = StubLookAsset
+    stubs["common.utils"].print_warning = lambda message, char_filler="-": print(message)
+    stubs["common.utils"].unload_packages = lambda silent=True, package=None: None
+    stubs["common.Prefs"].Prefs = StubPrefs
+    for name, module in stubs.items():
+        sys.modules.setdefault(name, module)
+
+
+def load_package():
+    """
+    Install the stubs and load the repository as the abc_import package
+    :return: abc_import package
+    """
+    install()
+    if "abc_import" in sys.modules:
+        return sys.modules["abc_import"]
+    spec = importlib.util.spec_from_file_location("abc_import", os.path.join(_ROOT_DIR, "__init__.py"),
+                                                  submodule_search_locations=[_ROOT_DIR])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["abc_import"] = package
+    spec.loader.exec_module(package)
+    return package
@@ -0,0 +1,50 @@
+"""
+Generator of synthetic abc/abc_fur shot trees for the benchmarks.
+"""
+import os
+import time
+
+
+def get_asset_name(char_index):
+    """
+    Get the name of the asset of a character
+    :param char_index
+    :return: asset name
+    """
+    return "chChar%03d_01" % char_index
+
+
+def generate_tree(root, nb_chars, nb_versions, nb_fur_frames, with_light_rigs=True):
+    """
+    Generate a synthetic abc/abc_fur shot tree
+    :param root
+    :param nb_chars
+    :param nb_versions
+    :param nb_fur_frames
+    :param with_light_rigs : whether the anim versions contain a light rig
+    :return:
+    """
+    for char_index in range(nb_chars):
+        name = get_asset_name(char_index)
+        for version in range(1, nb_versions + 1):
+            anim_dir = os.path.join(root, "abc", name, "%04d" % version)
+            os.makedirs(anim_dir)
+            filenames = [name + ".abc"] + ([name + "_light.ma"] if with_light_rigs else [])
+            for filename in filenames:
+                open(os.path.join(anim_dir, filename), "w").close()
+            fur_dir = os.path.join(root, "abc_fur", name, "%04d" % version)
+            os.makedirs(fur_dir)
+            for frame in range(1, nb_fur_frames + 1):
+                open(os.path.join(fur_dir, "%s_fur.%04d.abc" % (name, frame)), "w").close()
+
+
+def age_tree(root, age=3600):
+    """
+    Set the mtime of all the folders of a tree in the past so that the catalog cache trusts them
+    :param root
+    :param age : in seconds
+    :return:
+    """
+    old_time = time.time() - age
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (old_time, old_time))
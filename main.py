@@ -1,12 +1,23 @@
 import importlib
-from common import utils
+import sys
+import time
 
-utils.unload_packages(silent=True, package="abc_import")
-importlib.import_module("abc_import")
+launch_time = time.perf_counter()
+
+# The loaded modules are reused if none of them has been modified since they have been imported
+package = sys.modules.get("abc_import")
+if package is None or not hasattr(package, "get_source_stamp") or \
+        package.get_source_stamp() != package.LOADED_SOURCE_STAMP:
+    from common import utils
+
+    utils.unload_packages(silent=True, package="abc_import")
+    importlib.import_module("abc_import")
 from abc_import.ABCImport import ABCImport
+
+import_duration = time.perf_counter() - launch_time
 try:
     abc_import.close()
 except:
     pass
-abc_import = ABCImport()
+abc_import = ABCImport(launch_time=launch_time, import_duration=import_duration)
 abc_import.show()
@@ -0,0 +1,170 @@
+"""
+Tests of the catalog scanner, of its cache and of the manifests, run outside of Maya.
+
+Usage : python -m pytest tests (or python -m unittest discover tests)
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from ABCCatalog import ABCCatalogScanner, ABCCatalogCache, ABCManifest, ABCVersion
+from synthetic import generate_tree, age_tree, get_asset_name
+
+
+class FailingScandir:
+    """
+    Make os.scandir fail once on a folder
+    """
+
+    def __init__(self, path):
+        self.__path = os.path.normpath(path)
+        self.__original = None
+
+    def __scandir(self, path="."):
+        if self.__path is not None and os.path.normpath(path) == self.__path:
+            self.__path = None
+            raise PermissionError("Permission denied: " + path)
+        return self.__original(path)
+
+    def __enter__(self):
+        self.__original = os.scandir
+        os.scandir = self.__scandir
+        return self
+
+    def __exit__(self, *args):
+        os.scandir = self.__original
+
+
+class TestVersion(unittest.TestCase):
+
+    def test_number_is_parsed(self):
+        self.assertEqual(ABCVersion.parse_number("0002"), 2)
+        self.assertEqual(ABCVersion.parse_number("10000"), 10000)
+        self.assertEqual(ABCVersion.parse_number("v0002"), -1)
+        self.assertEqual(ABCVersion.parse_number("latest"), -1)
+
+    def test_versions_are_ordered_by_number(self):
+        versions = [ABCVersion("asset", name) for name in ["9999", "latest", "10000", "0002"]]
+        self.assertLess(versions[0], versions[2])
+        self.assertFalse(versions[2] < versions[0])
+        self.assertLess(versions[1], versions[3])
+        self.assertEqual([version.get_name() for version in sorted(versions, reverse=True)],
+                         ["10000", "9999", "0002", "latest"])
+
+
+class TestCatalogCache(unittest.TestCase):
+
+    def setUp(self):
+        self.__root = tempfile.mkdtemp(prefix="abc_import_test_")
+        self.__shot_root = os.path.join(self.__root, "shot")
+        generate_tree(self.__shot_root, 3, 2, 2)
+        age_tree(self.__shot_root)
+        self.__cache_dir = os.path.join(self.__root, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.__root)
+
+    def __scan(self, folder_name, is_anim_folder, cache=True):
+        scanner = ABCCatalogScanner(ABCCatalogCache(self.__cache_dir) if cache else None, use_manifests=False)
+        return {entry.get_name(): [version.get_name() for version in entry.get_versions()]
+                for entry in scanner.scan(os.path.join(self.__shot_root, folder_name), is_anim_folder)}
+
+    def test_failed_asset_listing_is_not_cached(self):
+        expected = self.__scan("abc", True, cache=False)
+        with FailingScandir(os.path.join(self.__shot_root, "abc", get_asset_name(1))):
+            self.assertNotIn(get_asset_name(1), self.__scan("abc", True))
+        self.assertEqual(self.__scan("abc", True), expected)
+        self.assertEqual(self.__scan("abc", True), expected)
+
+    def test_failed_version_listing_is_not_cached(self):
+        expected = self.__scan("abc_fur", False, cache=False)
+        with FailingScandir(os.path.join(self.__shot_root, "abc_fur", get_asset_name(1), "0002")):
+            self.assertEqual(self.__scan("abc_fur", False)[get_asset_name(1)], ["0001"])
+        self.assertEqual(self.__scan("abc_fur", False), expected)
+        self.assertEqual(self.__scan("abc_fur", False), expected)
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.__root = tempfile.mkdtemp(prefix="abc_import_test_")
+        self.__shot_root = os.path.join(self.__root, "shot")
+        generate_tree(self.__shot_root, 3, 2, 2)
+        age_tree(self.__shot_root)
+        self.__fur_folder = os.path.join(self.__shot_root, "abc_fur")
+
+    def tearDown(self):
+        shutil.rmtree(self.__root)
+
+    def __scan(self, use_manifests=True, write_manifests=False):
+        scanner = ABCCatalogScanner(use_manifests=use_manifests, write_manifests=write_manifests)
+        return {entry.get_name(): [(version.get_name(), version.get_sequence().to_record())
+                                   for version in entry.get_versions()]
+                for entry in scanner.scan(self.__fur_folder, False)}
+
+    def test_manifest_is_read(self):
+        expected = self.__scan(use_manifests=False)
+        self.__scan(write_manifests=True)
+        self.assertTrue(os.path.isfile(ABCManifest.get_filepath(self.__fur_folder)))
+        self.assertEqual(self.__scan(), expected)
+
+    def test_failed_listing_is_not_written_in_manifest(self):
+        with FailingScandir(os.path.join(self.__fur_folder, get_asset_name(1))):
+            self.__scan(write_manifests=True)
+        self.assertFalse(os.path.isfile(ABCManifest.get_filepath(self.__fur_folder)))
+        with FailingScandir(os.path.join(self.__fur_folder, get_asset_name(1), "0002")):
+            self.__scan(write_manifests=True)
+        self.assertFalse(os.path.isfile(ABCManifest.get_filepath(self.__fur_folder)))
+
+    def test_manifest_has_the_size_of_the_caches(self):
+        version_folder_path = os.path.join(self.__fur_folder, get_asset_name(0), "0001")
+        filenames = sorted(os.listdir(version_folder_path))
+        for index, filename in enumerate(filenames):
+            with open(os.path.join(version_folder_path, filename), "w") as f:
+                f.write("x" * index)
+        age_tree(self.__shot_root)
+        self.__scan(write_manifests=True)
+        with open(ABCManifest.get_filepath(self.__fur_folder), "r") as f:
+            data = json.load(f)
+        self.assertEqual(data["assets"][get_asset_name(0)]["versions"]["0001"]["size"], sum(range(len(filenames))))
+
+    def test_folder_added_after_manifest_is_scanned(self):
+        self.__scan(write_manifests=True)
+        asset_name = get_asset_name(9)
+        os.makedirs(os.path.join(self.__fur_folder, asset_name, "0001"))
+        open(os.path.join(self.__fur_folder, asset_name, "0001", asset_name + "_fur.abc"), "w").close()
+        self.assertIn(asset_name, self.__scan())
+
+    def test_manifest_assets_without_prefix_are_ignored(self):
+        expected = self.__scan(use_manifests=False)
+        self.__scan(write_manifests=True)
+        filepath = ABCManifest.get_filepath(self.__fur_folder)
+        with open(filepath, "r") as f:
+            data = json.load(f)
+        # Without mtimes to check, only the prefix keeps it out
+        data["assets"]["prop"] = {"versions": {"0001": {"sequence": ["prop_fur.abc", []]}}}
+        # Rewritten in place so that the folder keeps the mtime of the manifest
+        with open(filepath, "w") as f:
+            json.dump(data, f)
+        self.assertEqual(self.__scan(), expected)
+
+    def test_malformed_manifest_falls_back_to_scan(self):
+        expected = self.__scan(use_manifests=False)
+        self.__scan(write_manifests=True)
+        filepath = ABCManifest.get_filepath(self.__fur_folder)
+        with open(filepath, "r") as f:
+            data = json.load(f)
+        data["assets"][get_asset_name(0)]["versions"]["0001"]["sequence"][1] = [[5, 1]]
+        with open(filepath, "w") as f:
+            json.dump(data, f)
+        self.assertEqual(self.__scan(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()